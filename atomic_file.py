@@ -0,0 +1,50 @@
+import contextlib
+import os
+import shutil
+import tempfile
+
+# -------------------------------
+# Atomic File Writes
+# -------------------------------
+# Everything the dashboard and the updater rewrite in place (library cache, play log export,
+# updated source files) goes through a uniquely named temp file in the same directory, which
+# is flushed to disk and then renamed over the target. A crash or a second writer never
+# leaves a half-written file behind, and the target keeps its permissions.
+
+
+@contextlib.contextmanager
+def atomic_write(path, mode="wb", **open_kwargs):
+    """Open a temp file next to `path`; when the block finishes it replaces `path` in one rename.
+
+    If the block raises, the temp file is removed and `path` is left untouched.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix="." + os.path.basename(path) + "-", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, mode, **open_kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        _copy_mode(path, temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(temp_path)
+        raise
+
+
+def write_atomically(path, content):
+    """Replace `path` with the bytes `content` (see atomic_write())."""
+    with atomic_write(path) as f:
+        f.write(content)
+
+
+def _copy_mode(path, temp_path):
+    # mkstemp creates the file as 0600: give it the mode of the file it replaces (keeping
+    # e.g. the executable bit), or the usual umask default for a new file.
+    try:
+        shutil.copymode(path, temp_path)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(temp_path, 0o666 & ~umask)
@@ -0,0 +1,413 @@
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+# -------------------------------
+# Headless Dashboard Benchmark
+# -------------------------------
+# Usage:
+#   python benchmark.py                              # 10, 100, 1000 and 5000 games, JSON on stdout
+#   python benchmark.py --sizes 10 100 --output bench.json
+#   python benchmark.py --compare old.json new.json  # Relative change of every metric
+#
+# Every library size runs in its own Python process (so peak RSS and the module-level
+# caches of one size never leak into the next) with SDL_VIDEODRIVER=dummy, against a
+# synthetic PS3/<game>/PS3_GAME tree that is generated once and reused between runs.
+SIZES = [10, 100, 1000, 5000]
+PIC1_SIZE = (1920, 1080)  # Synthetic cover size, as big as real PIC1.PNGs (pass e.g. --pic-size 320x180 for a quick run)
+ICON0_SIZE = (320, 176)  # Real ICON0.PNG size
+FRAMES = 240  # Frames measured per scenario
+COVER_TIMEOUT_S = 60  # Max wait for the covers of the first screen to be decoded
+LIBRARY_LAYOUT = 3  # Bump when generate_library() changes, so older cached trees are rebuilt
+TITLE_TXT_EVERY = 10  # Every Nth game has only a Title.txt instead of a PARAM.SFO
+RESULT_PREFIX = "BENCHMARK_RESULT "  # Marks the child's result line among the dashboard's own prints
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # Keep stdout pure JSON
+
+TITLE_WORDS = ["Gran", "Turismo", "Metal", "Gear", "Solid", "Uncharted", "Drake's", "Fortune", "Resistance",
+               "Fall", "of", "Man", "Demon's", "Souls", "Killzone", "Little", "Big", "Planet", "Ratchet",
+               "Clank", "Tools", "Destruction", "Infamous", "Motorstorm", "Pacific", "Rift", "Guns",
+               "the", "Patriots", "Heavenly", "Sword", "Warhawk", "Journey", "Flower", "Valkyria", "Chronicles"]
+
+
+# -------------------------------
+# Synthetic Library
+# -------------------------------
+def make_png(path, size, color, rng, alpha=False):
+    import pygame
+    surface = pygame.Surface(size, pygame.SRCALPHA if alpha else 0)
+    surface.fill(color)
+    # Per-pixel noise tinted with `color`: like real artwork, the image (and the thumbnails
+    # made from it) barely compresses, so decode, scale and cache sizes are realistic.
+    noise = pygame.image.frombuffer(rng.randbytes(size[0] * size[1] * 3), size, "RGB")
+    surface.blit(noise, (0, 0), special_flags=pygame.BLEND_RGB_MULT)
+    for x in range(0, size[0], 16):
+        pygame.draw.line(surface, (color[0] // 2, color[1] // 2, color[2] // 2), (x, 0), (x, size[1] - 1), 4)
+    pygame.image.save(surface, path)
+
+
+def make_param_sfo(path, fields):
+    """Write a PARAM.SFO holding `fields` ({key: str or int}), laid out like the real ones."""
+    import struct
+    keys = b""
+    values = b""
+    index = b""
+    for key, value in fields.items():
+        if isinstance(value, int):
+            fmt, data, max_length = 0x0404, struct.pack("<I", value), 4
+        else:
+            data = value.encode("utf-8") + b"\0"
+            fmt, max_length = 0x0204, (len(data) + 3) // 4 * 4
+        index += struct.pack("<HHIII", len(keys), fmt, len(data), max_length, len(values))
+        keys += key.encode("ascii") + b"\0"
+        values += data.ljust(max_length, b"\0")
+    keys = keys.ljust((len(keys) + 3) // 4 * 4, b"\0")
+    key_table = 20 + len(index)
+    header = struct.pack("<4sIIII", b"\0PSF", 0x0101, key_table, key_table + len(keys), len(fields))
+    with open(path, "wb") as f:
+        f.write(header + index + keys + values)
+
+
+def generate_library(root, count, pic_size=PIC1_SIZE):
+    """Create `count` games under `root` (PS3/<game>/PS3_GAME/{PARAM.SFO,PIC1.PNG,ICON0.PNG}).
+
+    Every TITLE_TXT_EVERY-th game has a Title.txt instead of a PARAM.SFO. A finished tree is
+    marked with a .complete file and reused as is by later runs.
+    """
+    marker = os.path.join(root, ".complete")
+    if os.path.exists(marker):
+        with open(marker) as f:
+            if f.read().split()[1:] == [str(LIBRARY_LAYOUT)]:
+                return root
+    if os.path.exists(root):
+        shutil.rmtree(root)
+    os.makedirs(root)
+    rng = random.Random(count)
+
+    # Only a handful of distinct images, copied into place: generating is I/O, not PNG encoding.
+    templates = os.path.join(root, ".templates")
+    os.makedirs(templates)
+    covers, icons = [], []
+    for variant in range(8):
+        color = (rng.randrange(40, 256), rng.randrange(40, 256), rng.randrange(40, 256))
+        covers.append(os.path.join(templates, f"PIC1_{variant}.PNG"))
+        icons.append(os.path.join(templates, f"ICON0_{variant}.PNG"))
+        make_png(covers[-1], pic_size, color, rng)
+        make_png(icons[-1], ICON0_SIZE, color + (200,), rng, alpha=True)
+
+    for i in range(count):
+        title_id = f"BLUS{30000 + i:05d}"
+        game_dir = os.path.join(root, title_id)
+        usrdir = os.path.join(game_dir, "PS3_GAME", "USRDIR")
+        os.makedirs(usrdir)
+        title = " ".join(rng.choice(TITLE_WORDS) for _ in range(rng.randint(1, 6)))
+        if i % TITLE_TXT_EVERY == TITLE_TXT_EVERY - 1:
+            with open(os.path.join(game_dir, "Title.txt"), "w") as f:
+                f.write(f"{title} {i}")
+        else:
+            make_param_sfo(os.path.join(game_dir, "PS3_GAME", "PARAM.SFO"), {
+                "APP_VER": "01.00", "ATTRIBUTE": 0, "BOOTABLE": 1, "CATEGORY": "DG", "LICENSE": "Benchmark",
+                "PARENTAL_LEVEL": 3, "PS3_SYSTEM_VER": "03.4100", "RESOLUTION": 63, "SOUND_FORMAT": 1,
+                "TITLE": f"{title} {i}", "TITLE_ID": title_id, "VERSION": "01.00",
+            })
+        shutil.copyfile(covers[i % len(covers)], os.path.join(game_dir, "PS3_GAME", "PIC1.PNG"))
+        shutil.copyfile(icons[i % len(icons)], os.path.join(game_dir, "PS3_GAME", "ICON0.PNG"))
+        with open(os.path.join(usrdir, "EBOOT.BIN"), "wb") as f:
+            f.write(b"\0" * 4096)
+    with open(marker, "w") as f:
+        f.write(f"{count} {LIBRARY_LAYOUT}")
+    return root
+
+
+# -------------------------------
+# Measurements (child process)
+# -------------------------------
+def peak_rss_kb():
+    """Peak resident memory of this process in KB (current working set where no peak is available)."""
+    try:
+        import resource
+    except ImportError:
+        import process_watch  # Windows
+        return process_watch.read_resident_kb(os.getpid())
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # macOS reports bytes, Linux KB
+
+
+def frame_stats(samples):
+    """p50/p95/p99/mean of a list of frame times in milliseconds."""
+    from frame_profiler import percentile
+    ordered = sorted(samples)
+    return {
+        "p50": round(percentile(ordered, 0.50), 4),
+        "p95": round(percentile(ordered, 0.95), 4),
+        "p99": round(percentile(ordered, 0.99), 4),
+        "mean": round(sum(ordered) / len(ordered), 4) if ordered else 0.0,
+    }
+
+
+def measure(library, frames, render_scale=1.0):
+    """Drive the dashboard without its main loop and return the metrics for `library`."""
+    process_started = time.perf_counter()
+    import pygame
+    import library_cache
+    import xbox360wrapper_main as dashboard
+
+    dashboard.LIBRARY_PATHS = [library]
+    dashboard.USE_LIBRARY_CACHE = False  # Measure the cold scan; the cached rescan is timed separately
+    dashboard.HOT_RELOAD_LIBRARY = False
+    dashboard.GRID_SORT = "library"
+    dashboard.RENDER_SCALE = render_scale
+
+    dashboard.init_display()
+    dashboard.build_static_layers()
+
+    started = time.perf_counter()
+    scanned = dashboard.sort_games(dashboard.retrieve_games())
+    scan_s = time.perf_counter() - started
+    root_scan_s = {os.path.basename(root): round(seconds, 4) for root, seconds in dashboard.library_scan_times.items()}
+    started = time.perf_counter()
+    dashboard.set_library(scanned)
+    index_s = time.perf_counter() - started
+
+    dashboard.queue_image_loads()
+    dashboard.mark_dirty()
+    dashboard.present_frame()
+    first_frame_s = time.perf_counter() - process_started
+
+    # Wait until every cover of the first screen has been decoded and drawn.
+    _, grid_item_height, rows, _ = dashboard.get_grid_dimensions()
+    first_row, last_row = dashboard.get_visible_row_range(grid_item_height, rows)
+    on_screen = dashboard.GAMES[first_row * dashboard.columns:(last_row + 1) * dashboard.columns]
+    deadline = time.perf_counter() + COVER_TIMEOUT_S
+    while not all(game.images_loaded for game in on_screen) and time.perf_counter() < deadline:
+        dashboard.apply_loaded_images()
+        time.sleep(0.001)
+    dashboard.apply_loaded_images()
+    dashboard.present_frame()
+    covers_s = time.perf_counter() - process_started
+
+    def run_frames(move):
+        """Time `frames` iterations of the main loop's update + present, with `move(frame)` changing the selection."""
+        samples = []
+        last_view_state = (dashboard.grid_scroll_y, dashboard.menu_active, len(dashboard.grid_games))
+        for frame in range(frames):
+            frame_started = time.perf_counter()
+            previous_index = dashboard.selected_index
+            previous_scroll_y = dashboard.grid_scroll_y
+            move(frame)
+            last_view_state = dashboard.update_and_present(previous_index, previous_scroll_y, last_view_state)
+            pygame.event.pump()
+            samples.append((time.perf_counter() - frame_started) * 1000)
+        return frame_stats(samples)
+
+    games = len(dashboard.GAMES)
+    row_length = min(dashboard.columns, games)
+
+    def idle(frame):
+        pass
+
+    def steady(frame):
+        # Left/right along the first row: only the two highlighted slots are redrawn.
+        if row_length > 1:
+            dashboard.selected_index = frame % row_length
+
+    def full_redraw(frame):
+        dashboard.mark_dirty()
+
+    def scroll(frame):
+        # Down one row per frame to the bottom of the grid, then back up.
+        last_row = (games - 1) // dashboard.columns
+        period = max(1, 2 * last_row)
+        step = frame % period
+        row = step if step <= last_row else period - step
+        dashboard.selected_index = min(games - 1, row * dashboard.columns)
+
+    frame_ms = {}
+    for name, move in (("idle", idle), ("steady", steady), ("full_redraw", full_redraw), ("scroll", scroll)):
+        dashboard.selected_index = 0
+        frame_ms[name] = run_frames(move)
+
+    # Micro-benchmarks of the two per-tile helpers, with their caches out of the way.
+    grid_item_width, grid_item_height, _, _ = dashboard.get_grid_dimensions()
+    titles = [game.title for game in dashboard.GAMES[:1000]]
+    dashboard.text_cache.clear()
+    started = time.perf_counter()
+    for title in titles:
+        dashboard.render_text_wrapped(title, dashboard.FONT, dashboard.TEXT_COLOR, grid_item_width - 10)
+    text_ms = (time.perf_counter() - started) * 1000 / max(1, len(titles))
+
+    scale_ms = {}
+    # A full-size PIC1 as decoded from disk (the loader shrinks it once, off the main thread).
+    cover = dashboard.load_image_file(dashboard.GAMES[0].image_path, "PIC1", "benchmark") if games else None
+    if cover is not None:
+        for quality, smooth in (("fast", False), ("smooth", True)):
+            started = time.perf_counter()
+            for _ in range(50):
+                dashboard.scale_image_preserve_aspect(cover, grid_item_width, grid_item_height * 0.7, smooth=smooth)
+            scale_ms[quality] = round((time.perf_counter() - started) * 1000 / 50, 4)
+
+    # Type-ahead search: a handful of titles typed one key at a time, through the title
+    # index alone and through set_search_query() (index + grid update).
+    lookup_ms, keystroke_ms = [], []
+    for game in dashboard.GAMES[::max(1, games // 20)]:
+        for end in range(1, len(game.title) + 1):
+            started = time.perf_counter()
+            dashboard.title_index.search(game.title[:end])
+            lookup_ms.append((time.perf_counter() - started) * 1000)
+            started = time.perf_counter()
+            dashboard.set_search_query(game.title[:end])
+            keystroke_ms.append((time.perf_counter() - started) * 1000)
+    dashboard.close_search()
+
+    # The measurements below are not part of a real startup, so they run after everything
+    # above instead of counting towards first_frame_s. The rescan replaces the games of
+    # root_games, so it comes last.
+    # PARAM.SFO alone, for every game that has one (the scan above also stats each directory).
+    import param_sfo
+    sfo_paths = [os.path.join(game.gamepath, "PS3_GAME", "PARAM.SFO") for game in scanned if game.title_id]
+    started = time.perf_counter()
+    for path in sfo_paths:
+        param_sfo.read(path)
+    param_sfo_ms = (time.perf_counter() - started) * 1000
+
+    # Rescan against the index the cold scan produced (what a second launch does).
+    library_cache.save_index(dashboard.library_index)
+    dashboard.library_index = library_cache.load_index()
+    started = time.perf_counter()
+    dashboard.retrieve_games()
+    scan_cached_s = time.perf_counter() - started
+
+    result = {
+        "games": games,
+        "screen": [dashboard.DISPLAY_WIDTH, dashboard.DISPLAY_HEIGHT],
+        "render_resolution": [dashboard.SCREEN_WIDTH, dashboard.SCREEN_HEIGHT],
+        "scan_s": round(scan_s, 4),
+        "scan_cached_s": round(scan_cached_s, 4),
+        "root_scan_s": root_scan_s,
+        "title_index_s": round(index_s, 4),
+        "param_sfo_read_ms": round(param_sfo_ms, 4),
+        "first_frame_s": round(first_frame_s, 4),
+        "first_screen_covers_s": round(covers_s, 4),
+        "frame_ms": frame_ms,
+        "render_text_wrapped_ms": round(text_ms, 4),
+        "scale_image_ms": scale_ms,
+        "search_lookup_ms": frame_stats(lookup_ms),
+        "search_keystroke_ms": frame_stats(keystroke_ms),
+        "image_memory": dashboard.images.stats(),
+        "peak_rss_kb": peak_rss_kb(),
+    }
+    dashboard.shutdown()
+    return result
+
+
+# -------------------------------
+# Runner (parent process)
+# -------------------------------
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_size(count, work_dir, pic_size, frames, render_scale):
+    """Benchmark one library size in a fresh interpreter and return its result dict."""
+    library = generate_library(os.path.join(work_dir, f"library-{count}-{pic_size[0]}x{pic_size[1]}"), count, pic_size)
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+    here = os.path.dirname(os.path.abspath(__file__))
+    env["PYTHONPATH"] = here + os.pathsep + env.get("PYTHONPATH", "")
+    # A scratch working directory, so the library cache and session database of a real
+    # install are neither read nor overwritten.
+    with tempfile.TemporaryDirectory(prefix="bench-", dir=work_dir) as scratch:
+        completed = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", library, "--frames", str(frames),
+                                    "--render-scale", str(render_scale)],
+                                   cwd=scratch, env=env, capture_output=True, text=True)
+    for line in reversed(completed.stdout.splitlines()):
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+    print(completed.stdout[-2000:], completed.stderr[-2000:], file=sys.stderr)
+    raise RuntimeError(f"Benchmark with {count} games failed (exit code {completed.returncode}).")
+
+
+def flatten(result, prefix=""):
+    """{"frame_ms": {"idle": {"p50": 1}}} -> {"frame_ms.idle.p50": 1}"""
+    flat = {}
+    for key, value in result.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[prefix + key] = value
+    return flat
+
+
+def compare(old_path, new_path):
+    """Print the relative change of every metric between two result files (positive = slower/bigger)."""
+    with open(old_path) as f:
+        old = {result["games"]: flatten(result) for result in json.load(f)["results"]}
+    with open(new_path) as f:
+        new = {result["games"]: flatten(result) for result in json.load(f)["results"]}
+    for games in sorted(old.keys() & new.keys()):
+        print(f"{games} games:")
+        for metric in sorted(old[games].keys() & new[games].keys()):
+            if metric == "games":
+                continue
+            before, after = old[games][metric], new[games][metric]
+            change = f"{(after - before) / before * 100:+.1f}%" if before else "n/a"
+            print(f"  {metric:<32} {before:>12} -> {after:<12} {change}")
+
+
+def render_scale_arg(value):
+    return value if value == "auto" else float(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless benchmark of the library scan and grid rendering.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="Library sizes (number of games)")
+    parser.add_argument("--frames", type=int, default=FRAMES, help="Frames measured per scenario")
+    parser.add_argument("--pic-size", default=f"{PIC1_SIZE[0]}x{PIC1_SIZE[1]}", help="Synthetic PIC1 size, WxH")
+    parser.add_argument("--work-dir", default=os.path.join(tempfile.gettempdir(), "x360_benchmark"),
+                        help="Where the synthetic libraries are generated (and kept for reuse)")
+    parser.add_argument("--render-scale", type=render_scale_arg, default=1.0,
+                        help="Internal render scale of the dashboard (e.g. 0.5), or auto")
+    parser.add_argument("--output", help="Also write the JSON results to this file")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two result files and exit")
+    parser.add_argument("--child", metavar="LIBRARY", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(RESULT_PREFIX + json.dumps(measure(args.child, args.frames, args.render_scale)), flush=True)
+        return
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    pic_size = tuple(int(part) for part in args.pic_size.lower().split("x"))
+    os.makedirs(args.work_dir, exist_ok=True)
+    results = []
+    for count in args.sizes:
+        print(f"Benchmarking {count} games...", file=sys.stderr)
+        results.append(run_size(count, args.work_dir, pic_size, args.frames, args.render_scale))
+    report = {
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "pic_size": list(pic_size),
+        "frames": args.frames,
+        "render_scale": args.render_scale,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import json
+import math
+import time
+from collections import deque
+
+# -------------------------------
+# Frame-Time Profiler
+# -------------------------------
+# The main loop calls begin_frame(), then mark("<phase>") after each phase and end_frame()
+# at the end. While disabled every call returns straight away, so the instrumentation can
+# stay in the hot path.
+WINDOW_FRAMES = 600  # Frames kept for the rolling percentiles (10 s at 60 FPS)
+OVERLAY_REFRESH_S = 0.5  # How often the overlay text is rebuilt
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    # The smallest value with at least `fraction` of the samples at or below it. The rank is
+    # rounded first so float noise (0.07 * 100 == 7.000000000000001) cannot push it up by one.
+    rank = math.ceil(round(fraction * len(sorted_values), 9))
+    index = min(len(sorted_values) - 1, max(0, rank - 1))
+    return sorted_values[index]
+
+
+class FrameProfiler:
+    """Times each phase of a frame and keeps rolling p50/p95/p99 per phase."""
+
+    def __init__(self, enabled=False, window=WINDOW_FRAMES):
+        self.enabled = enabled
+        self.window = window
+        self.samples = {}  # phase -> deque of milliseconds
+        self.current = {}
+        self.in_frame = False  # False until begin_frame(), e.g. when enabled halfway through a frame
+        self.frame_started = 0.0
+        self.last_mark = 0.0
+        self.frame_number = 0
+        self.trace_file = None
+        self.overlay_lines = []
+        self.overlay_built = 0.0
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.frame_started = self.last_mark = time.perf_counter()
+        self.current = {}
+        self.in_frame = True
+
+    def mark(self, phase):
+        """Attribute the time since the previous mark to `phase`."""
+        if not self.enabled or not self.in_frame:
+            return
+        now = time.perf_counter()
+        self.current[phase] = self.current.get(phase, 0.0) + (now - self.last_mark) * 1000
+        self.last_mark = now
+
+    def end_frame(self):
+        if not self.enabled or not self.in_frame:
+            return
+        self.in_frame = False
+        self.current["frame"] = (time.perf_counter() - self.frame_started) * 1000
+        for phase, milliseconds in self.current.items():
+            samples = self.samples.get(phase)
+            if samples is None:
+                samples = self.samples[phase] = deque(maxlen=self.window)
+            samples.append(milliseconds)
+        if self.trace_file is not None:
+            record = {"frame": self.frame_number, "t": round(self.frame_started, 6)}
+            record.update({phase: round(ms, 4) for phase, ms in self.current.items()})
+            self.trace_file.write(json.dumps(record) + "\n")
+        self.frame_number += 1
+
+    def percentiles(self):
+        """{phase: (p50, p95, p99)} in milliseconds over the rolling window."""
+        result = {}
+        for phase, samples in self.samples.items():
+            ordered = sorted(samples)
+            result[phase] = (percentile(ordered, 0.50), percentile(ordered, 0.95), percentile(ordered, 0.99))
+        return result
+
+    def reset(self):
+        self.samples.clear()
+
+    # -------------------------------
+    # Per-frame trace dump
+    # -------------------------------
+    def start_trace(self, path):
+        """Append one JSON line per frame to `path` until stop_trace() is called."""
+        self.stop_trace()
+        self.trace_file = open(path, "a")
+        print(f"Writing frame trace to {path}.")
+
+    def stop_trace(self):
+        if self.trace_file is not None:
+            self.trace_file.close()
+            self.trace_file = None
+
+    # -------------------------------
+    # Reporting
+    # -------------------------------
+    def summary_lines(self):
+        lines = []
+        for phase, (p50, p95, p99) in self.percentiles().items():
+            lines.append(f"{phase:<12} p50 {p50:6.2f}  p95 {p95:6.2f}  p99 {p99:6.2f} ms")
+        return lines
+
+    def draw_overlay(self, surface, font, position=(10, 10), color=(255, 255, 255), background=(0, 0, 0, 170)):
+        """Draw the percentile table onto `surface` and return the rect it covers."""
+        import pygame
+        now = time.perf_counter()
+        if now - self.overlay_built > OVERLAY_REFRESH_S:
+            # Re-rendering the text every frame would itself show up in the profile.
+            self.overlay_lines = [font.render(line, True, color) for line in self.summary_lines()]
+            self.overlay_built = now
+        if not self.overlay_lines:
+            return pygame.Rect(position, (0, 0))
+        width = max(line.get_width() for line in self.overlay_lines) + 12
+        height = sum(line.get_height() for line in self.overlay_lines) + 12
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill(background)
+        y = 6
+        for line in self.overlay_lines:
+            panel.blit(line, (6, y))
+            y += line.get_height()
+        return surface.blit(panel, position)
@@ -0,0 +1,79 @@
+from collections import OrderedDict
+
+# -------------------------------
+# Memory-Budgeted Image Store
+# -------------------------------
+# Keeps count of the bytes held by every game's decoded images, least recently viewed
+# first. Once the total goes over the budget, evict() hands back the games whose images
+# should be dropped; games on (or near) the screen are pinned and never evicted.
+BUDGET_MB = 128  # Default memory budget for decoded images
+
+
+def surface_bytes(surface):
+    """Bytes of pixel memory held by a pygame surface (0 for None).
+
+    Counted from the row pitch, so a 24-bit cover is charged 3 bytes per pixel (plus row
+    padding) and a 32-bit icon 4.
+    """
+    if surface is None:
+        return 0
+    return surface.get_pitch() * surface.get_height()
+
+
+class ImageStore:
+    """Byte-accounted LRU over the images attached to games."""
+
+    def __init__(self, budget_bytes=BUDGET_MB * 1024 * 1024):
+        self.budget_bytes = budget_bytes
+        self.entries = OrderedDict()  # key -> bytes, least recently used first
+        self.bytes_used = 0
+        self.peak_bytes = 0
+        self.loads = 0
+        self.evictions = 0
+
+    def add(self, key, size):
+        """Account `size` bytes for `key` (replacing what it held before) and mark it most recently used."""
+        self.bytes_used += size - self.entries.pop(key, 0)
+        self.entries[key] = size
+        self.peak_bytes = max(self.peak_bytes, self.bytes_used)
+        self.loads += 1
+
+    def touch(self, key):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+
+    def remove(self, key):
+        """Forget `key` without counting it as an eviction (e.g. the game left the library)."""
+        self.bytes_used -= self.entries.pop(key, 0)
+
+    def evict(self, pinned=()):
+        """Drop least recently used keys not in `pinned` until the store fits its budget. Returns the dropped keys."""
+        evicted = []
+        if self.bytes_used <= self.budget_bytes:
+            return evicted
+        for key in list(self.entries):
+            if self.bytes_used <= self.budget_bytes:
+                break
+            if key in pinned:
+                continue
+            self.bytes_used -= self.entries.pop(key)
+            evicted.append(key)
+        self.evictions += len(evicted)
+        return evicted
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes_used = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def stats(self):
+        return {
+            "images": len(self.entries),
+            "bytes_used": self.bytes_used,
+            "peak_bytes": self.peak_bytes,
+            "budget_bytes": self.budget_bytes,
+            "loads": self.loads,
+            "evictions": self.evictions,
+        }
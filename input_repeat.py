@@ -0,0 +1,72 @@
+# -------------------------------
+# Held-Direction Repeat & Acceleration
+# -------------------------------
+# Navigation is driven by press/release edges (key, stick, d-pad and button events) instead
+# of sampling the controller every frame. A held direction moves once on press, then repeats
+# after REPEAT_DELAY_MS, getting faster the longer it is held. All times are milliseconds
+# (pygame.time.get_ticks()), so the main loop can sleep until the next repeat is due.
+REPEAT_DELAY_MS = 350  # Hold time before the first repeat
+REPEAT_INTERVAL_MS = 150  # Time between the first repeats
+REPEAT_MIN_INTERVAL_MS = 50  # Fastest repeat rate after acceleration
+REPEAT_ACCELERATION = 0.85  # Each repeat interval is this fraction of the previous one
+
+AXIS_PRESS_THRESHOLD = 0.5  # Stick deflection that counts as pressing a direction
+AXIS_RELEASE_THRESHOLD = 0.3  # Deflection below which the direction is released again (hysteresis)
+
+
+def axis_direction(value, current, negative, positive, press=AXIS_PRESS_THRESHOLD, release=AXIS_RELEASE_THRESHOLD):
+    """Map a stick axis value to `negative`, `positive` or None.
+
+    `current` is the direction the axis is held in right now; it stays held until the
+    stick falls back below `release`, so a stick resting near the threshold does not chatter.
+    """
+    if current == negative and value < -release:
+        return negative
+    if current == positive and value > release:
+        return positive
+    if value <= -press:
+        return negative
+    if value >= press:
+        return positive
+    return None
+
+
+class KeyRepeater:
+    """Tracks held directions and reports when each one should fire again."""
+
+    def __init__(self, delay=REPEAT_DELAY_MS, interval=REPEAT_INTERVAL_MS, min_interval=REPEAT_MIN_INTERVAL_MS,
+                 acceleration=REPEAT_ACCELERATION):
+        self.delay = delay
+        self.interval = interval
+        self.min_interval = min_interval
+        self.acceleration = acceleration
+        self.held = {}  # (source, direction) -> [next due time, current interval]
+
+    def press(self, source, direction, now):
+        """Start holding `direction` from `source` (e.g. "keyboard", "stick", "hat"). The caller moves once right away."""
+        self.held[(source, direction)] = [now + self.delay, self.interval]
+
+    def release(self, source, direction=None):
+        """Stop holding `direction` from `source`, or every direction from it when none is given."""
+        for key in [key for key in self.held if key[0] == source and direction in (None, key[1])]:
+            del self.held[key]
+
+    def clear(self):
+        self.held.clear()
+
+    def due(self, now):
+        """Return the directions whose repeat is due at `now` (each at most once per call)."""
+        fired = []
+        for (source, direction), state in self.held.items():
+            if now >= state[0]:
+                fired.append(direction)
+                state[1] = max(self.min_interval, state[1] * self.acceleration)
+                # Schedule from `now`, so a stalled frame does not cause a burst of catch-up moves.
+                state[0] = now + state[1]
+        return fired
+
+    def next_due(self):
+        """Time of the next scheduled repeat, or None when nothing is held."""
+        if not self.held:
+            return None
+        return min(state[0] for state in self.held.values())
@@ -0,0 +1,191 @@
+import os
+import sys
+import threading
+import time
+
+# -------------------------------
+# Speculative Launch Warmup
+# -------------------------------
+# When the selection rests on a game for DWELL_MS, a low-priority background thread reads
+# that game's EBOOT.BIN (then its boot modules) sequentially, so the OS page cache already
+# holds them when A is pressed and RPCS3 does not start by waiting on an HDD or NAS.
+# Moving the selection (or launching) cancels the warmup between two chunks.
+DWELL_MS = 1500  # Time the selection has to rest on a game before its files are read
+BUDGET_MB = 256  # Most bytes read ahead for one game
+CHUNK_BYTES = 1024 * 1024  # Read size; cancellation is checked between chunks
+REWARM_AFTER_S = 600  # A game warmed this long ago is read again (the page cache may have dropped it)
+HOT_SUFFIXES = (".sprx", ".self")  # Modules next to EBOOT.BIN that are loaded at boot
+
+COLD = "cold"
+PARTIAL = "partial"
+WARM = "warm"
+
+
+def hot_files(runpath):
+    """EBOOT.BIN first, then the boot modules in its directory, smallest first."""
+    files = [runpath]
+    modules = []
+    try:
+        with os.scandir(os.path.dirname(runpath)) as entries:
+            for entry in entries:
+                try:
+                    if entry.name.lower().endswith(HOT_SUFFIXES) and entry.is_file():
+                        modules.append((entry.stat().st_size, entry.path))
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return files + [path for _, path in sorted(modules)]
+
+
+def lower_thread_priority():
+    """Run the calling thread at background priority, so warmup I/O yields to everything else."""
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            THREAD_MODE_BACKGROUND_BEGIN = 0x00010000  # Also lowers the thread's I/O priority
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_MODE_BACKGROUND_BEGIN)
+        elif hasattr(os, "setpriority"):
+            # Linux nice values are per thread; the I/O scheduler derives the I/O priority from it.
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+    except (OSError, AttributeError):
+        pass
+
+
+class LaunchWarmup:
+    """Reads the files of the game the selection rests on into the page cache.
+
+    The main thread calls select() whenever the selected game changes and launched() when
+    it is started; everything else happens on the warmup thread.
+    """
+
+    def __init__(self, dwell_ms=DWELL_MS, budget_bytes=BUDGET_MB * 1024 * 1024):
+        self.dwell_s = dwell_ms / 1000
+        self.budget_bytes = budget_bytes
+        self.condition = threading.Condition()
+        self.target = None  # (key, runpath) of the selected game
+        self.selected_at = 0.0
+        self.generation = 0  # Bumped by every select()/launched(); a running warmup stops when it changes
+        self.warmed = {}  # key -> (WARM or PARTIAL, time.monotonic() when it finished)
+        self.stopped = False
+        # Statistics
+        self.bytes_read = 0
+        self.completed = 0
+        self.cancelled = 0
+        self.launches = {WARM: 0, PARTIAL: 0, COLD: 0}
+        self.launch_latencies = {WARM: [], PARTIAL: [], COLD: []}  # Seconds, launch request -> game up
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def select(self, key, runpath):
+        """The selection moved to the game `key` (None when nothing is selected)."""
+        with self.condition:
+            if self.target is not None and self.target[0] == key:
+                return
+            self.target = None if key is None else (key, runpath)
+            self.selected_at = time.monotonic()
+            self.generation += 1
+            self.condition.notify()
+
+    def launched(self, key):
+        """The game `key` is being launched: stop warming and return how warm its files were."""
+        with self.condition:
+            self.target = None
+            self.generation += 1
+            state = self._state(key)
+            self.launches[state] += 1
+        return state
+
+    def record_launch_latency(self, state, seconds):
+        with self.condition:
+            self.launch_latencies[state].append(seconds)
+
+    def stop(self):
+        with self.condition:
+            self.stopped = True
+            self.generation += 1
+            self.condition.notify()
+
+    def _state(self, key):
+        entry = self.warmed.get(key)
+        if entry is None or time.monotonic() - entry[1] >= REWARM_AFTER_S:
+            return COLD  # Never read, or so long ago that the page cache may have dropped it
+        return entry[0]
+
+    def _run(self):
+        lower_thread_priority()
+        while True:
+            with self.condition:
+                while not self.stopped and not self._due():
+                    if self.target is None or self._fresh(self.target[0]):
+                        self.condition.wait()
+                    else:
+                        self.condition.wait(max(0.0, self.selected_at + self.dwell_s - time.monotonic()))
+                if self.stopped:
+                    return
+                (key, runpath), generation = self.target, self.generation
+            state = self._warm(runpath, generation)
+            with self.condition:
+                if state is not None:
+                    self.warmed[key] = (state, time.monotonic())
+                if state == WARM:
+                    self.completed += 1
+                elif self.generation != generation:
+                    self.cancelled += 1
+                if self.generation == generation:
+                    self.target = None  # Done with this selection
+
+    def _fresh(self, key):
+        entry = self.warmed.get(key)
+        return entry is not None and entry[0] == WARM and time.monotonic() - entry[1] < REWARM_AFTER_S
+
+    def _due(self):
+        return (self.target is not None and not self._fresh(self.target[0])
+                and time.monotonic() >= self.selected_at + self.dwell_s)
+
+    def _warm(self, runpath, generation):
+        """Read the hot files until the budget is spent.
+
+        Returns WARM, PARTIAL (cancelled midway) or None (cancelled before the first chunk, or
+        nothing could be read, e.g. EBOOT.BIN is missing).
+        """
+        buffer = bytearray(CHUNK_BYTES)
+        remaining = self.budget_bytes
+        read_any = False
+        for path in hot_files(runpath):
+            try:
+                with open(path, "rb", buffering=0) as f:
+                    if hasattr(os, "posix_fadvise"):
+                        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                    while remaining > 0:
+                        if self.generation != generation:
+                            return PARTIAL if read_any else None
+                        count = f.readinto(memoryview(buffer)[:min(CHUNK_BYTES, remaining)])
+                        if not count:
+                            break
+                        remaining -= count
+                        read_any = True
+                        with self.condition:
+                            self.bytes_read += count
+            except OSError:
+                continue  # Missing or unreadable: RPCS3 will report it if it matters
+            if remaining <= 0:
+                break
+        return WARM if read_any else None
+
+    def summary(self):
+        """One line with the hit rate and the launch latency of warm vs cold launches."""
+        with self.condition:
+            launches = sum(self.launches.values())
+            parts = [f"{launches} launches"]
+            if launches:
+                parts.append(f"{self.launches[WARM]} warm, {self.launches[PARTIAL]} partial "
+                             f"({self.launches[WARM] / launches:.0%} hit rate)")
+            for state in (WARM, PARTIAL, COLD):
+                latencies = self.launch_latencies[state]
+                if latencies:
+                    parts.append(f"{state} launch to game loaded {sum(latencies) / len(latencies):.1f} s avg")
+            parts.append(f"{self.bytes_read / 2**20:.0f} MB read ahead, {self.completed} warmups, "
+                         f"{self.cancelled} cancelled")
+        return "Warmup: " + ", ".join(parts)
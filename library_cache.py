@@ -0,0 +1,175 @@
+import os
+import pickle
+import struct
+import threading
+import zlib
+
+import atomic_file
+
+# -------------------------------
+# Persistent Library Index & Thumbnail Cache
+# -------------------------------
+# The index (titles, paths, signatures) is small and lives in one file in the working
+# directory, so startup loads it with a single read. The pre-scaled thumbnails live in a
+# separate append-only pack: an index entry only records where its game's record is, the
+# pixels are read when the game scrolls into view, and a new thumbnail is one append.
+CACHE_FILE = "library_cache.bin"
+CACHE_VERSION = 4  # Bump when the entry layout changes; older caches are then rebuilt
+THUMBNAIL_FILE = "library_thumbnails.bin"
+COMPACT_MIN_MB = 32  # The pack is rewritten without dead records once they exceed this and the live ones
+
+_save_lock = threading.Lock()  # Saves may run on a background thread; one at a time
+
+
+def directory_signature(game_dir, dir_stat=None):
+    """Return the (mtime_ns, size) of a game directory and of the files the scan reads from it.
+
+    An entry is only reused while its stored signature matches, so edited, added or removed
+    files make the directory get re-examined. `dir_stat` is the directory's own stat when the
+    caller already has it (e.g. from os.scandir).
+    """
+    paths = (
+        None if dir_stat is not None else game_dir,
+        os.path.join(game_dir, "Title.txt"),
+        os.path.join(game_dir, "PS3_GAME", "PARAM.SFO"),
+        os.path.join(game_dir, "PS3_GAME", "PIC1.PNG"),
+        os.path.join(game_dir, "PS3_GAME", "ICON0.PNG"),
+    )
+    signature = []
+    for path in paths:
+        try:
+            stat = dir_stat if path is None else os.stat(path)
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
+def load_index(path=CACHE_FILE):
+    """Read the cached index in one bulk read. Returns {} when missing, corrupt or from another version."""
+    try:
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Library cache unreadable, rebuilding: {e}")
+        return {}
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION or not isinstance(data.get("entries"), dict):
+        print("Library cache is from another version, rebuilding.")
+        return {}
+    return data["entries"]
+
+
+def save_index(entries, path=CACHE_FILE):
+    """Write the index through a temp file and an atomic rename, so a crash never leaves a half-written cache."""
+    with _save_lock:
+        try:
+            with atomic_file.atomic_write(path) as f:
+                pickle.dump({"version": CACHE_VERSION, "entries": entries}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError as e:
+            print(f"Failed to write library cache: {e}")
+
+
+# -------------------------------
+# Thumbnail Pack
+# -------------------------------
+# Record: magic, key length, payload length, CRC32 of the payload, then the key (the game
+# directory, UTF-8) and the payload (a pickled dict). A record found through a stale or
+# wrong reference fails the key, length or CRC check and reads as missing.
+RECORD_MAGIC = b"THM1"
+RECORD_HEADER = struct.Struct("<4sIII")
+
+
+class ThumbnailPack:
+    """Append-only file of thumbnail records, shared by the decode workers and the main thread.
+
+    append() returns a reference {"offset", "length"} for the caller to keep in the library
+    index entry; read() takes that reference back. Records that are no longer referenced
+    stay in the file as dead space until compact() rewrites it.
+    """
+
+    def __init__(self, path=THUMBNAIL_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.file = open(path, "a+b", buffering=0)  # Appends go straight to the OS, reads see them
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+    def size(self):
+        with self.lock:
+            return os.fstat(self.file.fileno()).st_size
+
+    def append(self, key, value):
+        """Write `value` for `key` at the end of the pack and return its reference."""
+        record = self._encode(key, value)
+        with self.lock:
+            if self.file.closed:
+                raise OSError(f"{self.path} is closed")  # A decode worker still busy at exit
+            offset = self.file.seek(0, os.SEEK_END)
+            self.file.write(record)
+        return {"offset": offset, "length": len(record)}
+
+    def read(self, key, reference):
+        """The value stored for `key` at `reference`, or None if the record is missing or damaged."""
+        try:
+            offset, length = reference["offset"], reference["length"]
+            with self.lock:
+                self.file.seek(offset)
+                record = self.file.read(length)
+            return self._decode(key, record)
+        except (OSError, KeyError, TypeError, ValueError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def compact(self, references):
+        """Rewrite the pack with only the records in `references` ({key: reference}).
+
+        Returns {key: new reference} for the records that were still readable. Readers and
+        writers wait until the new file is in place.
+        """
+        new_references = {}
+        with self.lock:
+            try:
+                with atomic_file.atomic_write(self.path) as out:
+                    for key, reference in references.items():
+                        try:
+                            self.file.seek(reference["offset"])
+                            record = self.file.read(reference["length"])
+                            self._decode(key, record)
+                        except (OSError, KeyError, TypeError, ValueError, pickle.UnpicklingError, EOFError):
+                            continue
+                        new_references[key] = {"offset": out.tell(), "length": len(record)}
+                        out.write(record)
+                    self.file.close()  # Windows cannot rename over a file that is still open
+            finally:
+                if self.file.closed:
+                    self.file = open(self.path, "a+b", buffering=0)
+        return new_references
+
+    def needs_compaction(self, live_bytes):
+        dead_bytes = self.size() - live_bytes
+        return dead_bytes > COMPACT_MIN_MB * 1024 * 1024 and dead_bytes > live_bytes
+
+    @staticmethod
+    def _encode(key, value):
+        key_bytes = key.encode("utf-8")
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        return RECORD_HEADER.pack(RECORD_MAGIC, len(key_bytes), len(payload), zlib.crc32(payload)) + key_bytes + payload
+
+    @staticmethod
+    def _decode(key, record):
+        if len(record) < RECORD_HEADER.size:
+            raise ValueError("thumbnail record is truncated")
+        magic, key_length, payload_length, crc = RECORD_HEADER.unpack_from(record)
+        key_bytes = key.encode("utf-8")
+        if magic != RECORD_MAGIC or key_length != len(key_bytes) or \
+                len(record) != RECORD_HEADER.size + key_length + payload_length:
+            raise ValueError("not the thumbnail record referenced")
+        if record[RECORD_HEADER.size:RECORD_HEADER.size + key_length] != key_bytes:
+            raise ValueError("thumbnail record belongs to another game")
+        payload = record[RECORD_HEADER.size + key_length:]
+        if zlib.crc32(payload) != crc:
+            raise ValueError("thumbnail record is damaged")
+        return pickle.loads(payload)
@@ -0,0 +1,100 @@
+import os
+import queue
+import threading
+import time
+
+# -------------------------------
+# Parallel Library Scanner
+# -------------------------------
+# Every library root (a folder on a local drive, a NAS share, ...) is scanned on its own
+# thread, so a slow or sleeping drive only delays its own games. The main thread picks up
+# finished roots with poll() and merges them into the library as they arrive.
+
+
+def game_directories(root):
+    """Return (path, stat) for every directory directly under `root`, in name order.
+
+    os.scandir hands back each entry's type with the directory listing, so the only extra
+    call per game is the stat the library cache signature needs anyway. Raises OSError
+    when `root` cannot be read.
+    """
+    directories = []
+    with os.scandir(root) as entries:
+        for entry in entries:
+            try:
+                if entry.is_dir():
+                    directories.append((entry.name, entry.path, entry.stat()))
+            except OSError:
+                continue  # Vanished (or unreadable) while listing
+    directories.sort()
+    return [(path, stat) for _, path, stat in directories]
+
+
+class RootScan:
+    """The outcome of scanning one library root."""
+
+    def __init__(self, root, entries, snapshot, seconds, error=None):
+        self.root = root
+        self.entries = entries  # gamepath -> library index entry, in directory name order
+        self.snapshot = snapshot  # gamepath -> directory signature, seeds the library watcher
+        self.seconds = seconds
+        self.error = error  # The exception that stopped the scan, if any
+
+
+class LibraryScanner:
+    """Scans each root with `scan_root(root) -> (entries, snapshot)` on its own thread."""
+
+    def __init__(self, roots, scan_root, on_finished=None):
+        self.roots = list(roots)
+        self.scan_root = scan_root
+        self.on_finished = on_finished  # Optional hook run on the scanning thread when a root is done
+        self.finished = queue.Queue()
+        self.remaining = len(self.roots)
+        self.snapshot = {}  # Merged snapshot of the roots picked up so far
+        for root in self.roots:
+            threading.Thread(target=self._scan, args=(root,), daemon=True).start()
+
+    def _scan(self, root):
+        started = time.perf_counter()
+        try:
+            entries, snapshot = self.scan_root(root)
+            error = None
+        except Exception as e:  # Always report the root, or the scanner would never be done()
+            entries, snapshot, error = {}, {}, e
+        self.finished.put(RootScan(root, entries, snapshot, time.perf_counter() - started, error))
+        if self.on_finished:
+            self.on_finished()
+
+    def _take(self, scan, scans):
+        self.remaining -= 1
+        self.snapshot.update(scan.snapshot)
+        scans.append(scan)
+
+    def poll(self):
+        """Return the roots that finished since the last call (main thread only)."""
+        scans = []
+        while True:
+            try:
+                scan = self.finished.get_nowait()
+            except queue.Empty:
+                return scans
+            self._take(scan, scans)
+
+    def wait(self, timeout=None):
+        """Like poll(), but first block until every root is done or `timeout` seconds have passed."""
+        scans = []
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while not self.done():
+            remaining_time = None if deadline is None else deadline - time.perf_counter()
+            if remaining_time is not None and remaining_time <= 0:
+                break
+            try:
+                scan = self.finished.get(timeout=remaining_time)
+            except queue.Empty:
+                break
+            self._take(scan, scans)
+        return scans + self.poll()
+
+    def done(self):
+        """True once every root has been scanned and picked up."""
+        return self.remaining == 0
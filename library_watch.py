@@ -0,0 +1,146 @@
+import os
+import queue
+import threading
+import time
+
+import library_cache
+
+# -------------------------------
+# Library Hot-Reload Watcher
+# -------------------------------
+POLL_INTERVAL_S = 5  # Time between two looks at the library directories
+FULL_SWEEP_INTERVAL_S = 60  # Time between two looks at the files inside every game directory
+
+
+def snapshot_directories(root, previous=None):
+    """Return {game directory path: signature} for every directory directly under `root`, or None if unreadable.
+
+    The signature is library_cache.directory_signature(): the directory's own stat plus those
+    of Title.txt, PARAM.SFO and the cover images, because editing a file in place does not
+    change its directory's mtime. A full snapshot costs a single directory read plus five
+    stats per game. With a `previous` snapshot, a directory whose own stat is unchanged
+    keeps its previous signature, so only the directory read and one stat per game remain.
+    """
+    previous = previous or {}
+    snapshot = {}
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        path = os.path.join(root, entry.name)
+                        dir_stat = entry.stat()
+                        known = previous.get(path)
+                        if known and known[0] == (dir_stat.st_mtime_ns, dir_stat.st_size):
+                            snapshot[path] = known
+                        else:
+                            snapshot[path] = library_cache.directory_signature(path, dir_stat)
+                except OSError:
+                    continue
+    except OSError:
+        return None
+    return snapshot
+
+
+def snapshot_roots(roots, previous=None, full=True):
+    """snapshot_directories() of every library root, merged into one dict.
+
+    A root that cannot be read right now (an unplugged drive, a NAS that is waking up)
+    keeps its directories from the `previous` snapshot instead of looking emptied. Unless
+    `full`, the files of directories that did not change themselves are not looked at.
+    """
+    snapshot = {}
+    for root in roots:
+        directories = snapshot_directories(root, None if full else previous)
+        if directories is None:
+            directories = {path: signature for path, signature in (previous or {}).items()
+                           if os.path.dirname(path) == root}
+        snapshot.update(directories)
+    return snapshot
+
+
+class LibraryChanges:
+    """Game directories that appeared, disappeared or were modified between two snapshots."""
+
+    def __init__(self, added, removed, changed):
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+
+def diff_snapshots(old, new):
+    added = {path for path in new if path not in old}
+    removed = {path for path in old if path not in new}
+    changed = {path for path in new if path in old and new[path] != old[path]}
+    return LibraryChanges(added, removed, changed)
+
+
+class LibraryWatcher:
+    """Polls the library roots on a background thread and queues the differences.
+
+    The main thread picks them up with poll_changes() and applies them to GAMES itself,
+    so the watcher never touches pygame or the game list. Pass the `snapshot` the library
+    scan already made to start watching without listing every root again.
+
+    Every `interval` only the game directories themselves are stat'ed (new, removed and
+    renamed games); the files inside all of them are checked every `full_interval`. While
+    `paused()` returns True (e.g. a game is running) the library is not touched at all.
+    """
+
+    def __init__(self, roots, interval=POLL_INTERVAL_S, on_change=None, snapshot=None,
+                 full_interval=FULL_SWEEP_INTERVAL_S, paused=None):
+        self.roots = list(roots)
+        self.interval = interval
+        self.full_interval = full_interval
+        self.on_change = on_change  # Optional hook run on the watcher thread after queueing changes
+        self.paused = paused  # Optional callable; no polling while it returns True
+        self.snapshot = snapshot_roots(self.roots) if snapshot is None else snapshot
+        self.last_full_sweep = time.monotonic()
+        self.changes = queue.Queue()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while not self.stopped.wait(self.interval):
+            if self.paused and self.paused():
+                continue
+            full = time.monotonic() - self.last_full_sweep >= self.full_interval
+            if full:
+                self.last_full_sweep = time.monotonic()
+            snapshot = snapshot_roots(self.roots, self.snapshot, full)
+            changes = diff_snapshots(self.snapshot, snapshot)
+            self.snapshot = snapshot
+            if changes:
+                self.changes.put(changes)
+                if self.on_change:
+                    self.on_change()
+
+    def poll_changes(self):
+        """Return the queued changes merged into one LibraryChanges, or None when nothing happened."""
+        added, removed, changed = set(), set(), set()
+        while True:
+            try:
+                changes = self.changes.get_nowait()
+            except queue.Empty:
+                break
+            for path in changes.removed:
+                added.discard(path)
+                changed.discard(path)
+                removed.add(path)
+            for path in changes.added:
+                if path in removed:
+                    # Removed and re-added between two frames: treat it as modified.
+                    removed.discard(path)
+                    changed.add(path)
+                else:
+                    added.add(path)
+            changed |= changes.changed - added
+        merged = LibraryChanges(added, removed, changed)
+        return merged if merged else None
+
+    def stop(self):
+        self.stopped.set()
@@ -0,0 +1,69 @@
+import struct
+
+# -------------------------------
+# PARAM.SFO Reader
+# -------------------------------
+# Every PS3 dump has PS3_GAME/PARAM.SFO, a small little-endian key/value table:
+#   header      magic "\0PSF", version, key table offset, data table offset, entry count
+#   index       per entry: key offset, data format, data length, max length, data offset
+#   key table   NUL-terminated ASCII keys
+#   data table  UTF-8 strings or 32-bit integers
+# A PARAM.SFO is about 1 KB, so it is read with a single read() (cheaper than mapping it)
+# and only the header, the index and the values that were asked for are decoded.
+MAGIC = b"\0PSF"
+HEADER = struct.Struct("<4sIIII")
+INDEX_ENTRY = struct.Struct("<HHIII")
+FORMAT_UTF8_SPECIAL = 0x0004  # UTF-8 without a NUL terminator
+FORMAT_UTF8 = 0x0204  # NUL-terminated UTF-8
+FORMAT_INT32 = 0x0404
+MAX_SIZE = 64 * 1024  # Real files are around 1 KB; anything far bigger is not a PARAM.SFO
+
+# The fields the dashboard uses (CATEGORY is "DG" for disc games, "HG" for installed ones).
+DEFAULT_KEYS = ("TITLE", "TITLE_ID", "VERSION", "APP_VER", "CATEGORY")
+
+
+def read(path, keys=DEFAULT_KEYS):
+    """Return {key: value} for the `keys` present in the PARAM.SFO at `path` (every key when `keys` is None).
+
+    Strings come back as str, integers as int. Raises OSError if the file cannot be read
+    and ValueError if it is not a valid PARAM.SFO.
+    """
+    with open(path, "rb") as f:
+        data = f.read(MAX_SIZE + 1)
+    if len(data) > MAX_SIZE:
+        raise ValueError(f"{path} is too large for a PARAM.SFO")
+    return parse(data, keys)
+
+
+def parse(data, keys=DEFAULT_KEYS):
+    """Parse the bytes of a PARAM.SFO; see read()."""
+    if len(data) < HEADER.size:
+        raise ValueError("PARAM.SFO header is truncated")
+    magic, _, key_table, data_table, count = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("not a PARAM.SFO file")
+    if HEADER.size + count * INDEX_ENTRY.size > len(data) or key_table > len(data) or data_table > len(data):
+        raise ValueError("PARAM.SFO index points past the end of the file")
+    wanted = None if keys is None else {key.encode("ascii") for key in keys}
+    key_names = data[key_table:data_table]
+    index = data[HEADER.size:HEADER.size + count * INDEX_ENTRY.size]
+    values = {}
+    for key_offset, fmt, length, _, data_offset in INDEX_ENTRY.iter_unpack(index):
+        key_end = key_names.find(b"\0", key_offset)
+        if key_end < 0:
+            raise ValueError("PARAM.SFO key is not terminated")
+        key = key_names[key_offset:key_end]
+        if wanted is not None and key not in wanted:
+            continue
+        start = data_table + data_offset
+        end = start + length
+        if end > len(data):
+            raise ValueError(f"PARAM.SFO value of {key.decode('ascii', 'replace')} is truncated")
+        if fmt == FORMAT_INT32:
+            value = int.from_bytes(data[start:start + 4], "little")
+        else:
+            value = data[start:end].split(b"\0", 1)[0].decode("utf-8", "replace")
+        values[key.decode("ascii")] = value
+        if wanted is not None and len(values) == len(wanted):
+            break
+    return values
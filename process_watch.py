@@ -0,0 +1,335 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from abc import ABC, abstractmethod
+
+try:
+    import psutil  # Optional: pip install psutil
+except ImportError:
+    psutil = None
+
+# -------------------------------
+# Launch / Exit Detection Thresholds
+# -------------------------------
+LAUNCH_RAM_KB = 1_000_000  # RPCS3 above this means the game has finished loading
+EXIT_RAM_KB = 700_000  # RPCS3 dropping below this after loading means the game was closed
+FAST_POLL_INTERVAL_S = 0.25  # Time between memory samples while launching or exiting
+SLOW_POLL_INTERVAL_S = 2  # Time between memory samples while the game is running
+TRANSITION_TIMEOUT_S = 60  # A launch or exit taking longer than this falls back to slow polling
+
+
+# -------------------------------
+# Resident Memory Lookup
+# -------------------------------
+def _proc_resident_kb(pid):
+    """Linux: read VmRSS from /proc/<pid>/status."""
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        return None
+    return None
+
+
+def _windows_resident_kb(pid):
+    """Windows: working set size via GetProcessMemoryInfo (the "Mem Usage" column tasklist prints)."""
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    psapi = ctypes.WinDLL("psapi", use_last_error=True)
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        return None
+    try:
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        if not psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return None
+        return counters.WorkingSetSize // 1024
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+def read_resident_kb(pid):
+    """Return the resident memory of `pid` in KB, or None if it cannot be read."""
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).memory_info().rss // 1024
+        except psutil.Error:
+            return None
+    if sys.platform == "win32":
+        return _windows_resident_kb(pid)
+    if os.path.exists("/proc"):
+        return _proc_resident_kb(pid)
+    return None
+
+
+# -------------------------------
+# Process Watchers
+# -------------------------------
+class ProcessWatcher(ABC):
+    """Watches a single emulator process. Subclasses provide the actual backend."""
+
+    pid = None
+
+    @abstractmethod
+    def is_running(self):
+        """True while the process is alive."""
+
+    @abstractmethod
+    def wait(self, timeout=None):
+        """Block until the process exits or `timeout` seconds pass. Returns True if it exited."""
+
+    @abstractmethod
+    def memory_kb(self):
+        """Resident memory of the process in KB (None if unknown)."""
+
+    @abstractmethod
+    def kill(self):
+        """Terminate the process (no-op if it already exited)."""
+
+
+class PopenWatcher(ProcessWatcher):
+    """Watches the Popen handle returned by PlaystationGame.start_game()."""
+
+    def __init__(self, process):
+        self.process = process
+        self.pid = process.pid
+
+    def is_running(self):
+        return self.process.poll() is None
+
+    def wait(self, timeout=None):
+        # Waiting on the handle wakes up as soon as the process exits, no polling needed.
+        try:
+            self.process.wait(timeout)
+            return True
+        except subprocess.TimeoutExpired:
+            return False
+
+    def memory_kb(self):
+        if not self.is_running():
+            return None
+        return read_resident_kb(self.pid)
+
+    def kill(self):
+        if self.is_running():
+            self.process.kill()
+            self.process.wait()
+
+
+class FakeWatcher(ProcessWatcher):
+    """Replays a scripted list of memory samples (KB), then reports the process as exited.
+
+    Waiting never sleeps, so the launch/exit detection can be exercised without RPCS3.
+    """
+
+    def __init__(self, samples, pid=0):
+        self.samples = list(samples)
+        self.pid = pid
+        self.killed = False
+        self.running = True
+
+    def is_running(self):
+        return self.running
+
+    def wait(self, timeout=None):
+        return not self.running
+
+    def memory_kb(self):
+        if not self.samples:
+            self.running = False
+            return None
+        return self.samples.pop(0)
+
+    def kill(self):
+        self.killed = True
+        self.running = False
+
+
+# -------------------------------
+# Session State Machine
+# -------------------------------
+# idle -> launching   launch() accepted; the emulator is started and sampled every FAST_POLL_INTERVAL_S
+# launching -> running    memory went above LAUNCH_RAM_KB: the game is up (fullscreen it)
+# launching -> idle       the emulator closed before the game loaded
+# running -> exiting      memory fell below LAUNCH_RAM_KB or the emulator closed: sample fast again
+# exiting -> running      memory recovered, it was only a dip
+# exiting -> idle         memory fell below EXIT_RAM_KB (the emulator is killed) or the emulator closed
+# The session ends when the exit is confirmed (EXIT_RAM_KB crossed or the emulator gone), not at
+# the first dip: a game can run between the two thresholds for as long as it likes.
+IDLE = "idle"
+LAUNCHING = "launching"
+RUNNING = "running"
+EXITING = "exiting"
+
+
+class GameSession:
+    """One play session and its timings (wall-clock timestamps, latencies in seconds)."""
+
+    def __init__(self, title, warmup=None):
+        self.title = title
+        self.warmup = warmup  # How warm the game's files were at launch (launch_warmup.WARM/PARTIAL/COLD), if known
+        self.requested = time.perf_counter()
+        self.started_at = time.time()  # When the launch was requested
+        self.ended_at = None  # When the game was seen closing
+        self.loaded = False
+        self.launch_latency_s = None  # Launch request -> game seen loaded
+        self.exit_latency_s = None  # Exit confirmed -> dashboard back; measured by the dashboard, not the supervisor
+        self.exit_detected = None  # perf_counter() when the exit was confirmed
+
+
+class SessionSupervisor:
+    """Runs play sessions one at a time on a single long-lived worker thread.
+
+    launch() hands a session to the worker and returns False (ignoring the request) while
+    another one is in progress. The callbacks run on the worker:
+      on_loaded(session)    the game is up (e.g. send ALT+ENTER)
+      on_exited(session)    the game is gone (e.g. bring the dashboard back)
+      on_finished(session)  the session is over, with its timings filled in (except exit_latency_s:
+                            only the dashboard can tell when it is back in front)
+    An exception in a session is printed, the emulator is killed and the worker goes back
+    to idle, so one bad launch never stops the next one.
+    """
+
+    def __init__(self, on_loaded, on_exited, on_finished, launch_kb=LAUNCH_RAM_KB, exit_kb=EXIT_RAM_KB,
+                 fast_poll=FAST_POLL_INTERVAL_S, slow_poll=SLOW_POLL_INTERVAL_S,
+                 transition_timeout=TRANSITION_TIMEOUT_S):
+        self.on_loaded = on_loaded
+        self.on_exited = on_exited
+        self.on_finished = on_finished
+        self.launch_kb = launch_kb
+        self.exit_kb = exit_kb
+        self.fast_poll = fast_poll
+        self.slow_poll = slow_poll
+        self.transition_timeout = transition_timeout
+        self.condition = threading.Condition()
+        self.state = IDLE
+        self.session = None  # The GameSession in progress
+        self.start = None  # Callable starting the emulator and returning its ProcessWatcher
+        self.stopped = False
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def launch(self, title, start, warmup=None):
+        """Start a session for `title`, where `start()` launches the emulator and returns a ProcessWatcher.
+
+        Returns False when a session is already in progress (the request is ignored).
+        """
+        with self.condition:
+            if self.state != IDLE or self.stopped:
+                return False
+            self.session = GameSession(title, warmup)
+            self.start = start
+            self.state = LAUNCHING
+            self.condition.notify()
+        return True
+
+    def busy(self):
+        """True while a session is in progress (launch() would be refused)."""
+        with self.condition:
+            return self.state != IDLE
+
+    def stop(self):
+        with self.condition:
+            self.stopped = True
+            self.condition.notify()
+
+    def _set_state(self, state):
+        with self.condition:
+            self.state = state
+        print(f"Session: {state}")
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.stopped and self.state != LAUNCHING:
+                    self.condition.wait()
+                if self.stopped:
+                    return
+                session, start = self.session, self.start
+            print(f"Session: {LAUNCHING} {session.title}")
+            watcher = None
+            try:
+                watcher = start()
+                self._supervise(session, watcher)
+            except Exception:
+                print(f"Session for {session.title} failed:")
+                traceback.print_exc()
+                if watcher is not None:
+                    watcher.kill()
+            finally:
+                with self.condition:
+                    self.state = IDLE
+                    self.session = self.start = None
+
+    def _supervise(self, session, watcher):
+        state = LAUNCHING
+        transition_started = time.perf_counter()
+        while True:
+            kb_ram = watcher.memory_kb()
+            now = time.perf_counter()
+            if not watcher.is_running():
+                if state == LAUNCHING:
+                    print("RPCS3 closed before the game loaded.")
+                    self.on_finished(session)
+                    return
+                print("RPCS3 not found.")
+                self._finish(session, now)
+                return
+            if kb_ram is not None:
+                if state == LAUNCHING and kb_ram > self.launch_kb:
+                    # Stamped before on_loaded(), which only reacts to the load (fullscreen etc.).
+                    session.launch_latency_s = now - session.requested
+                    session.loaded = True
+                    self.on_loaded(session)
+                    state = RUNNING
+                    self._set_state(state)
+                elif state == RUNNING and kb_ram < self.launch_kb:
+                    # Memory is falling: the game may be closing, watch it closely.
+                    state = EXITING
+                    transition_started = now
+                    self._set_state(state)
+                elif state == EXITING and kb_ram > self.launch_kb:
+                    state = RUNNING
+                    self._set_state(state)
+                if state == EXITING and kb_ram < self.exit_kb:
+                    print(f"Game exited, stopping RPCS3 (PID {watcher.pid}).")
+                    watcher.kill()
+                    self._finish(session, now)
+                    return
+            if state == RUNNING or time.perf_counter() - transition_started > self.transition_timeout:
+                watcher.wait(self.slow_poll)
+            else:
+                watcher.wait(self.fast_poll)
+
+    def _finish(self, session, exit_detected):
+        """The game is gone: bring the dashboard back, then report the finished session."""
+        if self.state != EXITING:
+            self._set_state(EXITING)
+        session.ended_at = time.time() - (time.perf_counter() - exit_detected)
+        session.exit_detected = exit_detected
+        self.on_exited(session)
+        self.on_finished(session)
@@ -0,0 +1,198 @@
+import csv
+import datetime
+import os
+import sqlite3
+import threading
+
+import atomic_file
+
+# -------------------------------
+# Play Session Store (SQLite)
+# -------------------------------
+# Every finished session is one row in `sessions`. Per-game aggregates are kept up to date
+# in `game_totals` on insert, so total playtime, last played and the most-played ranking
+# are single index lookups instead of a scan over the whole history.
+DB_FILE = "play_sessions.db"
+CSV_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+CSV_HEADER = ["Game", "Start", "End", "Time Played"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    game TEXT NOT NULL,
+    start REAL NOT NULL,
+    end REAL NOT NULL,
+    duration INTEGER NOT NULL,
+    launch_latency_ms INTEGER,
+    exit_latency_ms INTEGER
+);
+CREATE INDEX IF NOT EXISTS sessions_game_start ON sessions (game, start);
+CREATE INDEX IF NOT EXISTS sessions_start ON sessions (start);
+
+CREATE TABLE IF NOT EXISTS game_totals (
+    game TEXT PRIMARY KEY,
+    total_seconds INTEGER NOT NULL,
+    last_played REAL NOT NULL,
+    session_count INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS game_totals_total ON game_totals (total_seconds);
+CREATE INDEX IF NOT EXISTS game_totals_last ON game_totals (last_played);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _csv_row(game, start, end, duration):
+    return [
+        game,
+        datetime.datetime.fromtimestamp(start).strftime(CSV_TIME_FORMAT),
+        datetime.datetime.fromtimestamp(end).strftime(CSV_TIME_FORMAT),
+        str(datetime.timedelta(seconds=duration)),
+    ]
+
+
+def _csv_key(csv_path):
+    return "imported_csv:" + os.path.abspath(csv_path)
+
+
+class SessionStore:
+    """Indexed play-session history. Safe to share between the UI and the monitor thread."""
+
+    def __init__(self, path=DB_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.connection:
+            self.connection.executescript(SCHEMA)
+            # Databases from before the latency columns existed get them added (NULL for old sessions).
+            columns = {row[1] for row in self.connection.execute("PRAGMA table_info(sessions)")}
+            for column in ("launch_latency_ms", "exit_latency_ms"):
+                if column not in columns:
+                    self.connection.execute(f"ALTER TABLE sessions ADD COLUMN {column} INTEGER")
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    def _insert(self, game, start, end, launch_latency_ms=None, exit_latency_ms=None):
+        duration = max(0, int(end - start))
+        self.connection.execute(
+            "INSERT INTO sessions (game, start, end, duration, launch_latency_ms, exit_latency_ms) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (game, start, end, duration, launch_latency_ms, exit_latency_ms))
+        self.connection.execute(
+            "INSERT INTO game_totals (game, total_seconds, last_played, session_count) VALUES (?, ?, ?, 1) "
+            "ON CONFLICT (game) DO UPDATE SET total_seconds = total_seconds + excluded.total_seconds, "
+            "last_played = MAX(last_played, excluded.last_played), session_count = session_count + 1",
+            (game, duration, start))
+
+    def record_session(self, game, start, end, launch_latency_ms=None, exit_latency_ms=None):
+        """Store one finished session (start/end are UNIX timestamps, latencies in milliseconds if known)."""
+        with self.lock, self.connection:
+            self._insert(game, start, end, launch_latency_ms, exit_latency_ms)
+
+    def total_playtime(self, game):
+        """Total seconds played for `game`."""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT total_seconds FROM game_totals WHERE game = ?", (game,)).fetchone()
+        return row[0] if row else 0
+
+    def last_played(self, game):
+        """Start timestamp of the most recent session of `game`, or None if never played."""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT last_played FROM game_totals WHERE game = ?", (game,)).fetchone()
+        return row[0] if row else None
+
+    def most_played(self, limit=10):
+        """[(game, total_seconds)] for the `limit` most played games."""
+        with self.lock:
+            return self.connection.execute(
+                "SELECT game, total_seconds FROM game_totals ORDER BY total_seconds DESC LIMIT ?",
+                (limit,)).fetchall()
+
+    def recently_played(self, limit=10):
+        """[(game, last_played)] for the `limit` most recently played games."""
+        with self.lock:
+            return self.connection.execute(
+                "SELECT game, last_played FROM game_totals ORDER BY last_played DESC LIMIT ?",
+                (limit,)).fetchall()
+
+    def session_latencies(self, limit=20):
+        """[(game, launch_latency_ms, exit_latency_ms)] of the `limit` most recent sessions that recorded them."""
+        with self.lock:
+            return self.connection.execute(
+                "SELECT game, launch_latency_ms, exit_latency_ms FROM sessions "
+                "WHERE launch_latency_ms IS NOT NULL ORDER BY start DESC LIMIT ?", (limit,)).fetchall()
+
+    def game_totals(self):
+        """{game: (total_seconds, last_played)} for every game that has been played."""
+        with self.lock:
+            rows = self.connection.execute("SELECT game, total_seconds, last_played FROM game_totals").fetchall()
+        return {game: (total, last) for game, total, last in rows}
+
+    def import_csv(self, csv_path):
+        """One-time import of an old screen_time_log.csv. Returns the number of imported sessions.
+
+        A missing log is recorded as imported too: the CSV written later by append_csv() holds
+        this store's own sessions and must not be imported back into it.
+        """
+        key = _csv_key(csv_path)
+        with self.lock:
+            if self.connection.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone():
+                return 0
+        if not os.path.exists(csv_path):
+            self._mark_csv_imported(csv_path, 0)
+            return 0
+        imported = 0
+        with self.lock, self.connection:
+            with open(csv_path, "r", newline="") as f:
+                for row in csv.reader(f):
+                    if len(row) < 3 or row[:2] == CSV_HEADER[:2]:
+                        continue
+                    try:
+                        start = datetime.datetime.strptime(row[1], CSV_TIME_FORMAT).timestamp()
+                        end = datetime.datetime.strptime(row[2], CSV_TIME_FORMAT).timestamp()
+                    except ValueError:
+                        print(f"Skipping unreadable play log row: {row}")
+                        continue
+                    self._insert(row[0], start, end)
+                    imported += 1
+            self.connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(imported)))
+        print(f"Imported {imported} sessions from {csv_path}.")
+        return imported
+
+    def append_csv(self, csv_path, game, start, end):
+        """Append one session to the CSV log, so each save costs the same however long the history is.
+
+        A missing log is first written out in full with export_csv().
+        """
+        if not os.path.exists(csv_path):
+            self.export_csv(csv_path)
+            return
+        with open(csv_path, "a", newline="") as f:
+            csv.writer(f).writerow(_csv_row(game, start, end, max(0, int(end - start))))
+
+    def export_csv(self, csv_path):
+        """Write the full history in the old screen_time_log.csv format (temp file + atomic rename).
+
+        The written file is marked as imported, so import_csv() never reads it back into this store.
+        """
+        with self.lock:
+            rows = self.connection.execute("SELECT game, start, end, duration FROM sessions ORDER BY start").fetchall()
+        with atomic_file.atomic_write(csv_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_HEADER)
+            for game, start, end, duration in rows:
+                writer.writerow(_csv_row(game, start, end, duration))
+        self._mark_csv_imported(csv_path, 0)
+
+    def _mark_csv_imported(self, csv_path, count):
+        # INSERT OR IGNORE keeps the count of an earlier real import.
+        with self.lock, self.connection:
+            self.connection.execute("INSERT OR IGNORE INTO meta (key, value) VALUES (?, ?)",
+                                    (_csv_key(csv_path), str(count)))
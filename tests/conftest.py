@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The modules under test live flat in the repository root; make them importable however
+# pytest is started (plain `pytest`, `python -m pytest`, from the root or from tests/).
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
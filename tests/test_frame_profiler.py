@@ -0,0 +1,25 @@
+import unittest
+
+from frame_profiler import percentile
+
+SAMPLES = [float(value) for value in range(1, 101)]  # 1.0 .. 100.0 ms
+
+
+class PercentileTest(unittest.TestCase):
+    def test_nearest_rank_on_100_samples(self):
+        self.assertEqual(percentile(SAMPLES, 0.50), 50.0)
+        self.assertEqual(percentile(SAMPLES, 0.95), 95.0)
+        self.assertEqual(percentile(SAMPLES, 0.99), 99.0)
+        self.assertEqual(percentile(SAMPLES, 1.0), 100.0)
+
+    def test_float_noise_does_not_move_the_rank(self):
+        self.assertEqual(percentile(SAMPLES, 0.07), 7.0)  # 0.07 * 100 == 7.000000000000001
+
+    def test_small_and_empty_lists(self):
+        self.assertEqual(percentile([4.0], 0.99), 4.0)
+        self.assertEqual(percentile([1.0, 2.0, 3.0], 0.5), 2.0)
+        self.assertEqual(percentile([], 0.5), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
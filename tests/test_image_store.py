@@ -0,0 +1,42 @@
+import unittest
+
+from image_store import ImageStore
+
+
+class ImageStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.store = ImageStore(budget_bytes=300)
+        for key in ("a", "b", "c"):
+            self.store.add(key, 100)
+
+    def test_within_budget_nothing_is_evicted(self):
+        self.assertEqual(self.store.evict(), [])
+        self.assertEqual(self.store.bytes_used, 300)
+
+    def test_least_recently_used_go_first(self):
+        self.store.touch("a")
+        self.store.add("d", 150)
+        self.assertEqual(self.store.evict(), ["b", "c"])
+        self.assertEqual(self.store.bytes_used, 250)
+        self.assertEqual(self.store.stats()["evictions"], 2)
+        self.assertEqual(self.store.peak_bytes, 450)
+
+    def test_pinned_keys_are_never_evicted(self):
+        self.store.add("d", 100)
+        self.assertEqual(self.store.evict(pinned={"a", "b"}), ["c"])
+        self.store.add("e", 300)
+        self.assertEqual(self.store.evict(pinned={"a", "b", "d", "e"}), [])
+        self.assertEqual(self.store.bytes_used, 600)  # Over budget rather than dropping what is on screen
+
+    def test_replacing_and_removing_keep_the_total(self):
+        self.store.add("a", 40)
+        self.assertEqual(self.store.bytes_used, 240)
+        self.store.remove("b")
+        self.store.remove("missing")
+        self.assertEqual(self.store.bytes_used, 140)
+        self.assertEqual(len(self.store), 2)
+        self.assertEqual(self.store.stats()["evictions"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
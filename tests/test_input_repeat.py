@@ -0,0 +1,52 @@
+import unittest
+
+from input_repeat import AXIS_PRESS_THRESHOLD, AXIS_RELEASE_THRESHOLD, KeyRepeater, axis_direction
+
+
+class AxisDirectionTest(unittest.TestCase):
+    def test_press_thresholds(self):
+        self.assertEqual(axis_direction(-AXIS_PRESS_THRESHOLD, None, "left", "right"), "left")
+        self.assertEqual(axis_direction(AXIS_PRESS_THRESHOLD, None, "left", "right"), "right")
+        self.assertIsNone(axis_direction(0.4, None, "left", "right"))
+
+    def test_held_direction_stays_until_the_release_threshold(self):
+        self.assertEqual(axis_direction(0.4, "right", "left", "right"), "right")
+        self.assertIsNone(axis_direction(AXIS_RELEASE_THRESHOLD, "right", "left", "right"))
+        self.assertIsNone(axis_direction(-0.4, "right", "left", "right"))
+
+    def test_flick_to_the_other_side(self):
+        self.assertEqual(axis_direction(-0.9, "right", "left", "right"), "left")
+
+
+class KeyRepeaterTest(unittest.TestCase):
+    def setUp(self):
+        self.repeater = KeyRepeater(delay=300, interval=100, min_interval=50, acceleration=0.5)
+
+    def test_repeats_after_the_delay_then_accelerates(self):
+        self.repeater.press("keyboard", "down", 0)
+        self.assertEqual(self.repeater.next_due(), 300)
+        self.assertEqual(self.repeater.due(299), [])
+        self.assertEqual(self.repeater.due(300), ["down"])
+        self.assertEqual(self.repeater.next_due(), 350)  # 100 * 0.5
+        self.assertEqual(self.repeater.due(350), ["down"])
+        self.assertEqual(self.repeater.next_due(), 400)  # Never faster than min_interval
+
+    def test_a_stalled_frame_fires_once(self):
+        self.repeater.press("keyboard", "down", 0)
+        self.assertEqual(self.repeater.due(5000), ["down"])
+        self.assertEqual(self.repeater.next_due(), 5050)
+
+    def test_release(self):
+        self.repeater.press("keyboard", "down", 0)
+        self.repeater.press("stick", "left", 0)
+        self.repeater.press("stick", "up", 0)
+        self.repeater.release("stick", "up")
+        self.assertEqual(sorted(self.repeater.due(300)), ["down", "left"])
+        self.repeater.release("stick")
+        self.assertEqual(self.repeater.due(1000), ["down"])
+        self.repeater.clear()
+        self.assertIsNone(self.repeater.next_due())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import launch_warmup
+from launch_warmup import COLD, PARTIAL, WARM, LaunchWarmup
+
+
+class LaunchWarmupTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.runpath = os.path.join(self.directory, "EBOOT.BIN")
+        with open(self.runpath, "wb") as f:
+            f.write(b"\0" * 4096)
+        self.warmup = LaunchWarmup(dwell_ms=0)
+
+    def tearDown(self):
+        self.warmup.stop()
+        self.warmup.thread.join(5)
+        shutil.rmtree(self.directory)
+
+    def wait_for_warmup(self, key):
+        deadline = time.monotonic() + 5
+        while key not in self.warmup.warmed and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_resting_selection_is_warm_at_launch(self):
+        self.warmup.select("alpha", self.runpath)
+        self.wait_for_warmup("alpha")
+        self.assertEqual(self.warmup.launched("alpha"), WARM)
+        self.assertEqual(self.warmup.bytes_read, 4096)
+        self.assertEqual(self.warmup.launched("beta"), COLD)
+        self.assertEqual(self.warmup.launches, {WARM: 1, PARTIAL: 0, COLD: 1})
+
+    def test_warmup_long_ago_counts_as_cold(self):
+        long_ago = time.monotonic() - launch_warmup.REWARM_AFTER_S - 1
+        self.warmup.warmed["alpha"] = (WARM, long_ago)
+        self.warmup.warmed["beta"] = (PARTIAL, long_ago)
+        self.warmup.warmed["gamma"] = (PARTIAL, time.monotonic())
+        self.assertEqual(self.warmup.launched("alpha"), COLD)
+        self.assertEqual(self.warmup.launched("beta"), COLD)
+        self.assertEqual(self.warmup.launched("gamma"), PARTIAL)
+
+    def test_missing_files_are_not_counted_as_warm(self):
+        self.warmup.select("alpha", os.path.join(self.directory, "missing", "EBOOT.BIN"))
+        time.sleep(0.2)
+        self.assertEqual(self.warmup.launched("alpha"), COLD)
+
+
+if __name__ == "__main__":
+    unittest.main()
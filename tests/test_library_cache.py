@@ -0,0 +1,65 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from library_cache import ThumbnailPack
+
+
+class ThumbnailPackTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.pack = ThumbnailPack(os.path.join(self.directory, "thumbnails.bin"))
+
+    def tearDown(self):
+        self.pack.close()
+        shutil.rmtree(self.directory)
+
+    def test_append_then_read(self):
+        alpha = self.pack.append("games/alpha", {"cover": b"a" * 100})
+        beta = self.pack.append("games/beta", {"cover": b"b" * 50})
+        self.assertEqual(alpha["offset"], 0)
+        self.assertEqual(beta["offset"], alpha["length"])
+        self.assertEqual(self.pack.read("games/alpha", alpha), {"cover": b"a" * 100})
+        self.assertEqual(self.pack.read("games/beta", beta), {"cover": b"b" * 50})
+
+    def test_wrong_or_stale_reference_reads_as_missing(self):
+        alpha = self.pack.append("games/alpha", {"cover": b"a"})
+        beta = self.pack.append("games/beta", {"cover": b"b"})
+        self.assertIsNone(self.pack.read("games/beta", alpha))
+        self.assertIsNone(self.pack.read("games/alpha", {"offset": beta["offset"] + 1, "length": alpha["length"]}))
+        self.assertIsNone(self.pack.read("games/alpha", {"offset": 10**6, "length": alpha["length"]}))
+        self.assertIsNone(self.pack.read("games/alpha", None))
+
+    def test_damaged_record_reads_as_missing(self):
+        alpha = self.pack.append("games/alpha", {"cover": b"a" * 100})
+        with open(self.pack.path, "r+b") as f:
+            f.seek(alpha["length"] - 5)
+            f.write(b"\xff")
+        self.assertIsNone(self.pack.read("games/alpha", alpha))
+
+    def test_compact_keeps_only_live_records(self):
+        self.pack.append("games/alpha", {"cover": b"old" * 100})
+        alpha = self.pack.append("games/alpha", {"cover": b"new"})
+        beta = self.pack.append("games/beta", {"cover": b"b"})
+        moved = self.pack.compact({"games/alpha": alpha, "games/beta": beta, "games/gone": {"offset": 0, "length": 7}})
+        self.assertEqual(set(moved), {"games/alpha", "games/beta"})
+        self.assertEqual(self.pack.size(), alpha["length"] + beta["length"])
+        self.assertEqual(self.pack.read("games/alpha", moved["games/alpha"]), {"cover": b"new"})
+        self.assertEqual(self.pack.read("games/beta", moved["games/beta"]), {"cover": b"b"})
+        gamma = self.pack.append("games/gamma", {"cover": b"c"})
+        self.assertEqual(gamma["offset"], self.pack.size() - gamma["length"])
+
+    def test_append_after_close_raises_oserror(self):
+        self.pack.close()
+        with self.assertRaises(OSError):
+            self.pack.append("games/alpha", {"cover": b"a"})
+        self.assertIsNone(self.pack.read("games/alpha", {"offset": 0, "length": 10}))
+
+    def test_needs_compaction_once_dead_space_dominates(self):
+        self.pack.append("games/alpha", {"cover": b"a"})
+        self.assertFalse(self.pack.needs_compaction(0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from library_scan import LibraryScanner, game_directories
+
+
+class GameDirectoriesTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_lists_directories_in_name_order(self):
+        for name in ("Beta", "Alpha"):
+            os.mkdir(os.path.join(self.directory, name))
+        open(os.path.join(self.directory, "notes.txt"), "w").close()
+        paths = [path for path, _ in game_directories(self.directory)]
+        self.assertEqual(paths, [os.path.join(self.directory, "Alpha"), os.path.join(self.directory, "Beta")])
+
+    def test_missing_root_raises(self):
+        with self.assertRaises(OSError):
+            game_directories(os.path.join(self.directory, "missing"))
+
+
+class LibraryScannerTest(unittest.TestCase):
+    def test_every_root_finishes_even_when_a_scan_raises(self):
+        def scan_root(root):
+            if root == "bad":
+                raise UnicodeDecodeError("utf-8", b"\xff", 0, 1, "invalid start byte")
+            if root == "gone":
+                raise FileNotFoundError(root)
+            return {root + "/game": {"title": root}}, {root + "/game": (1, 1)}
+
+        scanner = LibraryScanner(["good", "bad", "gone"], scan_root)
+        scans = {scan.root: scan for scan in scanner.wait(timeout=5)}
+        self.assertTrue(scanner.done())
+        self.assertIsNone(scans["good"].error)
+        self.assertEqual(list(scans["good"].entries), ["good/game"])
+        self.assertIsInstance(scans["bad"].error, UnicodeDecodeError)
+        self.assertIsInstance(scans["gone"].error, FileNotFoundError)
+        self.assertEqual(scanner.snapshot, {"good/game": (1, 1)})
+
+
+if __name__ == "__main__":
+    unittest.main()
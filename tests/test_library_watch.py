@@ -0,0 +1,129 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from library_watch import LibraryChanges, LibraryWatcher, diff_snapshots, snapshot_directories, snapshot_roots
+
+
+class DiffSnapshotsTest(unittest.TestCase):
+    def test_added_removed_and_changed(self):
+        old = {"lib/alpha": (1, 1), "lib/beta": (2, 2), "lib/gamma": (3, 3)}
+        new = {"lib/alpha": (1, 1), "lib/beta": (2, 5), "lib/delta": (4, 4)}
+        changes = diff_snapshots(old, new)
+        self.assertEqual(changes.added, {"lib/delta"})
+        self.assertEqual(changes.removed, {"lib/gamma"})
+        self.assertEqual(changes.changed, {"lib/beta"})
+
+    def test_identical_snapshots_are_no_change(self):
+        snapshot = {"lib/alpha": (1, 1)}
+        self.assertFalse(diff_snapshots(snapshot, dict(snapshot)))
+        self.assertFalse(diff_snapshots({}, {}))
+
+
+class SnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.game = os.path.join(self.root, "Alpha")
+        os.mkdir(self.game)
+        self.write_title("Alpha", 1_000_000_000)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def write_title(self, title, mtime_ns):
+        path = os.path.join(self.game, "Title.txt")
+        directory_stat = os.stat(self.game)
+        with open(path, "w") as f:
+            f.write(title)
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+        # Editing a file in place leaves its directory's mtime alone; make sure of it here.
+        os.utime(self.game, ns=(directory_stat.st_atime_ns, directory_stat.st_mtime_ns))
+
+    def test_quick_snapshot_skips_the_files_of_unchanged_directories(self):
+        before = snapshot_directories(self.root)
+        self.write_title("Alpha Remastered", 2_000_000_000)
+        self.assertEqual(snapshot_directories(self.root, before), before)
+        self.assertNotEqual(snapshot_roots([self.root], before, full=True), before)
+
+    def test_quick_snapshot_sees_new_and_removed_directories(self):
+        before = snapshot_directories(self.root)
+        os.mkdir(os.path.join(self.root, "Beta"))
+        shutil.rmtree(self.game)
+        changes = diff_snapshots(before, snapshot_roots([self.root], before, full=False))
+        self.assertEqual(changes.added, {os.path.join(self.root, "Beta")})
+        self.assertEqual(changes.removed, {self.game})
+
+    def test_unreadable_root_keeps_its_previous_directories(self):
+        before = snapshot_directories(self.root)
+        missing = os.path.join(self.root, "missing")
+        previous = dict(before, **{os.path.join(missing, "Gamma"): ((1, 1),)})
+        self.assertEqual(snapshot_roots([missing], previous), {os.path.join(missing, "Gamma"): ((1, 1),)})
+
+
+class PausedWatcherTest(unittest.TestCase):
+    def test_no_polling_while_paused(self):
+        root = tempfile.mkdtemp()
+        paused = threading.Event()
+        paused.set()
+        watcher = LibraryWatcher([root], interval=0.01, snapshot={}, paused=paused.is_set)
+        try:
+            os.mkdir(os.path.join(root, "Alpha"))
+            time.sleep(0.1)
+            self.assertIsNone(watcher.poll_changes())
+            paused.clear()
+            deadline = time.monotonic() + 5
+            changes = None
+            while changes is None and time.monotonic() < deadline:
+                time.sleep(0.01)
+                changes = watcher.poll_changes()
+            self.assertEqual(changes.added, {os.path.join(root, "Alpha")})
+        finally:
+            watcher.stop()
+            shutil.rmtree(root)
+
+
+class PollChangesTest(unittest.TestCase):
+    def setUp(self):
+        self.watcher = LibraryWatcher([], interval=3600, snapshot={})
+
+    def tearDown(self):
+        self.watcher.stop()
+
+    def queue(self, added=(), removed=(), changed=()):
+        self.watcher.changes.put(LibraryChanges(set(added), set(removed), set(changed)))
+
+    def poll(self):
+        changes = self.watcher.poll_changes()
+        return changes.added, changes.removed, changes.changed
+
+    def test_nothing_queued(self):
+        self.assertIsNone(self.watcher.poll_changes())
+
+    def test_batches_are_merged(self):
+        self.queue(added={"lib/alpha"})
+        self.queue(added={"lib/beta"}, changed={"lib/gamma"})
+        self.assertEqual(self.poll(), ({"lib/alpha", "lib/beta"}, set(), {"lib/gamma"}))
+        self.assertIsNone(self.watcher.poll_changes())
+
+    def test_added_then_removed_is_only_removed(self):
+        self.queue(added={"lib/alpha"})
+        self.queue(changed={"lib/alpha"})
+        self.queue(removed={"lib/alpha"})
+        self.assertEqual(self.poll(), (set(), {"lib/alpha"}, set()))
+
+    def test_removed_then_re_added_is_changed(self):
+        self.queue(removed={"lib/alpha"})
+        self.queue(added={"lib/alpha"})
+        self.assertEqual(self.poll(), (set(), set(), {"lib/alpha"}))
+
+    def test_added_then_changed_stays_added(self):
+        self.queue(added={"lib/alpha"})
+        self.queue(changed={"lib/alpha"})
+        self.assertEqual(self.poll(), ({"lib/alpha"}, set(), set()))
+
+
+if __name__ == "__main__":
+    unittest.main()
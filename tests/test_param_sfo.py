@@ -0,0 +1,66 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import param_sfo
+from benchmark import make_param_sfo
+
+FIELDS = {
+    "APP_VER": "01.02",
+    "ATTRIBUTE": 32,
+    "CATEGORY": "DG",
+    "TITLE": "Gran Turismo® 5",
+    "TITLE_ID": "BCES00569",
+    "VERSION": "01.00",
+}
+
+
+class ParamSfoTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "PARAM.SFO")
+        make_param_sfo(self.path, FIELDS)
+        with open(self.path, "rb") as f:
+            self.data = f.read()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_reads_the_default_keys(self):
+        self.assertEqual(param_sfo.read(self.path), {key: value for key, value in FIELDS.items() if key != "ATTRIBUTE"})
+
+    def test_all_keys_and_integer_fields(self):
+        values = param_sfo.parse(self.data, keys=None)
+        self.assertEqual(values, FIELDS)
+        self.assertIsInstance(values["ATTRIBUTE"], int)
+        self.assertEqual(param_sfo.parse(self.data, keys=("ATTRIBUTE",)), {"ATTRIBUTE": 32})
+
+    def test_missing_keys_are_left_out(self):
+        self.assertEqual(param_sfo.parse(self.data, keys=("TITLE_ID", "RESOLUTION")), {"TITLE_ID": "BCES00569"})
+
+    def test_bad_magic(self):
+        with self.assertRaisesRegex(ValueError, "not a PARAM.SFO"):
+            param_sfo.parse(b"\0PSX" + self.data[4:])
+
+    def test_truncated_header(self):
+        with self.assertRaisesRegex(ValueError, "header is truncated"):
+            param_sfo.parse(self.data[:param_sfo.HEADER.size - 1])
+
+    def test_truncated_index(self):
+        with self.assertRaisesRegex(ValueError, "past the end"):
+            param_sfo.parse(self.data[:param_sfo.HEADER.size + param_sfo.INDEX_ENTRY.size])
+
+    def test_truncated_value(self):
+        with self.assertRaisesRegex(ValueError, "is truncated"):
+            param_sfo.parse(self.data[:-4], keys=None)
+
+    def test_oversized_file(self):
+        with open(self.path, "ab") as f:
+            f.write(b"\0" * param_sfo.MAX_SIZE)
+        with self.assertRaisesRegex(ValueError, "too large"):
+            param_sfo.read(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import threading
+import time
+import unittest
+
+import process_watch
+from process_watch import EXIT_RAM_KB, LAUNCH_RAM_KB, FakeWatcher, SessionSupervisor
+
+LOADING = LAUNCH_RAM_KB // 2
+IN_GAME = LAUNCH_RAM_KB + 200_000
+DIP = (LAUNCH_RAM_KB + EXIT_RAM_KB) // 2  # Below the launch threshold, above the exit one
+CLOSED = EXIT_RAM_KB - 100_000
+
+
+class SlowFakeWatcher(FakeWatcher):
+    """FakeWatcher taking `delay` seconds per sample, so session timings become measurable."""
+
+    def __init__(self, samples, delay):
+        super().__init__(samples, pid=1234)
+        self.delay = delay
+
+    def memory_kb(self):
+        time.sleep(self.delay)
+        return super().memory_kb()
+
+
+class SupervisorTest(unittest.TestCase):
+    """Runs scripted sessions through the supervisor with FakeWatcher (no RPCS3, no sleeping)."""
+
+    def run_session(self, samples, watcher=None, on_loaded=None):
+        self.watcher = watcher or FakeWatcher(samples, pid=1234)
+        self.events = []
+        finished = threading.Event()
+        sessions = []
+
+        def on_finished(session):
+            sessions.append(session)
+            finished.set()
+
+        supervisor = SessionSupervisor(
+            on_loaded=on_loaded or (lambda session: self.events.append("loaded")),
+            on_exited=lambda session: self.events.append("exited"),
+            on_finished=on_finished,
+            fast_poll=0, slow_poll=0)
+        try:
+            self.assertTrue(supervisor.launch("Test Game", lambda: self.watcher))
+            self.assertTrue(finished.wait(5), "session never finished")
+        finally:
+            supervisor.stop()
+        return sessions[0]
+
+    def test_loads_then_exits_below_exit_threshold(self):
+        session = self.run_session([LOADING, IN_GAME, IN_GAME, CLOSED, CLOSED])
+        self.assertEqual(self.events, ["loaded", "exited"])
+        self.assertTrue(session.loaded)
+        self.assertTrue(self.watcher.killed)
+        self.assertIsNotNone(session.launch_latency_s)
+        self.assertIsNotNone(session.exit_detected)
+        self.assertIsNone(session.exit_latency_s)  # Measured by the dashboard once it is back in front
+        self.assertGreaterEqual(session.ended_at, session.started_at)
+
+    def test_dip_between_thresholds_does_not_end_the_session(self):
+        session = self.run_session([IN_GAME, DIP, IN_GAME, DIP, IN_GAME])
+        # The samples run out, so the fake process is reported as closed by itself.
+        self.assertEqual(self.events, ["loaded", "exited"])
+        self.assertFalse(self.watcher.killed)
+        self.assertTrue(session.loaded)
+
+    def test_playing_between_thresholds_counts_until_the_exit(self):
+        samples = [IN_GAME] + [DIP] * 20 + [CLOSED]
+        session = self.run_session(samples, SlowFakeWatcher(samples, delay=0.01))
+        self.assertTrue(self.watcher.killed)
+        # The session ends when memory crosses EXIT_RAM_KB, not at the first dip below LAUNCH_RAM_KB.
+        self.assertGreaterEqual(session.ended_at - session.started_at, 0.15)
+
+    def test_launch_latency_does_not_include_the_loaded_callback(self):
+        # on_loaded() sends ALT+ENTER (and imports pyautogui on first use): not part of the launch.
+        session = self.run_session([IN_GAME, CLOSED], on_loaded=lambda session: time.sleep(0.3))
+        self.assertTrue(session.loaded)
+        self.assertLess(session.launch_latency_s, 0.3)
+
+    def test_emulator_closing_before_the_game_loads(self):
+        session = self.run_session([LOADING, LOADING])
+        self.assertEqual(self.events, [])
+        self.assertFalse(session.loaded)
+        self.assertIsNone(session.ended_at)
+
+    def test_launch_is_refused_while_a_session_runs(self):
+        gate = threading.Event()
+        supervisor = SessionSupervisor(lambda s: None, lambda s: None, lambda s: None,
+                                       fast_poll=0, slow_poll=0)
+        try:
+            def start():
+                gate.wait(5)
+                return FakeWatcher([])
+            self.assertTrue(supervisor.launch("First", start))
+            self.assertFalse(supervisor.launch("Second", start))
+        finally:
+            gate.set()
+            supervisor.stop()
+
+    def test_process_watcher_is_abstract(self):
+        with self.assertRaises(TypeError):
+            process_watch.ProcessWatcher()
+
+
+if __name__ == "__main__":
+    unittest.main()
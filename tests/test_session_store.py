@@ -0,0 +1,103 @@
+import csv
+import datetime
+import os
+import shutil
+import tempfile
+import unittest
+
+from session_store import CSV_HEADER, CSV_TIME_FORMAT, SessionStore
+
+
+def timestamp(text):
+    return datetime.datetime.strptime(text, CSV_TIME_FORMAT).timestamp()
+
+
+class SessionStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store = SessionStore(os.path.join(self.directory, "sessions.db"))
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.directory)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def read_csv(self, name):
+        with open(self.path(name), newline="") as f:
+            return list(csv.reader(f))
+
+    def test_game_totals_aggregate_every_session(self):
+        self.store.record_session("Alpha", 1000, 1100)
+        self.store.record_session("Beta", 2000, 2050)
+        self.store.record_session("Alpha", 3000, 3300)
+        self.assertEqual(self.store.game_totals(), {"Alpha": (400, 3000), "Beta": (50, 2000)})
+        self.assertEqual(self.store.total_playtime("Alpha"), 400)
+        self.assertEqual(self.store.last_played("Beta"), 2000)
+        self.assertIsNone(self.store.last_played("Gamma"))
+        self.assertEqual(self.store.most_played(1), [("Alpha", 400)])
+        self.assertEqual([game for game, _ in self.store.recently_played()], ["Alpha", "Beta"])
+
+    def test_csv_import_runs_once(self):
+        with open(self.path("log.csv"), "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_HEADER)
+            writer.writerow(["Alpha", "2024-01-01 10:00:00", "2024-01-01 11:00:00", "1:00:00"])
+            writer.writerow(["Beta", "not a date", "2024-01-01 11:00:00", "?"])
+        self.assertEqual(self.store.import_csv(self.path("log.csv")), 1)
+        self.assertEqual(self.store.import_csv(self.path("log.csv")), 0)
+        self.assertEqual(self.store.game_totals(), {"Alpha": (3600, timestamp("2024-01-01 10:00:00"))})
+
+    def test_missing_csv_imports_nothing(self):
+        self.assertEqual(self.store.import_csv(self.path("missing.csv")), 0)
+
+    def test_log_started_by_this_store_is_not_imported_after_a_restart(self):
+        # New install: no CSV yet, the first session creates it, then the dashboard restarts.
+        start = timestamp("2024-01-01 10:00:00")
+        self.assertEqual(self.store.import_csv(self.path("log.csv")), 0)
+        self.store.record_session("Alpha", start, start + 100)
+        self.store.append_csv(self.path("log.csv"), "Alpha", start, start + 100)
+        self.store.close()
+        self.store = SessionStore(self.path("sessions.db"))
+        self.assertEqual(self.store.import_csv(self.path("log.csv")), 0)
+        self.assertEqual(self.store.game_totals(), {"Alpha": (100, start)})
+
+    def test_exported_csv_is_not_imported_back(self):
+        start = timestamp("2024-01-01 10:00:00")
+        self.store.record_session("Alpha", start, start + 100)
+        self.store.export_csv(self.path("export.csv"))
+        self.assertEqual(self.store.import_csv(self.path("export.csv")), 0)
+        self.assertEqual(self.store.game_totals(), {"Alpha": (100, start)})
+
+    def test_append_csv_creates_then_appends(self):
+        start = timestamp("2024-01-01 10:00:00")
+        self.store.record_session("Alpha", start, start + 90)
+        self.store.append_csv(self.path("log.csv"), "Alpha", start, start + 90)
+        self.store.record_session("Beta", start + 100, start + 160)
+        self.store.append_csv(self.path("log.csv"), "Beta", start + 100, start + 160)
+        self.assertEqual(self.read_csv("log.csv"), [
+            CSV_HEADER,
+            ["Alpha", "2024-01-01 10:00:00", "2024-01-01 10:01:30", "0:01:30"],
+            ["Beta", "2024-01-01 10:01:40", "2024-01-01 10:02:40", "0:01:00"],
+        ])
+
+    def test_export_csv_round_trips_through_import(self):
+        start = timestamp("2024-01-01 10:00:00")
+        self.store.record_session("Beta", start + 500, start + 600)
+        self.store.record_session("Alpha", start, start + 60)
+        self.store.export_csv(self.path("export.csv"))
+        rows = self.read_csv("export.csv")
+        self.assertEqual(rows[0], CSV_HEADER)
+        self.assertEqual([row[0] for row in rows[1:]], ["Alpha", "Beta"])  # Oldest first
+        self.assertEqual(os.listdir(self.directory).count("export.csv"), 1)
+        other = SessionStore(self.path("other.db"))
+        try:
+            self.assertEqual(other.import_csv(self.path("export.csv")), 2)
+            self.assertEqual(other.game_totals(), self.store.game_totals())
+        finally:
+            other.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+from title_search import TitleIndex, normalize
+
+TITLES = [
+    "Gran Turismo 5",
+    "GT Academy",
+    "Uncharted: Drake's Fortune",
+    "Metal Gear Solid 4: Guns of the Patriots",
+    "Gran Turismo 6",
+    "Resistance: Fall of Man",
+    "Turok",
+]
+
+
+class TitleIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = TitleIndex(TITLES)
+
+    def titles(self, query):
+        return [TITLES[position] for position in self.index.search(query)]
+
+    def test_normalize_drops_case_and_punctuation(self):
+        self.assertEqual(normalize("Uncharted: Drake's Fortune"), ["uncharted", "drake", "s", "fortune"])
+
+    def test_empty_query_returns_everything(self):
+        self.assertEqual(self.index.search(""), list(range(len(TITLES))))
+        self.assertEqual(self.index.search(" :' "), list(range(len(TITLES))))
+
+    def test_short_terms_match_word_prefixes(self):
+        self.assertEqual(self.titles("gt"), ["GT Academy"])
+        self.assertEqual(self.titles("g"), ["Gran Turismo 5", "GT Academy", "Metal Gear Solid 4: Guns of the Patriots",
+                                            "Gran Turismo 6"])
+        self.assertEqual(self.titles("ur"), [])  # Not the start of any word
+
+    def test_longer_terms_match_inside_words(self):
+        self.assertEqual(self.titles("turis"), ["Gran Turismo 5", "Gran Turismo 6"])
+        self.assertEqual(self.titles("ris"), ["Gran Turismo 5", "Gran Turismo 6"])
+        self.assertEqual(self.titles("ATRIOT"), ["Metal Gear Solid 4: Guns of the Patriots"])
+
+    def test_trigrams_from_different_places_are_confirmed(self):
+        # "abc" and "bcd" both occur in the title, but in different words: "abcd" does not.
+        index = TitleIndex(["Xabc bcd"])
+        self.assertTrue(index.postings.get("abc") and index.postings.get("bcd"))
+        self.assertEqual(index.search("abcd"), [])
+        self.assertEqual(index.search("xabc"), [0])
+
+    def test_every_term_must_match(self):
+        self.assertEqual(self.titles("gran 6"), ["Gran Turismo 6"])
+        self.assertEqual(self.titles("6 gran"), ["Gran Turismo 6"])
+        self.assertEqual(self.titles("tur gran"), ["Gran Turismo 5", "Gran Turismo 6"])
+        self.assertEqual(self.titles("fall man"), ["Resistance: Fall of Man"])
+        self.assertEqual(self.titles("gran fall"), [])
+
+    def test_results_keep_library_order(self):
+        self.assertEqual(self.titles("tur"), ["Gran Turismo 5", "Gran Turismo 6", "Turok"])
+        self.assertEqual(self.titles("o"), ["Metal Gear Solid 4: Guns of the Patriots", "Resistance: Fall of Man"])
+
+
+if __name__ == "__main__":
+    unittest.main()
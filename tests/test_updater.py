@@ -0,0 +1,133 @@
+import contextlib
+import functools
+import http.server
+import io
+import os
+import shutil
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+import updater
+
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class UpdaterTest(unittest.TestCase):
+    """Runs update() against a local http.server standing in for GitHub."""
+
+    def setUp(self):
+        self.served = tempfile.mkdtemp()
+        self.install = tempfile.mkdtemp()
+        handler = functools.partial(QuietHandler, directory=self.served)
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+        self.previous_cwd = os.getcwd()
+        os.chdir(self.install)  # The updater works on paths relative to the install directory
+        self.publish("includes.txt", "root/a.py\nroot/b.sh\n")
+        self.publish("a.py", "print('a')\n")
+        self.publish("b.sh", "echo b\n")
+
+    def tearDown(self):
+        os.chdir(self.previous_cwd)
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.served)
+        shutil.rmtree(self.install)
+
+    def publish(self, name, text, age_s=60):
+        path = os.path.join(self.served, name)
+        with open(path, "w") as f:
+            f.write(text)
+        # Whole seconds in the past, so If-Modified-Since compares cleanly.
+        mtime = int(time.time()) - age_s
+        os.utime(path, (mtime, mtime))
+
+    def update(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return updater.update(self.base_url)
+
+    def read(self, name):
+        with open(name) as f:
+            return f.read()
+
+    def test_first_update_downloads_everything(self):
+        stats = self.update()
+        self.assertEqual(stats["changed"], 2)
+        self.assertEqual(stats["changed_files"], ["a.py", "b.sh"])
+        self.assertEqual(self.read("a.py"), "print('a')\n")
+        self.assertEqual(self.read("b.sh"), "echo b\n")
+        self.assertTrue(os.path.exists(updater.manifest_fname))
+
+    def test_second_update_skips_current_files(self):
+        self.update()
+        written = os.stat("a.py").st_mtime_ns
+        stats = self.update()
+        self.assertEqual(stats["changed"], 0)
+        self.assertGreater(stats["bytes_skipped"], 0)  # Answered with 304 Not Modified
+        self.assertEqual(os.stat("a.py").st_mtime_ns, written)
+
+    def test_same_content_with_a_new_date_is_not_rewritten(self):
+        self.update()
+        written = os.stat("a.py").st_mtime_ns
+        self.publish("a.py", "print('a')\n", age_s=10)  # Same bytes, newer Last-Modified: a full 200
+        stats = self.update()
+        self.assertEqual(stats["changed"], 0)
+        self.assertEqual(os.stat("a.py").st_mtime_ns, written)
+
+    def test_update_keeps_file_mode(self):
+        self.update()
+        os.chmod("b.sh", 0o755)
+        self.publish("b.sh", "echo b2\n", age_s=10)
+        stats = self.update()
+        self.assertEqual(stats["changed"], 1)
+        self.assertEqual(self.read("b.sh"), "echo b2\n")
+        self.assertEqual(stat.S_IMODE(os.stat("b.sh").st_mode), 0o755)
+
+    def test_failed_download_writes_nothing(self):
+        self.publish("includes.txt", "root/a.py\nroot/missing.py\n")
+        with self.assertRaises(SystemExit):
+            self.update()
+        self.assertEqual(os.listdir("."), [])
+
+    def test_updated_modules_are_imported_again(self):
+        self.publish("includes.txt", "root/updated_helper.py\n")
+        self.publish("updated_helper.py", "VERSION = 1\n")
+        self.update()
+        sys.path.insert(0, self.install)
+        try:
+            import updated_helper
+            self.publish("updated_helper.py", "VERSION = 2\n", age_s=10)
+            stats = self.update()
+            self.assertEqual(updater.unload_updated_modules(stats["changed_files"]), ["updated_helper"])
+            import updated_helper
+            self.assertEqual(updated_helper.VERSION, 2)
+            self.assertEqual(updater.unload_updated_modules([]), [])
+        finally:
+            sys.path.remove(self.install)
+            sys.modules.pop("updated_helper", None)
+
+    def test_updater_runs_without_atomic_file(self):
+        # A fresh install has nothing but updater.py: it must still be able to write what it downloads.
+        shutil.copy(updater.__file__, "updater.py")
+        os.chmod("updater.py", 0o755)
+        script = ("import sys, updater; assert 'atomic_file' not in sys.modules; "
+                  "updater.write_atomically('updater.py', b'# updated'); updater.write_atomically('new.py', b'# new')")
+        env = {name: value for name, value in os.environ.items() if name != "PYTHONPATH"}
+        subprocess.run([sys.executable, "-B", "-c", script], check=True, cwd=self.install, env=env)
+        self.assertEqual(self.read("updater.py"), "# updated")
+        self.assertEqual(stat.S_IMODE(os.stat("updater.py").st_mode), 0o755)
+        self.assertEqual(self.read("new.py"), "# new")
+        self.assertEqual(sorted(os.listdir(".")), ["new.py", "updater.py"])
+
+
+if __name__ == "__main__":
+    unittest.main()
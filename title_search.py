@@ -0,0 +1,95 @@
+import bisect
+import re
+
+# -------------------------------
+# Title Search Index
+# -------------------------------
+# Built once per library change, then every keystroke is a few set intersections:
+#   - terms of one or two characters match the start of a word ("gt" -> "GT Academy"),
+#     looked up with bisect in a sorted list of every word of every title;
+#   - longer terms match anywhere in a word ("turis" -> "Gran Turismo 5"), looked up by
+#     intersecting the trigram posting sets and confirming the candidates.
+# A title matches when every term of the query matches it. Results keep library order.
+MIN_SUBSTRING_TERM = 3  # Shorter terms only match word prefixes
+_WORD = re.compile(r"[^\W_]+")
+_LAST_CHAR = "\U0010ffff"  # Sorts after every character, bounds a prefix range
+
+
+def normalize(text):
+    """Lower-case words with punctuation dropped: "Drake's Fortune" -> ["drake", "s", "fortune"]."""
+    return _WORD.findall(text.casefold())
+
+
+def trigrams(word):
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+
+class TitleIndex:
+    """Prefix and trigram index over a list of titles. search() returns positions in that list."""
+
+    def __init__(self, titles):
+        self.size = len(titles)
+        self.texts = []  # Per title, " " + its normalized words joined by spaces
+        entries = []  # (word, position), sorted for prefix lookups
+        self.postings = {}  # trigram -> set of positions
+        for position, title in enumerate(titles):
+            words = normalize(title)
+            self.texts.append(" " + " ".join(words))
+            for word in set(words):
+                entries.append((word, position))
+                for gram in trigrams(word):
+                    posting = self.postings.get(gram)
+                    if posting is None:
+                        posting = self.postings[gram] = set()
+                    posting.add(position)
+        entries.sort()
+        self.sorted_words = [word for word, _ in entries]
+        self.sorted_positions = [position for _, position in entries]
+
+    def prefix_matches(self, term):
+        start = bisect.bisect_left(self.sorted_words, term)
+        end = bisect.bisect_left(self.sorted_words, term + _LAST_CHAR, start)
+        return set(self.sorted_positions[start:end])
+
+    def substring_matches(self, term):
+        postings = []
+        for gram in trigrams(term):
+            posting = self.postings.get(gram)
+            if not posting:
+                return set()
+            postings.append(posting)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                return candidates
+        if len(term) == MIN_SUBSTRING_TERM:
+            return candidates  # The trigram itself is the term
+        # The trigrams can come from different places in the title, so confirm the match.
+        # Terms never contain spaces, so a hit in the joined text is a hit inside one word.
+        texts = self.texts
+        return {position for position in candidates if term in texts[position]}
+
+    def matches(self, term):
+        if len(term) < MIN_SUBSTRING_TERM:
+            return self.prefix_matches(term)
+        return self.substring_matches(term)
+
+    def search(self, query):
+        """Positions of every title matching all terms of `query`, in list order (all of them for an empty query)."""
+        terms = normalize(query)
+        if not terms:
+            return list(range(self.size))
+        # Only the longest (usually rarest) term goes through the index; the other terms are
+        # checked against its few matches directly, which is cheaper than building their sets.
+        terms = sorted(set(terms), key=len, reverse=True)
+        results = self.matches(terms[0])
+        texts = self.texts
+        for term in terms[1:]:
+            if not results:
+                break
+            # " term" only occurs at the start of a word.
+            needle = term if len(term) >= MIN_SUBSTRING_TERM else " " + term
+            results = [position for position in results if needle in texts[position]]
+        return sorted(results)
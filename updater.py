@@ -1,46 +1,222 @@
+import hashlib
+import importlib.util
+import json
 import os
-import requests
 import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from atomic_file import write_atomically  # // Temp file + fsync + rename, keeping the file mode
+except ImportError:
+    # // A fresh install (or an old one whose updater was replaced first) has no atomic_file.py yet.
+    # // The updater has to be able to fetch it, so it carries its own copy of the helper.
+    def write_atomically(path, content):
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(prefix="." + os.path.basename(path) + "-", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(content)
+                file.flush()
+                os.fsync(file.fileno())
+            try:
+                os.chmod(temp_path, os.stat(path).st_mode & 0o7777)  # // Keep e.g. the executable bit
+            except FileNotFoundError:
+                umask = os.umask(0)
+                os.umask(umask)
+                os.chmod(temp_path, 0o666 & ~umask)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+# // GitHub URL of the raw version of the repository files.
+# // Can be pointed somewhere else (e.g. a local HTTP server for testing) with the UPDATER_URL environment variable.
+url = os.environ.get("UPDATER_URL", "https://raw.githubusercontent.com/PorkMaster73/x360-visual-wrapper/main/")
+
+includes_fname = "includes.txt"
+manifest_fname = ".updater_manifest.json"  # // ETag / Last-Modified + content hash of every file written by the last update
+max_workers = 4  # // Files downloaded at the same time
+request_timeout = 30  # // Seconds
+
+
+def create_session() -> requests.Session:
+    # // One pooled session for every request, so connections to the server are reused.
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def file_sha256(file_path: str):
+    # // Returns None if the file does not exist (yet).
+    try:
+        with open(file_path, "rb") as file:
+            return hashlib.sha256(file.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def load_manifest() -> dict:
+    try:
+        with open(manifest_fname, "r") as file:
+            manifest = json.load(file)
+        return manifest if isinstance(manifest, dict) else {}
+    except (OSError, ValueError):
+        return {}
 
-# // GitHub URL of the raw version of xbox360wrapper_main.py
-url = "https://raw.githubusercontent.com/PorkMaster73/x360-visual-wrapper/main/"
 
+def download_file(session: requests.Session, file_path: str, manifest: dict, base_url=None) -> dict:
+    # // Download a single file, asking the server to skip it if our copy is still current.
+    # // The server is asked with the ETag (GitHub) or, failing that, the Last-Modified date
+    # // (e.g. `python -m http.server`) it sent last time. A server sending neither cannot
+    # // answer 304, so every file is downloaded again; the content hash then only saves the write.
+    base_url = base_url or url
+    headers = {}
+    known = manifest.get(file_path)
+    local_hash = file_sha256(file_path)
+    if known and local_hash == known.get("sha256"):
+        # // Only trust the validators if the local file is still exactly what we downloaded.
+        if known.get("etag"):
+            headers["If-None-Match"] = known["etag"]
+        if known.get("last_modified"):
+            headers["If-Modified-Since"] = known["last_modified"]
+    print(f"Downloading the latest {file_path} from {base_url}...")
+    response = session.get(base_url + file_path, headers=headers, timeout=request_timeout)
+    if response.status_code == 304:
+        return {"file": file_path, "status": "not modified", "content": None, "bytes": 0,
+                "skipped_bytes": known.get("size", 0), "etag": known.get("etag"),
+                "last_modified": known.get("last_modified"), "sha256": local_hash}
+    response.raise_for_status()  # // Check if the request was successful
+    content = response.content
+    digest = hashlib.sha256(content).hexdigest()
+    return {"file": file_path, "status": "unchanged" if digest == local_hash else "changed", "content": content,
+            "bytes": len(content), "skipped_bytes": 0, "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"), "sha256": digest}
 
-def download_write_to_file(file_path: str, save_locally=True) -> str:
-    # // Download the latest xbox360wrapper_main.py
+
+def download_write_to_file(file_path: str, save_locally=True, session=None, base_url=None) -> str:
+    # // Download a single file right away (used for includes.txt).
     try:
-        print(f"Downloading the latest {file_path} from GitHub...")
-        response = requests.get(url + file_path)
-        response.raise_for_status()  # // Check if the request was successful
-        if (save_locally):
-            with open(file_path, "wb") as file:
-                file.write(response.content)
+        result = download_file(session or create_session(), file_path, {}, base_url)
+        if save_locally and result["status"] == "changed":
+            write_atomically(file_path, result["content"])
             print(f"Successfully downloaded and replaced {file_path}.")
-        return str(response.content.decode())
+        return result["content"].decode()
     except requests.exceptions.RequestException as e:
         print(f"Failed to download the file: {e}")
         exit(1)  # // Returns nothing.
 
 
-includes_fname =  f"includes.txt"
+def parse_includes(includes: str) -> list:
+    includes = [x.strip() for x in includes.split("\n") if (x and "---" not in x)]
+    includes = [x for x in includes if x]
+    return [x[5:] for x in includes]  # // Gets rid of the "root/" prefix.
 
-includes = download_write_to_file(includes_fname, False)
-includes = [x.strip() for x in includes.split("\n") if (x and "---" not in x)]
-includes = [x[5:] for x in includes]  # // Gets rid of the "root/" prefix.
 
-# // Loop through each file to be included.
-for file_name in includes:
-    # // Check if the file exists before downloading   
-    if os.path.exists(file_name):
-        print(f"Found existing {file_name}, preparing to update.")
-    download_write_to_file(file_name, True)
+def update(base_url=None) -> dict:
+    # // Fetch every file listed in includes.txt concurrently, then write the changed ones.
+    # // Returns transfer statistics.
+    base_url = base_url or url
+    started = time.perf_counter()
+    session = create_session()
+    includes_text = download_write_to_file(includes_fname, False, session, base_url)
+    includes = parse_includes(includes_text)
+    manifest = load_manifest()
 
+    # // Loop through each file to be included.
+    for file_name in includes:
+        # // Check if the file exists before downloading
+        if os.path.exists(file_name):
+            print(f"Found existing {file_name}, preparing to update.")
 
-# // Run the updated xbox360wrapper_main.py
-run_file = "xbox360wrapper_main.py"
-try:
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(download_file, session, file_name, manifest, base_url) for file_name in includes]
+        try:
+            results = [future.result() for future in futures]
+        except requests.exceptions.RequestException as e:
+            # // Nothing has been written yet, so a failed download leaves the install untouched.
+            print(f"Failed to download the file: {e}")
+            exit(1)
+
+    for result in results:
+        if result["status"] == "changed":
+            write_atomically(result["file"], result["content"])
+            print(f"Successfully downloaded and replaced {result['file']}.")
+        else:
+            print(f"{result['file']} is already up to date.")
+        manifest[result["file"]] = {"etag": result["etag"], "last_modified": result["last_modified"],
+                                    "sha256": result["sha256"], "size": result["bytes"] or result["skipped_bytes"]}
+    write_atomically(manifest_fname, json.dumps(manifest, indent=2).encode())
+
+    elapsed = time.perf_counter() - started
+    transferred = len(includes_text.encode()) + sum(result["bytes"] for result in results)
+    skipped = sum(result["skipped_bytes"] for result in results)
+    # // Estimate the time saved from the throughput of the files that did have to be downloaded.
+    throughput = transferred / elapsed if transferred and elapsed > 0 else 0
+    time_saved = skipped / throughput if throughput else 0.0
+    stats = {
+        "files": len(results),
+        "changed": sum(result["status"] == "changed" for result in results),
+        "changed_files": [result["file"] for result in results if result["status"] == "changed"],
+        "bytes_transferred": transferred,
+        "bytes_skipped": skipped,
+        "seconds": round(elapsed, 3),
+        "estimated_seconds_saved": round(time_saved, 3),
+    }
+    print(f"Updated {stats['changed']} of {stats['files']} files: {transferred} bytes transferred, "
+          f"{skipped} bytes skipped (~{stats['estimated_seconds_saved']}s saved) in {stats['seconds']}s.")
+    return stats
+
+
+def unload_updated_modules(changed_files) -> list:
+    # // Drop the already imported modules whose source file the update just rewrote (e.g. atomic_file),
+    # // so the next import runs the new code instead of reusing the old copy in sys.modules.
+    # // Returns the names of the modules dropped.
+    changed = {os.path.normcase(os.path.abspath(file_name)) for file_name in changed_files}
+    unloaded = []
+    for name, module in list(sys.modules.items()):
+        module_file = getattr(module, "__file__", None)
+        if module_file and name != "__main__" and os.path.normcase(os.path.abspath(module_file)) in changed:
+            del sys.modules[name]
+            unloaded.append(name)
+            try:
+                # // The .pyc is only checked against the source's size and whole-second mtime,
+                # // which a rewrite right after the first import can leave unchanged.
+                os.remove(importlib.util.cache_from_source(module_file))
+            except (OSError, ValueError, NotImplementedError):
+                pass
+    return unloaded
+
+
+def run_dashboard(in_process=True, changed_files=()):
+    # // Run the updated xbox360wrapper_main.py
+    run_file = "xbox360wrapper_main.py"
     print(f"Running {run_file}...")
-    subprocess.run(["python", run_file], check=True)
-    print(f"Successfully ran {run_file}.")
-except subprocess.CalledProcessError as e:
-    print(f"Failed to run {run_file}: {e}")
+    if in_process:
+        # // Hand off inside this interpreter instead of starting a second Python process.
+        # // Modules the updater imported itself and the update then replaced are imported again.
+        unload_updated_modules(changed_files)
+        import xbox360wrapper_main
+        xbox360wrapper_main.main()
+        print(f"Successfully ran {run_file}.")
+        return
+    try:
+        subprocess.run(["python", run_file], check=True)
+        print(f"Successfully ran {run_file}.")
+    except subprocess.CalledProcessError as e:
+        print(f"Failed to run {run_file}: {e}")
+
+
+if __name__ == "__main__":
+    stats = update()
+    run_dashboard(changed_files=stats["changed_files"])
@@ -1,22 +1,43 @@
+import time
+
+_IMPORT_STARTED = time.perf_counter()  # Start of the "import" startup phase
+
 import pygame
 import subprocess
 import threading
 import os
-import time
-import textwrap
 import math
-import pyautogui  # Requires: pip install pyautogui
-import datetime  # For formatting log timestamps
-import csv  # For CSV logging
+import heapq  # Priority queue for background image decoding
+import itertools
+import queue
+import zlib  # Compresses cached thumbnails
+import library_cache
+import library_watch
+import library_scan
+import frame_profiler
+import input_repeat
+import title_search
+import image_store
+import param_sfo
+import launch_warmup
+from collections import OrderedDict  # For the LRU render caches
+
+# Rarely used modules are imported on first use to keep startup fast:
+#   pyautogui (only when a game loads/exits), process_watch (only when a game is launched),
+#   session_store/sqlite3 (only when play time is logged or the grid is sorted by it).
 
 # -------------------------------
-# Initialize Full-Screen & Get Screen Size
+# Screen (set by init_display())
 # -------------------------------
-pygame.init()
-info = pygame.display.Info()
-SCREEN_WIDTH, SCREEN_HEIGHT = info.current_w, info.current_h
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.FULLSCREEN)
-pygame.display.set_caption("Xbox 360 RPCS3 Launcher")
+# The UI is drawn into `screen` at SCREEN_WIDTH x SCREEN_HEIGHT, the internal render resolution.
+# At a render scale below 1 that is an offscreen surface, upscaled into the window once per
+# presented frame; at 1 it is the window itself.
+DISPLAY_WIDTH, DISPLAY_HEIGHT = 0, 0  # Native window size
+SCREEN_WIDTH, SCREEN_HEIGHT = 0, 0  # Internal render resolution, everything is laid out for this
+screen = None
+display_surface = None  # The full-screen window
+render_scale = 1.0  # Current internal/native resolution ratio
+upscale_blocks = None  # (internal w, internal h, window w, window h) of the smallest block that scales exactly
 
 # -------------------------------
 # Colors & Fonts (Xbox 360 Themed)
@@ -29,55 +50,458 @@ SLOT_BG_COLOR = (40, 40, 40)  # Slot background for game containers
 TEXT_BOX_COLOR = (50, 50, 50)  # Background for text container
 
 # -------------------------------
-# UI Layout Constants (Relative to Screen Size)
+# UI Layout Constants (Relative to Screen Size, computed by compute_layout())
 # -------------------------------
-HEADER_HEIGHT = int(SCREEN_HEIGHT * 0.1)  # 10% of screen height
-outer_padding_x = int(SCREEN_WIDTH * 0.05)  # 5% horizontal padding
-outer_padding_y = int(SCREEN_HEIGHT * 0.05)  # 5% vertical padding
-inner_margin_x = int(SCREEN_WIDTH * 0.02)  # 2% gap between grid items horizontally
-inner_margin_y = int(SCREEN_HEIGHT * 0.02)  # 2% gap between grid items vertically
+HEADER_HEIGHT = 0  # 10% of screen height
+outer_padding_x = 0  # 5% horizontal padding
+outer_padding_y = 0  # 5% vertical padding
+inner_margin_x = 0  # 2% gap between grid items horizontally
+inner_margin_y = 0  # 2% gap between grid items vertically
 columns = 4  # Fixed: 4 games per row
 
-SWITCH_DELAY_MS = 300  # Minimum delay between navigation moves
+# Virtualized grid: fixed tile height, only the rows inside the viewport are laid out and drawn.
+VIRTUALIZED_GRID = True
+GRID_TILE_HEIGHT = 0  # 30% of screen height per tile when virtualized
+GRID_OVERSCAN_ROWS = 1  # Extra rows drawn above/below the viewport
+
+# Fonts (created by init_display())
+FONT = None
+HEADER_FONT = None
+FOOTER_FONT = None
+
+# -------------------------------
+# Input Settings
+# -------------------------------
+# Input is event driven: the loop sleeps in pygame.event.wait() until a key, controller or
+# background-thread event arrives. Held directions repeat with acceleration (input_repeat.py).
+IDLE_WAIT_MS = 1000  # Longest the loop sleeps without any event (background threads wake it earlier)
+MAX_FPS = 60  # Frame rate cap while the screen is changing
+A_BUTTON = 0  # Launches the selected game / confirms the shutdown menu
+B_BUTTON = 1  # Deletes a search character / clears the search
+Y_BUTTON = 3  # Opens and closes the on-screen search keyboard
+PAUSE_BUTTON = 7  # Toggles the shutdown menu
+
+# -------------------------------
+# Render Scale Settings
+# -------------------------------
+# Weak HTPCs driving 4K TVs can draw the UI at a lower internal resolution and upscale it.
+RENDER_SCALE = 1.0  # Fraction of the native resolution the UI is drawn at (0.5 upscales cheapest), or "auto"
+RENDER_SCALE_STEPS = (1.0, 0.75, 0.5)  # Scales "auto" picks from, sharpest first
+AUTO_SCALE_SLOW_FRAME_MS = 12  # "auto" steps down while full redraws take longer than this (median)
+AUTO_SCALE_FAST_FRAME_MS = 4  # ... and back up while they take less than this
+AUTO_SCALE_WINDOW = 30  # Full redraws measured before each "auto" decision
+AUTO_SCALE_RETRY_S = 120  # A scale "auto" measured as slow is not tried again for this long
+FONT_REFERENCE_HEIGHT = 1080  # The font sizes are for this render height and scale with it
+
+# -------------------------------
+# Render Cache Settings
+# -------------------------------
+SCALE_CACHE_SIZE = 256  # Max number of scaled cover/icon surfaces kept around (LRU)
+SCALE_QUALITY = "fast"  # "fast" uses transform.scale, "smooth" uses transform.smoothscale (once per size)
+TEXT_CACHE_SIZE = 1024  # Max number of wrapped title surfaces kept around (LRU)
+RETAINED_RENDERING = True  # Only redraw dirty slots and skip presenting frames when nothing changed
+
+# -------------------------------
+# Frame Profiler Settings
+# -------------------------------
+PROFILE_FRAMES = False  # Time every phase of every frame (also switched on by the overlay)
+FRAME_TRACE_FILE = "frame_trace.jsonl"  # Per-frame timings are appended here while tracing (F4)
+PROFILER_OVERLAY_KEY = pygame.K_F3  # Toggles the on-screen percentile overlay
+PROFILER_TRACE_KEY = pygame.K_F4  # Toggles dumping per-frame traces to FRAME_TRACE_FILE
+PROFILER_OVERLAY_BUTTON = 6  # Back button toggles the overlay from the controller
+
+# -------------------------------
+# Background Loading Settings
+# -------------------------------
+DECODE_WORKERS = 4  # Threads decoding PIC1/ICON0 PNGs in the background
+DECODE_STOP_TIMEOUT_S = 5  # Exit waits this long for the workers to finish the image they are loading
+PLACEHOLDER_COLOR = (55, 55, 55)  # Cover placeholder shown until a game's images are decoded
+USE_LIBRARY_CACHE = True  # Persist titles in library_cache.CACHE_FILE and display-size thumbnails in THUMBNAIL_FILE
+GRID_SORT = "library"  # "library" (root, then folder name order), "title", "recent" (last played first) or "playtime"
+HOT_RELOAD_LIBRARY = True  # Pick up games added to / removed from the library while running
+LIBRARY_SCAN_WAIT_S = 1.0  # Startup waits this long for slow library roots; later ones stream into the grid
+IMAGE_MEMORY_BUDGET_MB = image_store.BUDGET_MB  # Decoded covers/icons above this are paged out, least recently seen first
+PREFETCH_ROWS = 2  # Rows above and below the viewport whose images are loaded ahead of scrolling
+COVER_DEPTH = 24  # Bits per pixel of the opaque PIC1 copies: 3 bytes instead of the display's 4, a slightly slower blit
+
+# -------------------------------
+# Launch Warmup Settings
+# -------------------------------
+# Reads the selected game's EBOOT.BIN into the OS page cache ahead of a launch (launch_warmup.py).
+WARMUP_ENABLED = True  # Pre-read the files of the game the selection rests on
+WARMUP_DWELL_MS = launch_warmup.DWELL_MS  # Time the selection must rest on a game before its files are read
+WARMUP_BUDGET_MB = launch_warmup.BUDGET_MB  # Most bytes read ahead per game
 
 # -------------------------------
 # Paths & Global Variables
 # -------------------------------
 CWD = os.path.dirname(os.path.realpath(__file__))
 RPCS3_PATH = os.path.join(CWD, "RPCS3")
-GAMES = []  # Populated by retrieve_games()
+# Library roots holding game directories (relative to the working directory, other drives,
+# NAS folders). Each is scanned on its own thread; a game found in several roots is shown once,
+# from the first root that has it.
+LIBRARY_PATHS = ["./PS3"]
+GAMES = []  # Populated by retrieve_games(), replaced through set_library()
+root_games = {}  # Library root -> {gamepath: PlaystationGame} of every game found in it
+library_scanner = None  # library_scan.LibraryScanner while roots are still being scanned
+library_scan_times = {}  # Library root -> seconds its last full scan took
+library_watcher = None  # library_watch.LibraryWatcher when HOT_RELOAD_LIBRARY is on
 grid_scroll_y = 0  # Vertical scroll offset for grid
-game_loaded = False  # Set to True when the game is first loaded
 
 # Global variable for the controller (joystick)
 joystick = None
 
+# Grid selection
+selected_index = 0
+
+# Global variables for event-driven input
+nav_repeater = input_repeat.KeyRepeater()  # Held directions (keyboard, stick, d-pad)
+stick_directions = {0: None, 1: None}  # Axis -> direction the left stick currently holds
+WAKE_EVENT = pygame.event.custom_type()  # Posted by background threads to end the idle wait
+
+# Global variables for type-ahead search
+title_index = None  # title_search.TitleIndex over the titles of GAMES
+grid_games = []  # What the grid shows: GAMES, or the matching games while searching
+search_query = ""
+keyboard_open = False  # On-screen keyboard for searching with the controller
+keyboard_cursor = (0, 0)  # (row, column) of the highlighted on-screen key
+
 # New global variables for the shutdown menu
 menu_active = False
-pause_button_last_state = False  # Used to debounce the pause button
 
-# Global variables for screen time logging
-current_game_title = None
-game_start_time = None
+# Game session supervisor (process_watch.SessionSupervisor), created on the first launch
+session_supervisor = None
+session_supervisor_lock = threading.Lock()
+warmup = None  # launch_warmup.LaunchWarmup when WARMUP_ENABLED
+
+# Global variables for retained (dirty-rect) rendering
+static_layer = None  # Pre-composited background + header
+footer_surface = None  # Pre-rendered footer instructions
+needs_full_redraw = True  # Redraw and present the whole screen on the next frame
+dirty_rects = []  # Screen areas to redraw and present on the next frame
+frames_rendered = 0
+frames_skipped = 0
+render_scale_samples = []  # Full redraw times (ms) since the last RENDER_SCALE "auto" decision
+render_scale_timings = {}  # Render scale -> (median full redraw time (ms), perf_counter()) "auto" last measured at it
+
+# Global variables for the frame profiler
+profiler = frame_profiler.FrameProfiler(enabled=PROFILE_FRAMES)
+show_profiler_overlay = False
+profiler_overlay_rect = None  # Where the overlay was drawn last frame
+
+# Global variables for the persistent library cache
+library_index = {}  # gamepath -> cached entry (see library_cache.py)
+library_index_lock = threading.Lock()
+library_index_changed = False  # Set when the index needs to be written back to disk
+thumbnail_sizes = None  # (cover size, icon size) of the display copies and cached thumbnails
+thumbnail_pack = None  # library_cache.ThumbnailPack holding the cached thumbnails, opened by load_library()
+
+# Decoded images held in memory (display-size copies only), see image_store.py
+images = image_store.ImageStore(IMAGE_MEMORY_BUDGET_MB * 1024 * 1024)
+image_window = set()  # Games on or near the screen: loaded ahead and never paged out
 
-# CSV log file path
+# Play session history (SQLite), plus the old CSV log kept as an export
+session_db_file = "play_sessions.db"
 log_file = "screen_time_log.csv"
+sessions = None  # session_store.SessionStore, opened by get_sessions()
+sessions_lock = threading.Lock()
+# Finished sessions are logged once the dashboard window is back, which gives their exit latency
+returning_sessions = []  # GameSessions waiting for the dashboard, see check_returned_sessions()
+returning_sessions_lock = threading.Lock()
+dashboard_back_at = 0.0  # perf_counter() of the last WINDOWFOCUSGAINED / WINDOWEXPOSED
+EXIT_RETURN_TIMEOUT_S = 30  # A session whose dashboard does not come back by then is logged without an exit latency
+
+# Startup instrumentation: (phase, seconds) in the order the phases finished
+STARTUP_PHASES = []
+_phase_started = _IMPORT_STARTED
+
+
+# -------------------------------
+# Startup Instrumentation
+# -------------------------------
+def mark_startup_phase(name):
+    """Record how long the startup phase that just finished took."""
+    global _phase_started
+    now = time.perf_counter()
+    STARTUP_PHASES.append((name, now - _phase_started))
+    _phase_started = now
+
+
+def report_startup():
+    total = sum(seconds for _, seconds in STARTUP_PHASES)
+    phases = ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in STARTUP_PHASES)
+    print(f"Startup: {phases} (boot to dashboard {total * 1000:.0f} ms)")
+
+
+# -------------------------------
+# Initialize Full-Screen & Get Screen Size
+# -------------------------------
+def compute_layout():
+    """Derive the layout constants from the screen size."""
+    global HEADER_HEIGHT, outer_padding_x, outer_padding_y, inner_margin_x, inner_margin_y, GRID_TILE_HEIGHT
+    HEADER_HEIGHT = int(SCREEN_HEIGHT * 0.1)  # 10% of screen height
+    outer_padding_x = int(SCREEN_WIDTH * 0.05)  # 5% horizontal padding
+    outer_padding_y = int(SCREEN_HEIGHT * 0.05)  # 5% vertical padding
+    inner_margin_x = int(SCREEN_WIDTH * 0.02)  # 2% gap between grid items horizontally
+    inner_margin_y = int(SCREEN_HEIGHT * 0.02)  # 2% gap between grid items vertically
+    GRID_TILE_HEIGHT = int(SCREEN_HEIGHT * 0.3)  # 30% of screen height per tile when virtualized
+
+
+def init_display():
+    """Open the full-screen window and set up everything that depends on its size."""
+    global DISPLAY_WIDTH, DISPLAY_HEIGHT, display_surface
+    # Only the pygame modules the dashboard uses (pygame.init() would also start the mixer).
+    pygame.display.init()
+    pygame.font.init()
+    pygame.joystick.init()
+    info = pygame.display.Info()
+    display_surface = pygame.display.set_mode((info.current_w, info.current_h), pygame.FULLSCREEN)
+    DISPLAY_WIDTH, DISPLAY_HEIGHT = display_surface.get_size()  # What we got, not just what was asked for
+    pygame.display.set_caption("Xbox 360 RPCS3 Launcher")
+    set_render_scale(RENDER_SCALE_STEPS[0] if RENDER_SCALE == "auto" else RENDER_SCALE)
+    pygame.key.start_text_input()  # TEXTINPUT events drive the type-ahead search
+
+
+def set_render_scale(scale):
+    """Draw the UI at `scale` times the native resolution, with the layout and fonts derived from that size."""
+    global render_scale, SCREEN_WIDTH, SCREEN_HEIGHT, screen, upscale_blocks, FONT, HEADER_FONT, FOOTER_FONT
+    render_scale = scale
+    SCREEN_WIDTH = max(1, round(DISPLAY_WIDTH * scale))
+    SCREEN_HEIGHT = max(1, round(DISPLAY_HEIGHT * scale))
+    if (SCREEN_WIDTH, SCREEN_HEIGHT) == (DISPLAY_WIDTH, DISPLAY_HEIGHT):
+        screen = display_surface
+        upscale_blocks = None
+    else:
+        screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), 0, display_surface)
+        # Dirty rects are widened to whole blocks that scale to whole window pixels (3x3 -> 4x4 at
+        # 75%), so upscaling just those areas gives the same pixels as upscaling the whole frame.
+        gcd_x, gcd_y = math.gcd(SCREEN_WIDTH, DISPLAY_WIDTH), math.gcd(SCREEN_HEIGHT, DISPLAY_HEIGHT)
+        upscale_blocks = (SCREEN_WIDTH // gcd_x, SCREEN_HEIGHT // gcd_y, DISPLAY_WIDTH // gcd_x, DISPLAY_HEIGHT // gcd_y)
+    compute_layout()
+
+    # UI Fonts Setup
+    FONT = pygame.font.Font(None, scaled_font_size(32))
+    HEADER_FONT = pygame.font.Font(None, scaled_font_size(64))
+    FOOTER_FONT = pygame.font.Font(None, scaled_font_size(28))
+    if static_layer is not None:
+        # Changed while running: everything drawn for the old size is stale.
+        clear_render_caches()
+        build_static_layers()
+        mark_dirty()
+
+
+def scaled_font_size(size):
+    """A font size chosen for a FONT_REFERENCE_HEIGHT render height, scaled to the current one."""
+    return max(8, round(size * SCREEN_HEIGHT / FONT_REFERENCE_HEIGHT))
+
+
+def upscale_to_display(rects=None):
+    """Copy the internal-resolution frame into the window, scaled up.
+
+    With `rects` (internal coordinates) only those areas are copied and the window rects
+    to update are returned; without, the whole frame is copied and None is returned.
+    """
+    if screen is display_surface:
+        return rects
+    if rects is None or max(upscale_blocks[:2]) > 16:
+        # Odd resolutions whose blocks are huge are cheaper to upscale whole.
+        pygame.transform.scale(screen, display_surface.get_size(), display_surface)
+        return None if rects is None else [display_surface.get_rect()]
+    block_w, block_h, out_w, out_h = upscale_blocks
+    window_rects = []
+    for rect in rects:
+        left = rect.left // block_w * block_w
+        top = rect.top // block_h * block_h
+        right = min(SCREEN_WIDTH, -(-rect.right // block_w) * block_w)
+        bottom = min(SCREEN_HEIGHT, -(-rect.bottom // block_h) * block_h)
+        if right <= left or bottom <= top:
+            continue
+        source = pygame.Rect(left, top, right - left, bottom - top)
+        target = pygame.Rect(left // block_w * out_w, top // block_h * out_h,
+                             source.width // block_w * out_w, source.height // block_h * out_h)
+        pygame.transform.scale(screen.subsurface(source), target.size, display_surface.subsurface(target))
+        window_rects.append(target)
+    return window_rects
+
+
+def adapt_render_scale(frame_ms):
+    """RENDER_SCALE "auto": pick the render scale from the measured full redraw times.
+
+    While full redraws are slow, each smaller scale is tried in turn; once all are measured
+    the fastest one is kept (upscaling costs time too, so smaller is not always faster).
+    While they are fast, the next sharper scale is tried again, unless it was measured as
+    slow less than AUTO_SCALE_RETRY_S ago: switching rebuilds every render cache, so a scale
+    that is fast only because the sharper one is slow must not bounce between the two.
+    """
+    if RENDER_SCALE != "auto":
+        return
+    render_scale_samples.append(frame_ms)
+    if len(render_scale_samples) < AUTO_SCALE_WINDOW:
+        return
+    median = sorted(render_scale_samples)[len(render_scale_samples) // 2]
+    render_scale_samples.clear()
+    now = time.perf_counter()
+    render_scale_timings[render_scale] = (median, now)
+    sharper = [scale for scale in RENDER_SCALE_STEPS if scale > render_scale]
+    if median > AUTO_SCALE_SLOW_FRAME_MS:
+        untried = [scale for scale in RENDER_SCALE_STEPS if scale < render_scale and scale not in render_scale_timings]
+        if untried:
+            new_scale = untried[0]
+        else:
+            new_scale = min(render_scale_timings, key=lambda scale: (render_scale_timings[scale][0], -scale))
+    elif median < AUTO_SCALE_FAST_FRAME_MS and sharper:
+        new_scale = sharper[-1]
+        measured = render_scale_timings.get(new_scale)
+        if measured is not None and measured[0] > AUTO_SCALE_SLOW_FRAME_MS and now - measured[1] < AUTO_SCALE_RETRY_S:
+            return  # Slow a moment ago: stay here until the cooldown is over
+    else:
+        return
+    if new_scale == render_scale:
+        return
+    print(f"Render scale {render_scale:.0%} -> {new_scale:.0%} (full redraws took {median:.1f} ms)")
+    set_render_scale(new_scale)
+
+
+def press_hotkey(*keys):
+    """Send a key combination to the focused window (pyautogui is imported on first use)."""
+    import pyautogui  # Requires: pip install pyautogui
+    pyautogui.hotkey(*keys)
+
+
+def get_sessions():
+    """Open the play session store on first use, importing the old CSV log once."""
+    global sessions
+    with sessions_lock:
+        if sessions is None:
+            import session_store
+            sessions = session_store.SessionStore(session_db_file)
+            sessions.import_csv(log_file)  # One-time import of the pre-SQLite CSV log
+        return sessions
 
 
 # -------------------------------
 # Helper Functions
 # -------------------------------
-def scale_image_preserve_aspect(image, max_width, max_height):
+def scale_image_preserve_aspect(image, max_width, max_height, smooth=False):
     width, height = image.get_size()
     scale = min(max_width / width, max_height / height)
-    new_size = (int(width * scale), int(height * scale))
+    new_size = (max(1, int(width * scale)), max(1, int(height * scale)))
+    if new_size == (width, height):
+        return image  # Already fits, e.g. a display-size copy made by the image loader
+    if smooth and image.get_bitsize() in (24, 32):
+        # smoothscale only accepts 24/32-bit surfaces; anything else falls back to scale.
+        return pygame.transform.smoothscale(image, new_size)
     return pygame.transform.scale(image, new_size)
 
 
+class SurfaceCache:
+    """A small LRU cache for rendered surfaces."""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+    def evict_if(self, predicate):
+        """Drop every entry whose key matches `predicate(key)`."""
+        for key in [key for key in self.entries if predicate(key)]:
+            del self.entries[key]
+
+    def __len__(self):
+        return len(self.entries)
+
+
+# Scaled cover/icon surfaces, keyed by (game, kind, target width, target height).
+scaled_cache = SurfaceCache(SCALE_CACHE_SIZE)
+scaled_cache_layout = None  # get_grid_dimensions() output the cache was built for
+
+
+def get_scaled_image(game, kind, image, max_width, max_height):
+    """Return `image` (the game's "cover" or "icon") scaled to fit, reusing a cached copy when possible."""
+    key = (game, kind, int(max_width), int(max_height))
+    entry = scaled_cache.get(key)
+    # The source surface is stored alongside the scaled copy so a replaced image is rescaled.
+    if entry is not None and entry[0] is image:
+        return entry[1]
+    scaled = scale_image_preserve_aspect(image, int(max_width), int(max_height), smooth=SCALE_QUALITY == "smooth")
+    if scaled is not image:
+        scaled_cache.put(key, (image, scaled))
+    return scaled
+
+
+def clear_render_caches():
+    """Drop every cached scaled image and title surface (call after a layout or theme change)."""
+    scaled_cache.clear()
+    text_cache.clear()
+
+
+def check_layout_cache(layout):
+    """Drop cached surfaces when the tile size changes.
+
+    `layout` is the (tile width, tile height) the surfaces are made for. The number of rows
+    does not matter, so a search or library change keeps every cached surface.
+    """
+    global scaled_cache_layout
+    if layout != scaled_cache_layout:
+        clear_render_caches()
+        scaled_cache_layout = layout
+        if thumbnail_sizes is not None and get_thumbnail_sizes() != thumbnail_sizes:
+            reload_display_images()
+
+
+def wrap_text_to_width(text, font, max_width):
+    """Greedy word wrap using the font's real glyph metrics instead of an average character width."""
+    lines = []
+    current = ""
+    for word in text.split():
+        candidate = f"{current} {word}" if current else word
+        if font.size(candidate)[0] <= max_width:
+            current = candidate
+            continue
+        if current:
+            lines.append(current)
+        # A single word wider than the box is broken up character by character.
+        while font.size(word)[0] > max_width and len(word) > 1:
+            cut = len(word) - 1
+            while cut > 1 and font.size(word[:cut])[0] > max_width:
+                cut -= 1
+            lines.append(word[:cut])
+            word = word[cut:]
+        current = word
+    if current:
+        lines.append(current)
+    return lines
+
+
+# Wrapped title surfaces, keyed by (text, font, color, max_width). Kept across frames.
+text_cache = SurfaceCache(TEXT_CACHE_SIZE)
+
+
 def render_text_wrapped(text, font, color, max_width):
-    avg_char_width = font.size("A")[0]
-    max_chars = max_width // avg_char_width if avg_char_width else max_width
-    wrapped_lines = textwrap.wrap(text, width=max_chars)
+    key = (text, font, color, int(max_width))
+    cached = text_cache.get(key)
+    if cached is not None:
+        return cached
+    wrapped_lines = wrap_text_to_width(text, font, int(max_width))
     line_surfaces = [font.render(line, True, color) for line in wrapped_lines]
     width = max((surface.get_width() for surface in line_surfaces), default=max_width)
     height = sum(surface.get_height() for surface in line_surfaces)
@@ -86,26 +510,55 @@ def render_text_wrapped(text, font, color, max_width):
     for surface in line_surfaces:
         text_surface.blit(surface, (0, y))
         y += surface.get_height()
+    text_cache.put(key, text_surface)
     return text_surface
 
 
 # -------------------------------
 # Controller Hot-Plugging Support
 # -------------------------------
-def check_for_new_controller():
-    """Checks periodically if a controller is connected, and if so, initializes it."""
+def handle_controller_event(event):
+    """Open or drop the controller on JOYDEVICEADDED / JOYDEVICEREMOVED.
+
+    SDL also sends JOYDEVICEADDED for controllers already plugged in at startup.
+    """
     global joystick
-    if pygame.joystick.get_count() > 0:
-        if joystick is None or not joystick.get_init():
-            joystick = pygame.joystick.Joystick(0)
+    if event.type == pygame.JOYDEVICEADDED:
+        if joystick is None:
+            joystick = pygame.joystick.Joystick(event.device_index)
             joystick.init()
             print(f"Controller connected: {joystick.get_name()}")
-    else:
-        # If a controller was previously connected but now is disconnected.
-        if joystick is not None:
+    elif event.type == pygame.JOYDEVICEREMOVED:
+        if joystick is not None and event.instance_id == joystick.get_instance_id():
             print("Controller disconnected.")
             joystick.quit()
             joystick = None
+            release_controller_directions()
+            # Fall back to another controller that is still plugged in.
+            if pygame.joystick.get_count() > 0:
+                joystick = pygame.joystick.Joystick(0)
+                joystick.init()
+                print(f"Controller connected: {joystick.get_name()}")
+
+
+def is_active_controller(event):
+    """True if a JOY* input event comes from the controller the dashboard listens to."""
+    return joystick is not None and getattr(event, "instance_id", None) == joystick.get_instance_id()
+
+
+def release_controller_directions():
+    nav_repeater.release("stick")
+    nav_repeater.release("hat")
+    for axis in stick_directions:
+        stick_directions[axis] = None
+
+
+def wake_main_loop():
+    """Wake the main loop from its idle wait. Safe to call from any thread."""
+    try:
+        pygame.event.post(pygame.event.Event(WAKE_EVENT))  # SDL_PushEvent is thread-safe
+    except pygame.error:
+        pass  # Display already closed (shutting down)
 
 
 # -------------------------------
@@ -150,174 +603,765 @@ def draw_shutdown_menu():
 # PlaystationGame Class
 # -------------------------------
 class PlaystationGame:
-    def __init__(self, title, gamepath, runpath, console='PS3', image=None, icon=None):
+    def __init__(self, title, gamepath, runpath, console='PS3', image=None, icon=None, image_path=None,
+                 icon_path=None, title_id=None, version=None):
         self.title = title
+        self.title_id = title_id  # e.g. BLUS30001, from PARAM.SFO (None for Title.txt-only dumps)
+        self.version = version  # APP_VER (or VERSION) from PARAM.SFO
         self.gamepath = gamepath
         self.runpath = runpath
         self.console = console
         self.image = image  # PIC1 image
         self.icon = icon  # ICON0 image
+        self.image_path = image_path  # PIC1.PNG, decoded in the background
+        self.icon_path = icon_path  # ICON0.PNG, decoded in the background
+        # True once the background decode has finished (even if an image turned out to be missing).
+        self.images_loaded = image is not None or icon is not None
 
     def __str__(self):
         return self.title
 
     def play(self):
-        global current_game_title, game_start_time
-        # Record the start time and game name for logging.
-        current_game_title = self.title
-        game_start_time = time.time()
-        # Start the monitor in a separate thread before launching the game.
-        t = threading.Thread(target=monitor, args=())
-        t.start()
-        self.start_game()
+        """Launch the game, unless a session is already in progress (then the press is ignored)."""
+        import process_watch
+        supervisor = get_session_supervisor()
+        if supervisor.busy():
+            print(f"Ignoring launch of {self.title}: a game is already {supervisor.state}.")
+            return
+        state = warmup.launched(self.gamepath) if warmup is not None else None
+        if not supervisor.launch(self.title, lambda: process_watch.PopenWatcher(self.start_game()), state):
+            print(f"Ignoring launch of {self.title}: a game is already {supervisor.state}.")
+            return
+        if state is not None:
+            print(f"Launching {self.title} with {state} files.")
 
     def start_game(self):
         program = os.path.join(RPCS3_PATH, "rpcs3.exe")
-        subprocess.Popen([program, self.runpath], shell=False)
+        process = subprocess.Popen([program, self.runpath], shell=False)
         print(f"Launching: {self.title}")
+        return process
 
 
 # -------------------------------
-# Monitor Function with ALT+ENTER, ALT+TAB, and CSV Logging
+# Game Sessions with ALT+ENTER, ALT+TAB, and Session Logging
 # -------------------------------
-def monitor():
-    """Monitors RPCS3 and:
-       - When first loaded (kb_ram > 1,000,000 and game_loaded is False), sends ALT+ENTER
-         to trigger fullscreen for RPCS3 and minimizes (iconifies) the dashboard.
-       - When the game is closed (kb_ram < 700,000), kills RPCS3, logs play time, and simulates ALT+TAB.
+def get_session_supervisor():
+    """Start the session supervisor on first use. Its one worker thread follows every launched game.
+
+    The RAM thresholds telling when a game has loaded or was closed, and the polling intervals,
+    are the settings at the top of process_watch.py.
     """
-    global game_loaded, game_start_time, current_game_title
-    print("Monitoring RPCS3...")
-    time.sleep(3)
-
-    while True:
-        process = subprocess.run("tasklist | findstr rpcs3", shell=True, capture_output=True, text=True)
-        output = process.stdout.strip()
-        if not output:
-            print("RPCS3 not found.")
-            time.sleep(1)
-            if game_loaded:
-                # Record end time and compute elapsed duration.
-                game_end_time = time.time()
-                start_str = datetime.datetime.fromtimestamp(game_start_time).strftime("%Y-%m-%d %H:%M:%S")
-                end_str = datetime.datetime.fromtimestamp(game_end_time).strftime("%Y-%m-%d %H:%M:%S")
-                duration_seconds = int(game_end_time - game_start_time)
-                duration_str = str(datetime.timedelta(seconds=duration_seconds))
-                # Write log to CSV.
-                # If the file doesn't exist, write the header first.
-                if not os.path.exists(log_file):
-                    with open(log_file, "w", newline="") as f:
-                        writer = csv.writer(f)
-                        writer.writerow(["Game", "Start", "End", "Time Played"])
-                with open(log_file, "a", newline="") as f:
-                    writer = csv.writer(f)
-                    writer.writerow([current_game_title, start_str, end_str, duration_str])
-                print(f"Logged play time for {current_game_title}.")
-                game_loaded = False
-                pyautogui.hotkey('alt', 'tab')
-                break
-            continue
-        stdout = [x for x in process.stdout.split(" ") if x != '']
-        if len(stdout) < 3:
-            time.sleep(1)
+    global session_supervisor
+    with session_supervisor_lock:
+        if session_supervisor is None:
+            import process_watch
+            session_supervisor = process_watch.SessionSupervisor(on_game_loaded, on_game_exited, on_session_finished)
+        return session_supervisor
+
+
+def on_game_loaded(session):
+    """The game is up: send ALT+ENTER to fullscreen RPCS3 and minimize (iconify) the dashboard."""
+    press_hotkey('alt', 'enter')
+    print("Sent ALT+ENTER to toggle fullscreen for RPCS3.")
+    pygame.display.iconify()  # Minimize the dashboard
+
+
+def on_game_exited(session):
+    """RPCS3 has been stopped: simulate ALT+TAB to get back to the dashboard."""
+    press_hotkey('alt', 'tab')
+
+
+def on_session_finished(session):
+    """The session is over: log it once the main loop sees the dashboard window again."""
+    if not session.loaded:
+        return
+    print(f"Session latency for {session.title}: launch to game loaded {session.launch_latency_s * 1000:.0f} ms.")
+    if warmup is not None and session.warmup is not None:
+        warmup.record_launch_latency(session.warmup, session.launch_latency_s)
+        print(warmup.summary())
+    with returning_sessions_lock:
+        returning_sessions.append(session)
+    wake_main_loop()
+
+
+def check_returned_sessions(flush=False):
+    """Main thread: log the finished sessions whose dashboard has come back (or never will).
+
+    The exit latency runs from the exit being confirmed to the first focus or expose event of
+    the dashboard window after it. With `flush` every waiting session is logged (at exit).
+    """
+    with returning_sessions_lock:
+        if not returning_sessions:
+            return
+        waiting = list(returning_sessions)
+    now = time.perf_counter()
+    for session in waiting:
+        if dashboard_back_at >= session.exit_detected:
+            session.exit_latency_s = dashboard_back_at - session.exit_detected
+            print(f"Session latency for {session.title}: exit to dashboard {session.exit_latency_s * 1000:.0f} ms.")
+        elif not flush and now - session.exit_detected < EXIT_RETURN_TIMEOUT_S:
             continue
-        psid = stdout[1]
-        try:
-            kb_ram = int(stdout[-2].replace(",", ""))
-        except ValueError:
-            kb_ram = 0
-        print(f"RPCS3 RAM Usage: {kb_ram} KB")
-        time.sleep(1)
-        # When game first loads, send ALT+ENTER and minimize dashboard.
-        if not game_loaded and kb_ram > 1_000_000:
-            game_loaded = True
-            pyautogui.hotkey('alt', 'enter')
-            print("Sent ALT+ENTER to toggle fullscreen for RPCS3.")
-            pygame.display.iconify()  # Minimize the dashboard
-        # When game is closed, kill RPCS3, log screen time, and bring dashboard to front.
-        if game_loaded and kb_ram < 700_000:
-            print(f"Game exited, stopping RPCS3 (PID {psid}).")
-            subprocess.run(f"taskkill /PID {psid} /F", shell=False)
-            # Record end time and compute elapsed duration.
-            game_end_time = time.time()
-            start_str = datetime.datetime.fromtimestamp(game_start_time).strftime("%Y-%m-%d %H:%M:%S")
-            end_str = datetime.datetime.fromtimestamp(game_end_time).strftime("%Y-%m-%d %H:%M:%S")
-            duration_seconds = int(game_end_time - game_start_time)
-            duration_str = str(datetime.timedelta(seconds=duration_seconds))
-            # Write log to CSV.
-            # If the file doesn't exist, write the header first.
-            if not os.path.exists(log_file):
-                with open(log_file, "w", newline="") as f:
-                    writer = csv.writer(f)
-                    writer.writerow(["Game", "Start", "End", "Time Played"])
-            with open(log_file, "a", newline="") as f:
-                writer = csv.writer(f)
-                writer.writerow([current_game_title, start_str, end_str, duration_str])
-            print(f"Logged play time for {current_game_title}.")
-            game_loaded = False
-            pyautogui.hotkey('alt', 'tab')
-            break
+        with returning_sessions_lock:
+            returning_sessions.remove(session)
+        log_play_time(session)
+
+
+def log_play_time(session):
+    """Record a finished session in the session store and append it to the CSV log."""
+    store = get_sessions()
+    exit_latency_ms = None if session.exit_latency_s is None else round(session.exit_latency_s * 1000)
+    store.record_session(session.title, session.started_at, session.ended_at,
+                         round(session.launch_latency_s * 1000), exit_latency_ms)
+    try:
+        store.append_csv(log_file, session.title, session.started_at, session.ended_at)
+    except OSError as e:
+        print(f"Failed to write {log_file}: {e}")
+    print(f"Logged play time for {session.title}.")
 
 
 # -------------------------------
 # Game Retrieval & Image Loading
 # -------------------------------
-def retrieve_games():
-    """Scans the ./PS3 directory for games and returns a list of PlaystationGame objects."""
-    directory_path = "./PS3"
+def read_game_metadata(gamepath):
+    """Return the PARAM.SFO fields of a game directory, or {} if it has no readable PARAM.SFO."""
+    sfo_path = os.path.join(gamepath, "PS3_GAME", "PARAM.SFO")
+    try:
+        return param_sfo.read(sfo_path)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"Failed to read {sfo_path}: {e}")
+        return {}
+
+
+def scan_game_directory(gamepath, cached_entry=None, dir_stat=None):
+    """Return the library index entry for one game directory, or None if it is not a game.
+
+    The title comes from Title.txt, so names picked by the user (and the play history kept
+    under them) stay as they are; PS3_GAME/PARAM.SFO supplies it for dumps without one. The
+    cached entry is reused while its signature still matches, otherwise the files are read again.
+    """
+    signature = library_cache.directory_signature(gamepath, dir_stat)
+    if isinstance(cached_entry, dict) and cached_entry.get("signature") == signature:
+        return cached_entry
+    # New or changed directory: re-examine it.
+    metadata = read_game_metadata(gamepath)
+    title_path = os.path.join(gamepath, "Title.txt")
+    if os.path.exists(title_path):
+        with open(title_path, "r") as f:
+            title = f.read()
+    else:
+        title = metadata.get("TITLE")
+        if not isinstance(title, str) or not title.strip():
+            return None
+    version = metadata.get("APP_VER") or metadata.get("VERSION")
+    return {
+        "signature": signature,
+        "title": " ".join(title.split()),  # SFO titles may be split over two lines
+        "title_id": metadata.get("TITLE_ID"),
+        "version": version if isinstance(version, str) else None,
+        "runpath": os.path.join(gamepath, "PS3_GAME", "USRDIR", "EBOOT.BIN"),
+        "image_path": os.path.join(gamepath, "PS3_GAME", "PIC1.PNG"),
+        "icon_path": os.path.join(gamepath, "PS3_GAME", "ICON0.PNG"),
+    }
+
+
+def read_game_directory(gamepath, cached_entry=None, dir_stat=None):
+    """scan_game_directory(), but a directory that cannot be read right now counts as not a game (yet).
+
+    Title.txt may be half-copied and locked, deleted since the directory was listed, or not
+    a readable text file. A later change to the directory gets it examined again.
+    """
+    try:
+        return scan_game_directory(gamepath, cached_entry, dir_stat)
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Skipping {gamepath}: {e}")
+        return None
+
+
+def game_from_entry(gamepath, entry):
+    return PlaystationGame(entry["title"], gamepath, entry["runpath"], image_path=entry["image_path"],
+                           icon_path=entry["icon_path"], title_id=entry["title_id"], version=entry["version"])
+
+
+def library_roots():
+    """LIBRARY_PATHS without duplicates, each written the way os.scandir joins it with a game directory."""
+    roots = []
+    seen = set()
+    for path in LIBRARY_PATHS:
+        root = os.path.dirname(os.path.join(path, ""))  # "D:/PS3/" -> "D:/PS3"
+        key = os.path.normcase(os.path.abspath(root))  # No realpath(): it can block on a sleeping NAS
+        if key not in seen:
+            seen.add(key)
+            roots.append(root)
+    return roots
+
+
+def scan_library_root(root):
+    """Runs on a scanner thread: the index entries and directory snapshot of one library root.
+
+    PARAM.SFO (or Title.txt) is only read for directories that changed since the cached
+    library index was written; PIC1/ICON0 are decoded later by the ImageLoader.
+    """
+    entries = {}
+    snapshot = {}
+    for gamepath, dir_stat in library_scan.game_directories(root):
+        with library_index_lock:
+            cached_entry = library_index.get(gamepath)
+        entry = read_game_directory(gamepath, cached_entry, dir_stat)  # One bad game does not fail the root
+        if entry is not None:
+            entries[gamepath] = entry
+            snapshot[gamepath] = entry["signature"]
+        else:
+            snapshot[gamepath] = library_cache.directory_signature(gamepath, dir_stat)
+    return entries, snapshot
+
+
+def apply_root_scans(scans):
+    """Main thread: replace the games and index entries of every root in `scans` with what was found."""
+    global library_index_changed
+    for scan in scans:
+        library_scan_times[scan.root] = scan.seconds
+        if scan.error is not None:
+            print(f"Failed to scan library root {scan.root}: {scan.error}")
+            continue
+        print(f"Scanned {scan.root}: {len(scan.entries)} games in {scan.seconds * 1000:.0f} ms")
+        old_games = root_games.get(scan.root, {})
+        games = {}
+        with library_index_lock:
+            for gamepath in [path for path in library_index if os.path.dirname(path) == scan.root]:
+                if gamepath not in scan.entries:
+                    del library_index[gamepath]
+                    library_index_changed = True
+            for gamepath, entry in scan.entries.items():
+                old_game = old_games.get(gamepath)
+                if library_index.get(gamepath) is entry and old_game is not None:
+                    games[gamepath] = old_game  # Unchanged: keep the game and whatever images it holds
+                    continue
+                if library_index.get(gamepath) is not entry:
+                    library_index[gamepath] = entry
+                    library_index_changed = True
+                games[gamepath] = game_from_entry(gamepath, entry)
+        for gamepath, old_game in old_games.items():
+            if games.get(gamepath) is not old_game:
+                forget_game(old_game)
+        root_games[scan.root] = games
+
+
+def merge_root_games():
+    """Every root's games in LIBRARY_PATHS order, then directory name order, each game only once.
+
+    The same game (by TITLE_ID) found in several roots is taken from the first root.
+    """
     games = []
-    if not os.path.exists(directory_path):
-        print("PS3 directory not found.")
-        return games
-
-    game_directories = [d for d in os.listdir(directory_path) if os.path.isdir(os.path.join(directory_path, d))]
-    for game_dir in game_directories:
-        title_path = os.path.join(directory_path, game_dir, "Title.txt")
-        if os.path.exists(title_path):
-            with open(title_path, "r") as f:
-                title = f.read().strip()
-            runpath = os.path.join(directory_path, game_dir, "PS3_GAME", "USRDIR", "EBOOT.BIN")
-            # Load main game image (PIC1.PNG)
-            image_path = os.path.join(directory_path, game_dir, "PS3_GAME", "PIC1.PNG")
-            if os.path.exists(image_path):
-                try:
-                    image = pygame.image.load(image_path).convert_alpha()
-                except Exception as e:
-                    print(f"Error loading PIC1 for {title}: {e}")
-                    image = None
-            else:
-                image = None
-            # Load icon image (ICON0.PNG)
-            icon_path = os.path.join(directory_path, game_dir, "PS3_GAME", "ICON0.PNG")
-            if os.path.exists(icon_path):
-                try:
-                    icon = pygame.image.load(icon_path).convert_alpha()
-                except Exception as e:
-                    print(f"Error loading ICON0 for {title}: {e}")
-                    icon = None
-            else:
-                icon = None
-            games.append(
-                PlaystationGame(title, os.path.join(directory_path, game_dir), runpath, image=image, icon=icon))
+    seen_title_ids = set()
+    for root in library_roots():
+        found = root_games.get(root, {})
+        for gamepath in sorted(found):
+            game = found[gamepath]
+            if game.title_id is not None:
+                if game.title_id in seen_title_ids:
+                    continue
+                seen_title_ids.add(game.title_id)
+            games.append(game)
     return games
 
 
+def retrieve_games():
+    """Scans every library root (all at once) and returns the merged list of PlaystationGame objects."""
+    scanner = library_scan.LibraryScanner(library_roots(), scan_library_root)
+    apply_root_scans(scanner.wait())
+    return merge_root_games()
+
+
+def compact_cover(surface):
+    """PIC1 is opaque: keep it without an alpha channel, packed at COVER_DEPTH bits per pixel."""
+    return surface.convert(COVER_DEPTH)
+
+
+def load_image_file(path, label, title):
+    """Decode a PNG from disk, returning None if it is missing or unreadable. Safe to call off the main thread."""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        return pygame.image.load(path)
+    except Exception as e:
+        print(f"Error loading {label} for {title}: {e}")
+        return None
+
+
 # -------------------------------
-# UI Fonts Setup
+# Background Image Decoding
 # -------------------------------
-FONT = pygame.font.Font(None, 32)
-HEADER_FONT = pygame.font.Font(None, 64)
-FOOTER_FONT = pygame.font.Font(None, 28)
+class ImageLoader:
+    """Loads game images on a pool of worker threads, nearest to the selection first.
 
-# Load games
-GAMES = retrieve_games()
-if not GAMES:
-    print("No games found. Exiting.")
-    pygame.quit()
-    exit()
+    Workers run `load(game)`, which returns the (cover, icon) at display size; the surfaces
+    are handed back through apply_finished(), which runs on the main thread and converts
+    them into the display format.
+    """
+
+    def __init__(self, workers, load, on_finished=None):
+        self.load = load
+        self.on_finished = on_finished  # Optional hook run when results are waiting for apply_finished()
+        self.condition = threading.Condition()
+        self.heap = []  # (priority, sequence, game)
+        self.pending = {}  # game -> current priority, stale heap entries are skipped
+        self.loading = set()  # Games taken by a worker whose images are not attached yet
+        self.sequence = itertools.count()
+        self.finished = queue.Queue()
+        self.wake_posted = False  # on_finished() already ran for the results not yet applied
+        self.stopped = False
+        self.threads = [threading.Thread(target=self._worker, daemon=True) for _ in range(workers)]
+        for thread in self.threads:
+            thread.start()
+
+    def request(self, game, priority):
+        """Queue `game` for loading (lower priority values are loaded first), or update its priority."""
+        with self.condition:
+            if self.pending.get(game) == priority or game in self.loading:
+                return
+            self.pending[game] = priority
+            heapq.heappush(self.heap, (priority, next(self.sequence), game))
+            self.condition.notify()
+
+    def keep_only(self, games):
+        """Forget the pending loads of every game not in `games` (e.g. scrolled far out of view)."""
+        with self.condition:
+            for game in [game for game in self.pending if game not in games]:
+                del self.pending[game]
+
+    def busy(self):
+        """True while games are waiting to be loaded or handed back."""
+        with self.condition:
+            return bool(self.pending or self.loading) or not self.finished.empty()
+
+    def apply_finished(self):
+        """Attach loaded images to their games (main thread only) and return the games that changed."""
+        updated = []
+        with self.condition:
+            self.wake_posted = False  # Anything finished from here on wakes the main thread again
+        while True:
+            try:
+                game, image, icon = self.finished.get_nowait()
+            except queue.Empty:
+                return updated
+            game.image = compact_cover(image) if image else None
+            game.icon = icon.convert_alpha() if icon else None
+            game.images_loaded = True
+            with self.condition:
+                self.loading.discard(game)
+            updated.append(game)
+
+    def cancel(self, game):
+        """Forget a pending load (e.g. the game was removed from the library)."""
+        with self.condition:
+            self.pending.pop(game, None)
+
+    def stop(self, timeout=None):
+        """Drop every pending load and wait up to `timeout` seconds for the loads in progress to finish."""
+        with self.condition:
+            self.stopped = True
+            self.pending.clear()
+            self.heap.clear()
+            self.condition.notify_all()
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        for thread in self.threads:
+            thread.join(None if deadline is None else max(0.0, deadline - time.perf_counter()))
+
+    def _worker(self):
+        while True:
+            with self.condition:
+                while not self.stopped and not self.heap:
+                    self.condition.wait()
+                if self.stopped:
+                    return
+                priority, _, game = heapq.heappop(self.heap)
+                if self.pending.get(game) != priority:
+                    continue  # Already loaded, cancelled or superseded by a newer priority
+                del self.pending[game]
+                self.loading.add(game)
+            image, icon = self.load(game)
+            self.finished.put((game, image, icon))
+            # Only the first result of a batch needs to wake the main thread; it drains the rest.
+            with self.condition:
+                wake = not self.wake_posted
+                self.wake_posted = True
+            if wake and self.on_finished:
+                self.on_finished()
+
+
+image_loader = None  # Started once the library has been scanned
+
+
+def load_display_images(game):
+    """Runs on a loader worker: the game's (cover, icon) at display size.
+
+    Cached thumbnails are used when they match the current tile size. Otherwise the PNGs
+    are decoded and shrunk right away, so the full-size 1920x1080 PIC1 never outlives this call.
+    """
+    sizes = thumbnail_sizes
+    thumbnails = cached_thumbnails(game, sizes)
+    if thumbnails is not None:
+        try:
+            return (unpack_thumbnail(thumbnails["cover"]) if thumbnails["cover"] else None,
+                    unpack_thumbnail(thumbnails["icon"]) if thumbnails["icon"] else None)
+        except Exception as e:
+            print(f"Cached thumbnail for {game.title} is corrupt, rebuilding: {e}")
+            drop_cached_thumbnails(game)
+    cover_size, icon_size = sizes
+    image = load_image_file(game.image_path, "PIC1", game.title)
+    icon = load_image_file(game.icon_path, "ICON0", game.title)
+    if image is not None:
+        image = scale_image_preserve_aspect(image, cover_size[0], cover_size[1], smooth=True)
+    if icon is not None:
+        icon = scale_image_preserve_aspect(icon, icon_size[0], icon_size[1], smooth=True)
+    if USE_LIBRARY_CACHE:
+        store_thumbnails(game, image, icon, sizes)
+    return image, icon
+
+
+def make_image_priority():
+    """Return a function ranking grid indices: visible rows first, then outwards from the selected game."""
+    _, grid_item_height, rows, _ = get_grid_dimensions()
+    first_row, last_row = get_visible_row_range(grid_item_height, rows)
+
+    def image_priority(index):
+        visible = first_row <= index // columns <= last_row
+        return (0 if visible else 1, abs(index - selected_index))
+
+    return image_priority
+
+
+def get_image_window():
+    """Grid indices on screen plus PREFETCH_ROWS rows above and below, nearest to the selection first."""
+    _, grid_item_height, rows, _ = get_grid_dimensions()
+    first_row, last_row = get_visible_row_range(grid_item_height, rows)
+    first = max(0, first_row - PREFETCH_ROWS) * columns
+    last = min(len(grid_games), (last_row + 1 + PREFETCH_ROWS) * columns)
+    return sorted(range(first, last), key=lambda i: abs(i - selected_index))
 
-selected_index = 0
-last_switch_time = 0  # For navigation debounce
+
+def queue_image_loads():
+    """Start the background loader (once) and load the images around the current view."""
+    global image_loader, thumbnail_sizes
+    if image_loader is None:
+        thumbnail_sizes = get_thumbnail_sizes()
+        if USE_LIBRARY_CACHE:
+            # The first screen comes straight from the thumbnail cache, without waiting for a worker.
+            attach_cached_thumbnails([grid_games[i] for i in get_image_window()])
+        image_loader = ImageLoader(DECODE_WORKERS, load_display_images, on_finished=wake_main_loop)
+    update_image_window()
+
+
+def update_image_window():
+    """After the view moved: load what is near it, stop loading what left it and page out over budget."""
+    global image_window
+    if image_loader is None:
+        return
+    image_priority = make_image_priority()
+    window = get_image_window()
+    image_window = {grid_games[i] for i in window}
+    image_loader.keep_only(image_window)
+    for i in reversed(window):
+        game = grid_games[i]
+        images.touch(game)  # The selection ends up most recently used
+        if not game.images_loaded:
+            image_loader.request(game, image_priority(i))
+    evict_images()
+
+
+def remember_images(game):
+    """Account the memory of a game's freshly attached images."""
+    images.add(game, image_store.surface_bytes(game.image) + image_store.surface_bytes(game.icon))
+
+
+def evict_images():
+    """Page out the least recently seen games until the images fit IMAGE_MEMORY_BUDGET_MB again."""
+    for game in images.evict(pinned=image_window):
+        game.image = game.icon = None
+        game.images_loaded = False  # Loaded again (from the thumbnail cache if possible) when back in view
+        scaled_cache.evict_if(lambda key: key[0] is game)
+
+
+def reload_display_images():
+    """The tile size changed: drop every display copy and load them again at the new size."""
+    global thumbnail_sizes
+    thumbnail_sizes = get_thumbnail_sizes()
+    for game in GAMES:
+        game.image = game.icon = None
+        game.images_loaded = False
+    images.clear()
+    update_image_window()
+
+
+def apply_loaded_images():
+    """Pick up finished loads and repaint the visible slots that received images."""
+    if image_loader is None:
+        return
+    updated = image_loader.apply_finished()
+    if not updated:
+        return
+    for game in updated:
+        remember_images(game)
+    evict_images()
+    updated = set(updated)
+    _, grid_item_height, rows, _ = get_grid_dimensions()
+    first_row, last_row = get_visible_row_range(grid_item_height, rows)
+    for i in range(first_row * columns, min(len(grid_games), (last_row + 1) * columns)):
+        if grid_games[i] in updated:
+            invalidate_slot(i)
+
+
+def sort_games(games):
+    """Order the library according to GRID_SORT, using the per-game totals from the session store."""
+    if GRID_SORT == "title":
+        return sorted(games, key=lambda game: game.title.lower())
+    if GRID_SORT in ("recent", "playtime"):
+        totals = get_sessions().game_totals()
+        field = 1 if GRID_SORT == "recent" else 0
+        # Played games first (most recent / most played), then the rest in scan order.
+        return sorted(games, key=lambda game: (game.title not in totals, -totals.get(game.title, (0, 0))[field]))
+    return games
+
+
+# -------------------------------
+# Library Hot-Reload
+# -------------------------------
+def forget_game(game):
+    """Drop everything held for a game that left the library (or was replaced by a rescan)."""
+    if image_loader is not None:
+        image_loader.cancel(game)
+    images.remove(game)
+    scaled_cache.evict_if(lambda key: key[0] is game)
+
+
+def update_library(games):
+    """Show a new version of the library, keeping the same game selected if it is still there."""
+    global selected_index
+    selected_path = grid_games[selected_index].gamepath if grid_games else None
+    set_library(sort_games(games))
+    positions = {game.gamepath: i for i, game in enumerate(grid_games)}
+    selected_index = positions.get(selected_path, min(selected_index, max(0, len(grid_games) - 1)))
+    queue_image_loads()
+    mark_dirty()
+
+
+def apply_library_changes(changes):
+    """Apply added/removed/changed game directories to GAMES, touching only the affected entries."""
+    global library_index_changed
+    for gamepath in changes.removed | changes.changed:
+        with library_index_lock:
+            cached_entry = library_index.get(gamepath)
+        entry = None if gamepath in changes.removed else read_game_directory(gamepath, cached_entry)
+        if entry is not None and entry is cached_entry:
+            continue  # Directory touched but nothing the dashboard shows has changed
+        games = root_games.setdefault(os.path.dirname(gamepath), {})
+        old_game = games.pop(gamepath, None)
+        if old_game is not None:
+            forget_game(old_game)
+            print(f"Removed from library: {old_game.title}")
+        with library_index_lock:
+            library_index.pop(gamepath, None)
+            if entry is not None:
+                library_index[gamepath] = entry
+            library_index_changed = True
+        if entry is not None:
+            games[gamepath] = game_from_entry(gamepath, entry)
+
+    for gamepath in changes.added:
+        entry = read_game_directory(gamepath)
+        if entry is None:
+            continue  # Not a game (yet), e.g. PARAM.SFO still being copied or Title.txt locked
+        with library_index_lock:
+            library_index[gamepath] = entry
+            library_index_changed = True
+        root_games.setdefault(os.path.dirname(gamepath), {})[gamepath] = game_from_entry(gamepath, entry)
+        print(f"Added to library: {entry['title']}")
+
+    update_library(merge_root_games())
+
+
+def check_library_changes():
+    """Apply whatever the background library watcher has noticed since the last frame."""
+    if library_watcher is None:
+        return
+    changes = library_watcher.poll_changes()
+    if changes:
+        apply_library_changes(changes)
+
+
+def check_library_scans():
+    """Merge library roots that finished scanning after startup, then start watching the library."""
+    global library_scanner
+    if library_scanner is None:
+        return
+    scans = library_scanner.poll()
+    if scans:
+        apply_root_scans(scans)
+        update_library(merge_root_games())
+    if library_scanner.done():
+        start_library_watcher(library_scanner.snapshot)
+        library_scanner = None
+
+
+def game_session_running():
+    """True while a launched game is in progress. Safe to call from any thread."""
+    supervisor = session_supervisor
+    return supervisor is not None and supervisor.busy()
+
+
+def start_library_watcher(snapshot):
+    global library_watcher
+    if HOT_RELOAD_LIBRARY:
+        # Paused while a game runs: its metadata I/O would compete with the game and keep drives awake.
+        library_watcher = library_watch.LibraryWatcher(library_roots(), on_change=wake_main_loop, snapshot=snapshot,
+                                                       paused=game_session_running)
+
+
+# -------------------------------
+# Cached Thumbnails
+# -------------------------------
+def get_thumbnail_sizes():
+    """Return the (cover, icon) sizes draw_game_slot() scales images to for the current grid."""
+    grid_item_width, grid_item_height, _, _ = get_grid_dimensions()
+    cover_area_height = grid_item_height * 0.70
+    cover_size = (int(grid_item_width), int(cover_area_height))
+    icon_size = (int(grid_item_width * 0.3), int(cover_area_height * 0.3))
+    return cover_size, icon_size
+
+
+def encode_thumbnail(image, size, mode):
+    """Scale a decoded image down to `size` and pack it as compressed raw pixels for the cache."""
+    if image is None:
+        return None
+    thumbnail = scale_image_preserve_aspect(image, size[0], size[1], smooth=True)
+    return thumbnail.get_size(), mode, zlib.compress(pygame.image.tobytes(thumbnail, mode), 1)
+
+
+def unpack_thumbnail(packed):
+    """Turn a cached thumbnail back into a surface (not yet in display format). Safe off the main thread."""
+    size, mode, data = packed
+    return pygame.image.frombytes(zlib.decompress(data), size, mode)
+
+
+def decode_thumbnail(packed, alpha):
+    """Turn a cached thumbnail back into a display-format surface."""
+    surface = unpack_thumbnail(packed)
+    return surface.convert_alpha() if alpha else compact_cover(surface)
+
+
+def cached_thumbnails(game, sizes):
+    """The game's cached thumbnails ({"cover", "icon"}) if they were made for `sizes`, else None.
+
+    The index entry only says where they are in the thumbnail pack; they are read from disk here.
+    """
+    with library_index_lock:
+        entry = library_index.get(game.gamepath)
+        reference = entry.get("thumbnails") if entry else None
+    if not reference or reference.get("sizes") != sizes or thumbnail_pack is None:
+        return None  # Missing or made for another tile size: decode the PNGs again
+    thumbnails = thumbnail_pack.read(game.gamepath, reference)
+    if thumbnails is None:
+        print(f"Cached thumbnail for {game.title} is unreadable, rebuilding.")
+        drop_cached_thumbnails(game)
+    return thumbnails
+
+
+def drop_cached_thumbnails(game):
+    with library_index_lock:
+        entry = library_index.get(game.gamepath)
+        if entry is not None:
+            entry.pop("thumbnails", None)
+
+
+def store_thumbnails(game, image, icon, sizes):
+    """Runs on a decode worker: append the display-size copies of freshly decoded images to the
+    thumbnail pack and point the game's library index entry at them."""
+    global library_index_changed
+    if thumbnail_pack is None:
+        return
+    cover_size, icon_size = sizes
+    thumbnails = {
+        "cover": encode_thumbnail(image, cover_size, "RGB"),  # PIC1 is opaque
+        "icon": encode_thumbnail(icon, icon_size, "RGBA"),
+    }
+    try:
+        reference = thumbnail_pack.append(game.gamepath, thumbnails)
+    except OSError as e:
+        print(f"Failed to cache the thumbnail of {game.title}: {e}")
+        return
+    reference["sizes"] = sizes
+    with library_index_lock:
+        entry = library_index.get(game.gamepath)
+        if entry is not None:
+            entry["thumbnails"] = reference
+            library_index_changed = True
+
+
+def attach_cached_thumbnails(games):
+    """Give `games` their cached thumbnails straight away (used for the first screen), skipping the PNG decode."""
+    for game in games:
+        thumbnails = cached_thumbnails(game, thumbnail_sizes)
+        if thumbnails is None:
+            continue
+        try:
+            game.image = decode_thumbnail(thumbnails["cover"], False) if thumbnails["cover"] else None
+            game.icon = decode_thumbnail(thumbnails["icon"], True) if thumbnails["icon"] else None
+            game.images_loaded = True
+            remember_images(game)
+        except Exception as e:
+            print(f"Cached thumbnail for {game.title} is corrupt, rebuilding: {e}")
+            game.image = game.icon = None
+            drop_cached_thumbnails(game)
+
+
+def compact_thumbnails():
+    """Rewrite the thumbnail pack without the records no entry points at any more (replaced
+    thumbnails, removed games), once they take up more space than the live ones."""
+    global library_index_changed
+    with library_index_lock:
+        references = {gamepath: entry["thumbnails"] for gamepath, entry in library_index.items()
+                      if entry.get("thumbnails")}
+    if not thumbnail_pack.needs_compaction(sum(reference["length"] for reference in references.values())):
+        return
+    before = thumbnail_pack.size()
+    try:
+        moved = thumbnail_pack.compact(references)
+    except OSError as e:
+        print(f"Failed to compact {thumbnail_pack.path}: {e}")
+        return
+    with library_index_lock:
+        for gamepath, reference in references.items():
+            entry = library_index.get(gamepath)
+            if entry is None or entry.get("thumbnails") is not reference:
+                continue  # Replaced meanwhile; its new reference points past the copied records
+            if gamepath in moved:
+                entry["thumbnails"] = dict(reference, **moved[gamepath])
+            else:
+                entry.pop("thumbnails", None)
+        library_index_changed = True
+    print(f"Compacted {thumbnail_pack.path}: {before / 2**20:.0f} MB -> {thumbnail_pack.size() / 2**20:.0f} MB")
+
+
+def save_library_cache(background=False):
+    """Write the library index back to disk if anything changed since the last save.
+
+    The index holds no pixels, so this stays small however many thumbnails are cached.
+    """
+    global library_index_changed
+    if not background and thumbnail_pack is not None:
+        compact_thumbnails()
+    with library_index_lock:
+        if not library_index_changed:
+            return
+        # Copy the entries too, decode workers keep pointing them at new thumbnails.
+        snapshot = {gamepath: dict(entry) for gamepath, entry in library_index.items()}
+        library_index_changed = False
+    if background:
+        threading.Thread(target=library_cache.save_index, args=(snapshot,)).start()
+    else:
+        library_cache.save_index(snapshot)
 
 
 # -------------------------------
@@ -340,161 +1384,692 @@ def update_grid_scroll(total_grid_height, grid_item_height, rows):
 
 def get_grid_dimensions():
     """Compute grid item dimensions based on screen size and number of rows."""
-    total_games = len(GAMES)
+    total_games = len(grid_games)
     rows = math.ceil(total_games / columns)
     available_width = SCREEN_WIDTH - 2 * outer_padding_x - (columns - 1) * inner_margin_x
     grid_item_width = available_width / columns
-    available_height = SCREEN_HEIGHT - HEADER_HEIGHT - 2 * outer_padding_y - (rows - 1) * inner_margin_y
-    grid_item_height = available_height / rows if rows > 0 else 0
+    if VIRTUALIZED_GRID:
+        # Fixed tile height: tiles keep their size and the grid scrolls as the library grows.
+        grid_item_height = GRID_TILE_HEIGHT
+    else:
+        available_height = SCREEN_HEIGHT - HEADER_HEIGHT - 2 * outer_padding_y - (rows - 1) * inner_margin_y
+        grid_item_height = available_height / rows if rows > 0 else 0
     total_grid_height = 2 * outer_padding_y + rows * grid_item_height + (rows - 1) * inner_margin_y
     return grid_item_width, grid_item_height, rows, total_grid_height
 
 
+def get_visible_row_range(grid_item_height, rows):
+    """Return the (first, last) row indices inside the viewport at the current grid_scroll_y, plus overscan."""
+    if rows <= 0:
+        return 0, -1
+    if not VIRTUALIZED_GRID:
+        return 0, rows - 1
+    viewport_height = SCREEN_HEIGHT - HEADER_HEIGHT
+    row_stride = grid_item_height + inner_margin_y
+    first = int((grid_scroll_y - outer_padding_y) // row_stride) - GRID_OVERSCAN_ROWS
+    last = int((grid_scroll_y + viewport_height - outer_padding_y) // row_stride) + GRID_OVERSCAN_ROWS
+    return max(0, first), min(rows - 1, last)
+
+
 # -------------------------------
 # Draw UI Function (Including Footer Instructions)
 # -------------------------------
-def draw_ui():
-    """Render the grid-based game selection UI with Xbox 360 theming and footer instructions."""
-    screen.fill(BACKGROUND_COLOR)
+def draw_game_slot(i, game, x, y, grid_item_width, grid_item_height):
+    """Draw a single game tile (cover, icon, title and selection highlight) at (x, y)."""
+    slot_rect = pygame.Rect(x, y, grid_item_width, grid_item_height)
+    pygame.draw.rect(screen, SLOT_BG_COLOR, slot_rect, border_radius=10)
+
+    cover_area_height = grid_item_height * 0.70
+    text_area_height = grid_item_height - cover_area_height
+
+    # Draw cover image (PIC1)
+    if game.image:
+        cover_image = get_scaled_image(game, "cover", game.image, grid_item_width, cover_area_height)
+        cover_rect = cover_image.get_rect()
+        cover_rect.center = (x + grid_item_width / 2, y + cover_area_height / 2)
+        screen.blit(cover_image, cover_rect.topleft)
+    elif not game.images_loaded:
+        # Placeholder until the background loader has decoded PIC1
+        pygame.draw.rect(screen, PLACEHOLDER_COLOR, (x, y, grid_item_width, cover_area_height), border_radius=10)
+    else:
+        pygame.draw.rect(screen, TEXT_COLOR, (x, y, grid_item_width, cover_area_height), 2)
+
+    # Draw ICON0 at top-left within cover area
+    if game.icon:
+        icon_image = get_scaled_image(game, "icon", game.icon, grid_item_width * 0.3, cover_area_height * 0.3)
+        screen.blit(icon_image, (x + 10, y + 10))
 
-    # Draw header area
+    # Draw text container for game title
+    text_padding = 5
+    text_container_width = grid_item_width - 2 * text_padding
+    title_surface = render_text_wrapped(game.title, FONT, TEXT_COLOR, text_container_width)
+    text_box_width = title_surface.get_width() + 2 * text_padding
+    text_box_height = title_surface.get_height() + 2 * text_padding
+    text_box_x = x + (grid_item_width - text_box_width) / 2
+    text_box_y = y + cover_area_height + (text_area_height - text_box_height) / 2
+    text_box_rect = pygame.Rect(text_box_x, text_box_y, text_box_width, text_box_height)
+    pygame.draw.rect(screen, TEXT_BOX_COLOR, text_box_rect, border_radius=5)
+    screen.blit(title_surface, (text_box_x + text_padding, text_box_y + text_padding))
+
+    # Highlight the selected slot
+    if i == selected_index:
+        pygame.draw.rect(screen, HIGHLIGHT_COLOR, slot_rect, 4, border_radius=10)
+
+
+def build_static_layers():
+    """Pre-composite the parts of the dashboard that never change (background, header and footer)."""
+    global static_layer, footer_surface
+    static_layer = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    static_layer.fill(BACKGROUND_COLOR)
     header_rect = pygame.Rect(0, 0, SCREEN_WIDTH, HEADER_HEIGHT)
-    pygame.draw.rect(screen, HEADER_COLOR, header_rect)
+    pygame.draw.rect(static_layer, HEADER_COLOR, header_rect)
     header_text = HEADER_FONT.render("XBOX 360 DASHBOARD", True, HIGHLIGHT_COLOR)
-    screen.blit(header_text, (SCREEN_WIDTH // 2 - header_text.get_width() // 2,
-                              HEADER_HEIGHT // 2 - header_text.get_height() // 2))
+    static_layer.blit(header_text, (SCREEN_WIDTH // 2 - header_text.get_width() // 2,
+                                    HEADER_HEIGHT // 2 - header_text.get_height() // 2))
+    # Footer instructions (updated to remove "B to quit")
+    footer_surface = FOOTER_FONT.render("Press A to select game, Y to search, Pause for menu", True, TEXT_COLOR)
+
+
+def get_slot_rect(i):
+    """Return the on-screen rect of grid slot `i` at the current scroll offset."""
+    grid_item_width, grid_item_height, _, _ = get_grid_dimensions()
+    row = i // columns
+    col = i % columns
+    x = outer_padding_x + col * (grid_item_width + inner_margin_x)
+    y = HEADER_HEIGHT + outer_padding_y + row * (grid_item_height + inner_margin_y) - grid_scroll_y
+    return pygame.Rect(x, y, grid_item_width, grid_item_height)
+
+
+def mark_dirty(rect=None):
+    """Schedule `rect` for redraw on the next frame, or the whole screen when no rect is given."""
+    global needs_full_redraw
+    if rect is None:
+        needs_full_redraw = True
+    else:
+        dirty_rects.append(pygame.Rect(rect))
+
+
+def invalidate_slot(i):
+    """Schedule grid slot `i` for redraw on the next frame."""
+    if 0 <= i < len(grid_games):
+        # Tiles are laid out at float positions and get_slot_rect() truncates them, so a
+        # centred cover can reach 1 px past the rect: take a pixel more on every side.
+        mark_dirty(get_slot_rect(i).inflate(2, 2))
+
+
+def draw_ui():
+    """Render the grid-based game selection UI with Xbox 360 theming and footer instructions."""
+    # Everything below respects the screen clip, so a clipped call only repaints that area.
+    clip = screen.get_clip()
+    screen.blit(static_layer, clip.topleft, clip)
 
     grid_item_width, grid_item_height, rows, total_grid_height = get_grid_dimensions()
+    check_layout_cache((grid_item_width, grid_item_height))
 
-    # Draw each game slot in the grid
-    for i, game in enumerate(GAMES):
+    # Draw the game slots of the visible rows only, below the header
+    screen.set_clip(clip.clip(pygame.Rect(0, HEADER_HEIGHT, SCREEN_WIDTH, SCREEN_HEIGHT - HEADER_HEIGHT)))
+    first_row, last_row = get_visible_row_range(grid_item_height, rows)
+    for i in range(first_row * columns, min(len(grid_games), (last_row + 1) * columns)):
         row = i // columns
         col = i % columns
         x = outer_padding_x + col * (grid_item_width + inner_margin_x)
         y = HEADER_HEIGHT + outer_padding_y + row * (grid_item_height + inner_margin_y) - grid_scroll_y
+        if not clip.colliderect((x, y, grid_item_width, grid_item_height)):
+            continue
+        draw_game_slot(i, grid_games[i], x, y, grid_item_width, grid_item_height)
+    screen.set_clip(clip)
 
-        slot_rect = pygame.Rect(x, y, grid_item_width, grid_item_height)
-        pygame.draw.rect(screen, SLOT_BG_COLOR, slot_rect, border_radius=10)
+    # Draw footer instructions at the bottom
+    footer_y = SCREEN_HEIGHT - outer_padding_y - footer_surface.get_height()
+    screen.blit(footer_surface, (SCREEN_WIDTH // 2 - footer_surface.get_width() // 2, footer_y))
 
-        cover_area_height = grid_item_height * 0.70
-        text_area_height = grid_item_height - cover_area_height
 
-        # Draw cover image (PIC1)
-        if game.image:
-            cover_image = scale_image_preserve_aspect(game.image, grid_item_width, cover_area_height)
-            cover_rect = cover_image.get_rect()
-            cover_rect.center = (x + grid_item_width / 2, y + cover_area_height / 2)
-            screen.blit(cover_image, cover_rect.topleft)
-        else:
-            pygame.draw.rect(screen, TEXT_COLOR, (x, y, grid_item_width, cover_area_height), 2)
+def draw_profiler_overlay():
+    """Draw the frame-time overlay on top of the frame and return its rect."""
+    global profiler_overlay_rect
+    profiler_overlay_rect = profiler.draw_overlay(screen, FOOTER_FONT, (10, HEADER_HEIGHT + 10))
+    return profiler_overlay_rect
+
+
+def toggle_profiler_overlay():
+    global show_profiler_overlay
+    show_profiler_overlay = not show_profiler_overlay
+    # The overlay needs samples; profiling stays on afterwards only if PROFILE_FRAMES asked for it.
+    profiler.enabled = show_profiler_overlay or PROFILE_FRAMES or profiler.trace_file is not None
+    mark_dirty()
 
-        # Draw ICON0 at top-left within cover area
-        if game.icon:
-            icon_image = scale_image_preserve_aspect(game.icon, grid_item_width * 0.3, cover_area_height * 0.3)
-            screen.blit(icon_image, (x + 10, y + 10))
 
-        # Draw text container for game title
-        text_padding = 5
-        text_container_width = grid_item_width - 2 * text_padding
-        title_surface = render_text_wrapped(game.title, FONT, TEXT_COLOR, text_container_width)
-        text_box_width = title_surface.get_width() + 2 * text_padding
-        text_box_height = title_surface.get_height() + 2 * text_padding
-        text_box_x = x + (grid_item_width - text_box_width) / 2
-        text_box_y = y + cover_area_height + (text_area_height - text_box_height) / 2
-        text_box_rect = pygame.Rect(text_box_x, text_box_y, text_box_width, text_box_height)
-        pygame.draw.rect(screen, TEXT_BOX_COLOR, text_box_rect, border_radius=5)
-        screen.blit(title_surface, (text_box_x + text_padding, text_box_y + text_padding))
+def toggle_frame_trace():
+    if profiler.trace_file is None:
+        profiler.enabled = True
+        profiler.start_trace(FRAME_TRACE_FILE)
+    else:
+        profiler.stop_trace()
+        print(f"Stopped writing frame trace to {FRAME_TRACE_FILE}.")
+        profiler.enabled = show_profiler_overlay or PROFILE_FRAMES
 
-        # Highlight the selected slot
-        if i == selected_index:
-            pygame.draw.rect(screen, HIGHLIGHT_COLOR, slot_rect, 4, border_radius=10)
 
-    # Draw footer instructions at the bottom (updated to remove "B to quit")
-    footer_text = FOOTER_FONT.render("Press A to select game, Pause for menu", True, TEXT_COLOR)
-    footer_y = SCREEN_HEIGHT - outer_padding_y - footer_text.get_height()
-    screen.blit(footer_text, (SCREEN_WIDTH // 2 - footer_text.get_width() // 2, footer_y))
+def present_frame():
+    """Draw and present the frame; in retained mode only the dirty areas are redrawn, or nothing at all."""
+    global needs_full_redraw, frames_rendered, frames_skipped
+    if show_profiler_overlay and profiler_overlay_rect is not None:
+        mark_dirty(profiler_overlay_rect)  # The overlay changes every frame
+    full_redraw_started = None
+    if not RETAINED_RENDERING or needs_full_redraw:
+        full_redraw_started = time.perf_counter()
+        draw_ui()
+        if search_active():
+            draw_search()
+        if menu_active:
+            draw_shutdown_menu()
+        if show_profiler_overlay:
+            draw_profiler_overlay()
+        profiler.mark("draw")
+        upscale_to_display()
+        profiler.mark("upscale")
+        pygame.display.flip()
+        frames_rendered += 1
+    elif dirty_rects:
+        screen_rect = screen.get_rect()
+        rects = [rect.clip(screen_rect) for rect in dirty_rects]
+        for rect in rects:
+            screen.set_clip(rect)
+            draw_ui()
+            if search_active():
+                draw_search()
+            if menu_active:
+                draw_shutdown_menu()
+        screen.set_clip(None)
+        if show_profiler_overlay:
+            rects.append(draw_profiler_overlay())
+        profiler.mark("draw")
+        rects = upscale_to_display(rects)
+        profiler.mark("upscale")
+        pygame.display.update(rects)
+        frames_rendered += 1
+    else:
+        frames_skipped += 1
+    profiler.mark("present")
+    needs_full_redraw = False
+    dirty_rects.clear()
+    if full_redraw_started is not None:
+        adapt_render_scale((time.perf_counter() - full_redraw_started) * 1000)
 
 
 # -------------------------------
-# Main Loop
+# Library Loading
 # -------------------------------
-running = True
-clock = pygame.time.Clock()
+def load_library():
+    """Scan the library and start the background image loading. Returns False if there is nothing to show.
 
-while running:
-    current_time = pygame.time.get_ticks()
+    Roots that take longer than LIBRARY_SCAN_WAIT_S keep scanning in the background and
+    their games are added to the grid when they are done (see check_library_scans()).
+    """
+    global library_index, library_index_changed, library_scanner, warmup, thumbnail_pack
+    roots = library_roots()
+    if USE_LIBRARY_CACHE:
+        cached_index = library_cache.load_index()
+        try:
+            thumbnail_pack = library_cache.ThumbnailPack()
+        except OSError as e:
+            print(f"Thumbnail cache unavailable: {e}")
+        library_index = {path: entry for path, entry in cached_index.items() if os.path.dirname(path) in roots}
+        library_index_changed = len(library_index) != len(cached_index)  # Drops roots no longer configured
+    library_scanner = library_scan.LibraryScanner(roots, scan_library_root, on_finished=wake_main_loop)
+    apply_root_scans(library_scanner.wait(LIBRARY_SCAN_WAIT_S))
+    set_library(sort_games(merge_root_games()))
+    if library_scanner.done():
+        start_library_watcher(library_scanner.snapshot)
+        library_scanner = None
+    else:
+        pending = [root for root in roots if root not in library_scan_times]
+        print(f"Still scanning {', '.join(pending)}; their games will appear when ready.")
+    if not GAMES and library_scanner is None and not HOT_RELOAD_LIBRARY:
+        print("No games found. Exiting.")
+        return False
+    elif not GAMES and library_scanner is None:
+        print(f"No games found yet, watching {', '.join(roots)} for new games.")
 
-    # Check for controller connection (hot-plug support)
-    check_for_new_controller()
+    queue_image_loads()
+    if WARMUP_ENABLED:
+        warmup = launch_warmup.LaunchWarmup(WARMUP_DWELL_MS, WARMUP_BUDGET_MB * 1024 * 1024)
+    return True
 
-    # Process events (keyboard for debugging/exit)
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        # Allow quitting via the ESC key
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_ESCAPE:
-                running = False
-            # Keyboard navigation (arrow keys) only if menu is not active
-            if not menu_active and current_time - last_switch_time > SWITCH_DELAY_MS:
-                if event.key == pygame.K_LEFT and selected_index % columns > 0:
-                    selected_index -= 1
-                    last_switch_time = current_time
-                elif event.key == pygame.K_RIGHT and (selected_index % columns) < (
-                        columns - 1) and selected_index < len(GAMES) - 1:
-                    selected_index += 1
-                    last_switch_time = current_time
-                elif event.key == pygame.K_UP and selected_index - columns >= 0:
-                    selected_index -= columns
-                    last_switch_time = current_time
-                elif event.key == pygame.K_DOWN and selected_index + columns < len(GAMES):
-                    selected_index += columns
-                    last_switch_time = current_time
-
-    # Process controller input
-    if joystick:
-        pygame.event.pump()
-
-        # Always check for the pause button (assumed index 7) to toggle the shutdown menu.
-        pause_button_state = joystick.get_button(7)
-        if pause_button_state and not pause_button_last_state:
-            menu_active = not menu_active
-            last_switch_time = current_time
-        pause_button_last_state = pause_button_state
 
-        if menu_active:
-            # When the menu is active, listen for A button to confirm shutdown.
-            if joystick.get_button(0):
+# -------------------------------
+# Type-Ahead Search
+# -------------------------------
+# Typing on a keyboard, or the on-screen keyboard (Y on the controller), filters the grid
+# through title_index. The grid simply shows grid_games instead of GAMES, so the scaled
+# covers and title surfaces cached per game are reused as they are.
+KEYBOARD_ROWS = [list("ABCDEFGHIJ"), list("KLMNOPQRST"), list("UVWXYZ0123"), list("456789-':&"),
+                 ["SPACE", "DEL", "DONE"]]
+
+
+def set_library(games):
+    """Replace GAMES, rebuild the title index and re-apply the current search."""
+    global GAMES, title_index
+    GAMES = games
+    title_index = title_search.TitleIndex([game.title for game in games])
+    apply_search()
+
+
+def apply_search():
+    """Point the grid at the games matching search_query, keeping the selected game if it still matches.
+
+    Otherwise the selection stays at the same position, clamped to the new list.
+    """
+    global grid_games, selected_index
+    selected = grid_games[selected_index] if 0 <= selected_index < len(grid_games) else None
+    if search_query:
+        grid_games = [GAMES[i] for i in title_index.search(search_query)]
+    else:
+        grid_games = GAMES
+    try:
+        selected_index = grid_games.index(selected)
+    except ValueError:
+        selected_index = min(selected_index, max(0, len(grid_games) - 1))
+    update_image_window()
+    mark_dirty()
+
+
+def search_active():
+    return bool(search_query) or keyboard_open
+
+
+def set_search_query(query):
+    global search_query
+    if query != search_query:
+        search_query = query
+        apply_search()
+
+
+def close_search():
+    """Leave search mode and show the whole library again."""
+    global keyboard_open
+    keyboard_open = False
+    set_search_query("")
+    mark_dirty()
+
+
+def toggle_search_keyboard():
+    global keyboard_open
+    keyboard_open = not keyboard_open
+    nav_repeater.clear()
+    mark_dirty()
+
+
+def move_keyboard_cursor(direction):
+    global keyboard_cursor
+    row, column = keyboard_cursor
+    if direction in ("up", "down"):
+        new_row = max(0, min(len(KEYBOARD_ROWS) - 1, row + (1 if direction == "down" else -1)))
+        # Rows have different key counts, so keep the cursor at the same relative position.
+        column = column * len(KEYBOARD_ROWS[new_row]) // len(KEYBOARD_ROWS[row])
+        row = new_row
+    elif direction == "left":
+        column = max(0, column - 1)
+    elif direction == "right":
+        column = min(len(KEYBOARD_ROWS[row]) - 1, column + 1)
+    keyboard_cursor = (row, column)
+    mark_dirty()
+
+
+def press_keyboard_key():
+    row, column = keyboard_cursor
+    key = KEYBOARD_ROWS[row][column]
+    if key == "DONE":
+        toggle_search_keyboard()  # The results stay filtered until B clears the search
+    elif key == "DEL":
+        set_search_query(search_query[:-1])
+    elif key == "SPACE":
+        set_search_query(search_query + " ")
+    else:
+        set_search_query(search_query + key.lower())
+
+
+def draw_search():
+    """Draw the search query over the header, plus the on-screen keyboard while it is open."""
+    pygame.draw.rect(screen, HEADER_COLOR, (0, 0, SCREEN_WIDTH, HEADER_HEIGHT))
+    query_text = HEADER_FONT.render(f"Search: {search_query}_", True, HIGHLIGHT_COLOR)
+    screen.blit(query_text, (outer_padding_x, HEADER_HEIGHT // 2 - query_text.get_height() // 2))
+    count_text = FONT.render(f"{len(grid_games)} of {len(GAMES)} games", True, TEXT_COLOR)
+    screen.blit(count_text, (SCREEN_WIDTH - outer_padding_x - count_text.get_width(),
+                             HEADER_HEIGHT // 2 - count_text.get_height() // 2))
+    if not grid_games:
+        empty_text = FONT.render("No games match your search", True, TEXT_COLOR)
+        screen.blit(empty_text, (SCREEN_WIDTH // 2 - empty_text.get_width() // 2, HEADER_HEIGHT + outer_padding_y))
+    if keyboard_open:
+        draw_search_keyboard()
+
+
+def draw_search_keyboard():
+    key_size = int(SCREEN_HEIGHT * 0.06)
+    gap = max(2, key_size // 6)
+    widest_row = max(len(row) for row in KEYBOARD_ROWS)
+    hint_text = FOOTER_FONT.render("A type, B delete, Y close", True, TEXT_COLOR)
+    panel_width = widest_row * (key_size + gap) + gap
+    panel_height = len(KEYBOARD_ROWS) * (key_size + gap) + gap + hint_text.get_height() + gap
+    panel_x = (SCREEN_WIDTH - panel_width) // 2
+    panel_y = SCREEN_HEIGHT - outer_padding_y - panel_height
+    pygame.draw.rect(screen, HEADER_COLOR, (panel_x, panel_y, panel_width, panel_height), border_radius=10)
+
+    y = panel_y + gap
+    for row_index, row in enumerate(KEYBOARD_ROWS):
+        key_width = (panel_width - gap) / len(row) - gap
+        for column, key in enumerate(row):
+            x = panel_x + gap + column * (key_width + gap)
+            key_rect = pygame.Rect(x, y, key_width, key_size)
+            selected = keyboard_cursor == (row_index, column)
+            pygame.draw.rect(screen, HIGHLIGHT_COLOR if selected else TEXT_BOX_COLOR, key_rect, border_radius=5)
+            label = render_text_wrapped(key, FONT, TEXT_COLOR, key_width)  # Cached across frames
+            screen.blit(label, label.get_rect(center=key_rect.center))
+        y += key_size + gap
+    screen.blit(hint_text, (SCREEN_WIDTH // 2 - hint_text.get_width() // 2, y))
+
+
+# -------------------------------
+# Event-Driven Input
+# -------------------------------
+KEY_DIRECTIONS = {pygame.K_LEFT: "left", pygame.K_RIGHT: "right", pygame.K_UP: "up", pygame.K_DOWN: "down"}
+STICK_AXES = {0: ("left", "right"), 1: ("up", "down")}  # Left stick axis -> (negative, positive) direction
+
+
+def move_selection(direction):
+    """Move the selection one slot in `direction` if the grid has a slot there."""
+    global selected_index
+    if menu_active or not grid_games:
+        return
+    if direction == "left" and selected_index % columns > 0:
+        selected_index -= 1
+    elif direction == "right" and selected_index % columns < columns - 1 and selected_index < len(grid_games) - 1:
+        selected_index += 1
+    elif direction == "up" and selected_index - columns >= 0:
+        selected_index -= columns
+    elif direction == "down" and selected_index + columns < len(grid_games):
+        selected_index += columns
+
+
+def navigate(direction):
+    """Move the on-screen keyboard cursor while it is open, otherwise the grid selection."""
+    if keyboard_open:
+        move_keyboard_cursor(direction)
+    else:
+        move_selection(direction)
+
+
+def press_direction(source, direction, now):
+    """A direction went down: move right away, then keep repeating while it is held."""
+    navigate(direction)
+    nav_repeater.press(source, direction, now)
+
+
+def hat_directions(value):
+    hat_x, hat_y = value
+    directions = set()
+    if hat_x:
+        directions.add("left" if hat_x < 0 else "right")
+    if hat_y:
+        directions.add("up" if hat_y > 0 else "down")  # Hat y is +1 when pushed up
+    return directions
+
+
+def handle_joystick_input(event, now):
+    """Buttons, left stick and d-pad of the active controller."""
+    global menu_active
+    if event.type == pygame.JOYBUTTONDOWN:
+        if event.button == PROFILER_OVERLAY_BUTTON:
+            toggle_profiler_overlay()
+        elif event.button == PAUSE_BUTTON:
+            menu_active = not menu_active
+            nav_repeater.clear()
+        elif menu_active:
+            # When the menu is active, only A (confirm shutdown) does anything.
+            if event.button == A_BUTTON:
                 shutdown_system()
-        else:
-            # Normal dashboard navigation only when the shutdown menu is not active.
-            axis_x = joystick.get_axis(0)
-            axis_y = joystick.get_axis(1)
-            if current_time - last_switch_time > SWITCH_DELAY_MS:
-                if axis_x < -0.5 and selected_index % columns > 0:
-                    selected_index -= 1
-                    last_switch_time = current_time
-                elif axis_x > 0.5 and (selected_index % columns) < (columns - 1) and selected_index < len(GAMES) - 1:
-                    selected_index += 1
-                    last_switch_time = current_time
-                if axis_y < -0.5 and selected_index - columns >= 0:
-                    selected_index -= columns
-                    last_switch_time = current_time
-                elif axis_y > 0.5 and selected_index + columns < len(GAMES):
-                    selected_index += columns
-                    last_switch_time = current_time
-            # Launch game if 'A' button (button 0) is pressed and menu is not active
-            if joystick.get_button(0):
-                GAMES[selected_index].play()
-                pygame.time.wait(500)
+        elif event.button == Y_BUTTON:
+            toggle_search_keyboard()
+        elif event.button == B_BUTTON:
+            if keyboard_open:
+                set_search_query(search_query[:-1])
+            elif search_query:
+                close_search()
+        elif event.button == A_BUTTON:
+            if keyboard_open:
+                press_keyboard_key()
+            elif grid_games:
+                # RPCS3 takes the focus, so nothing that is held now will see its release.
+                release_controller_directions()
+                nav_repeater.clear()
+                grid_games[selected_index].play()
+    elif event.type == pygame.JOYAXISMOTION and event.axis in STICK_AXES:
+        negative, positive = STICK_AXES[event.axis]
+        current = stick_directions[event.axis]
+        direction = input_repeat.axis_direction(event.value, current, negative, positive)
+        if direction != current:
+            stick_directions[event.axis] = direction
+            if current is not None:
+                nav_repeater.release("stick", current)
+            if direction is not None:
+                press_direction("stick", direction, now)
+    elif event.type == pygame.JOYHATMOTION and event.hat == 0:
+        held = {direction for source, direction in nav_repeater.held if source == "hat"}
+        pressed = hat_directions(event.value)
+        for direction in held - pressed:
+            nav_repeater.release("hat", direction)
+        for direction in pressed - held:
+            press_direction("hat", direction, now)
+
+
+def update_warmup_target():
+    """Point the launch warmup at the selected game; it starts reading once the selection rests there.
+
+    Nothing is warmed while the menu is open or a game is running: reading the launched
+    game's files while RPCS3 boots it would only compete with the boot for the disk.
+    """
+    if warmup is None:
+        return
+    game = None
+    if 0 <= selected_index < len(grid_games) and not menu_active:
+        if session_supervisor is None or not session_supervisor.busy():
+            game = grid_games[selected_index]
+    warmup.select(game.gamepath if game else None, game.runpath if game else None)
+
+
+def next_wait_timeout(now):
+    """How long (ms) the loop may sleep waiting for events before it has to run a frame anyway."""
+    if needs_full_redraw or dirty_rects:
+        return 0
+    if show_profiler_overlay:
+        return 1000 // MAX_FPS  # The overlay keeps measuring, so keep the frames coming
+    timeout = IDLE_WAIT_MS
+    due = nav_repeater.next_due()
+    if due is not None:
+        timeout = min(timeout, max(0, math.ceil(due - now)))
+    return timeout
+
+
+def wait_for_events(timeout):
+    """Sleep until an event arrives or `timeout` ms pass, then return every queued event."""
+    events = []
+    if timeout > 0:
+        event = pygame.event.wait(timeout)
+        if event.type != pygame.NOEVENT:
+            events.append(event)
+    events.extend(pygame.event.get())
+    return events
+
+
+# -------------------------------
+# Main Loop
+# -------------------------------
+def update_and_present(previous_index, previous_scroll_y, last_view_state):
+    """The part of a frame after input: apply library changes and decoded images, work out what
+    needs redrawing, then draw and present it. Returns the view state to pass in next frame.
+
+    benchmark.py times frames through this same function.
+    """
+    # Pick up games added to or removed from the library, and roots that finished scanning late
+    check_library_scans()
+    check_library_changes()
 
     # Update grid scrolling and draw the UI
     _, grid_item_height, rows, total_grid_height = get_grid_dimensions()
     update_grid_scroll(total_grid_height, grid_item_height, rows)
-    draw_ui()
-    if menu_active:
-        draw_shutdown_menu()
-    pygame.display.flip()
-    clock.tick(60)
+    view_state = (grid_scroll_y, menu_active, len(grid_games))
+    if selected_index != previous_index or grid_scroll_y != previous_scroll_y:
+        update_image_window()
+    apply_loaded_images()
+    update_warmup_target()
+    if USE_LIBRARY_CACHE and library_index_changed and not image_loader.busy():
+        # Everything is decoded: persist the new thumbnails in the background.
+        save_library_cache(background=True)
+    if view_state != last_view_state:
+        # Scrolling, the menu or a library change moves everything on screen.
+        mark_dirty()
+        last_view_state = view_state
+    elif selected_index != previous_index:
+        # Only the old and new selection highlight changed.
+        invalidate_slot(previous_index)
+        invalidate_slot(selected_index)
+    profiler.mark("update")
+    present_frame()
+    return last_view_state
+
+
+def run():
+    """Run the dashboard until it is closed."""
+    global dashboard_back_at
+    running = True
+    clock = pygame.time.Clock()
+    first_frame = True
+
+    # Previous frame's view state, used to work out what needs redrawing
+    last_view_state = None
+
+    while running:
+        profiler.begin_frame()
+        # Sleep until input arrives, a held direction is due to repeat or a background thread
+        # (image decoding, library watcher) posts WAKE_EVENT.
+        events = wait_for_events(next_wait_timeout(pygame.time.get_ticks()))
+        profiler.mark("idle")
+        current_time = pygame.time.get_ticks()
+        previous_index = selected_index
+        previous_scroll_y = grid_scroll_y
+
+        for event in events:
+            if event.type == pygame.QUIT:
+                running = False
+            # Window uncovered or refocused (e.g. after returning from RPCS3): repaint everything
+            if event.type in (pygame.VIDEOEXPOSE, pygame.ACTIVEEVENT, pygame.WINDOWEXPOSED):
+                mark_dirty()
+            if event.type in (pygame.WINDOWFOCUSGAINED, pygame.WINDOWEXPOSED):
+                dashboard_back_at = time.perf_counter()  # Ends the exit latency of a finished session
+            if event.type == pygame.WINDOWFOCUSLOST:
+                # Key and controller releases are not delivered without focus.
+                release_controller_directions()
+                nav_repeater.clear()
+            # Controller hot-plugging
+            elif event.type in (pygame.JOYDEVICEADDED, pygame.JOYDEVICEREMOVED):
+                handle_controller_event(event)
+            elif event.type in (pygame.JOYBUTTONDOWN, pygame.JOYAXISMOTION, pygame.JOYHATMOTION):
+                if is_active_controller(event):
+                    handle_joystick_input(event, current_time)
+            elif event.type == pygame.KEYDOWN:
+                # ESC leaves the search, or quits
+                if event.key == pygame.K_ESCAPE:
+                    if search_active():
+                        close_search()
+                    else:
+                        running = False
+                elif event.key == pygame.K_BACKSPACE and search_query and not menu_active:
+                    set_search_query(search_query[:-1])
+                elif event.key == pygame.K_RETURN and keyboard_open:
+                    toggle_search_keyboard()
+                # Frame profiler overlay and trace dump
+                elif event.key == PROFILER_OVERLAY_KEY:
+                    toggle_profiler_overlay()
+                elif event.key == PROFILER_TRACE_KEY:
+                    toggle_frame_trace()
+                # Keyboard navigation (arrow keys) only if menu is not active
+                elif event.key in KEY_DIRECTIONS and not menu_active:
+                    press_direction("keyboard", KEY_DIRECTIONS[event.key], current_time)
+            elif event.type == pygame.KEYUP and event.key in KEY_DIRECTIONS:
+                nav_repeater.release("keyboard", KEY_DIRECTIONS[event.key])
+            # Typing on a physical keyboard searches right away (type-ahead)
+            elif event.type == pygame.TEXTINPUT and not menu_active:
+                set_search_query(search_query + event.text)
+        profiler.mark("events")
+
+        # Held directions repeat, faster the longer they are held
+        for direction in nav_repeater.due(current_time):
+            navigate(direction)
+        check_returned_sessions()
+        profiler.mark("input")
+
+        last_view_state = update_and_present(previous_index, previous_scroll_y, last_view_state)
+        if first_frame:
+            first_frame = False
+            mark_startup_phase("first frame")
+            report_startup()
+        clock.tick(MAX_FPS)  # Caps the frame rate while events keep coming
+        profiler.mark("idle")
+        profiler.end_frame()
+
+
+def shutdown():
+    """Stop the background workers, persist caches and close the window."""
+    print(f"Frames rendered: {frames_rendered}, frames skipped: {frames_skipped}")
+    print(f"Images: {images.bytes_used / 2**20:.1f} MB in use (peak {images.peak_bytes / 2**20:.1f} MB, "
+          f"budget {images.budget_bytes / 2**20:.0f} MB), {images.loads} loads, {images.evictions} evictions")
+    if profiler.samples:
+        print("Frame times:\n  " + "\n  ".join(profiler.summary_lines()))
+    profiler.stop_trace()
+    if image_loader is not None:
+        # Before the thumbnail pack is saved and closed and pygame quits under the workers.
+        image_loader.stop(DECODE_STOP_TIMEOUT_S)
+    if library_watcher is not None:
+        library_watcher.stop()
+    if session_supervisor is not None:
+        session_supervisor.stop()
+    check_returned_sessions(flush=True)
+    if warmup is not None:
+        warmup.stop()
+        print(warmup.summary())
+    if USE_LIBRARY_CACHE:
+        save_library_cache()
+    if thumbnail_pack is not None:
+        thumbnail_pack.close()
+    if sessions is not None:
+        sessions.close()
+    pygame.quit()
+
+
+# The dashboard's state stays in module globals rather than in an app object: every function
+# of this script reads them directly, and benchmark.py and the tests drive the dashboard by
+# setting module attributes (LIBRARY_PATHS, RENDER_SCALE, ...) and calling these functions.
+# Importing the module has no side effects; main() is the one entry point, and there is one
+# dashboard per process (calling main() a second time does not reset that state).
+def main():
+    """Entry point: open the dashboard, load the library and run until closed."""
+    global _phase_started
+    STARTUP_PHASES.clear()
+    STARTUP_PHASES.append(("import", IMPORT_SECONDS))
+    _phase_started = time.perf_counter()
+    init_display()
+    build_static_layers()
+    mark_startup_phase("display init")
+    if not load_library():
+        pygame.quit()
+        return
+    mark_startup_phase("scan")
+    try:
+        run()
+    finally:
+        shutdown()
+
+
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED  # Time spent importing this module
 
-pygame.quit()
+if __name__ == "__main__":
+    main()